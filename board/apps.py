@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class BoardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'board'
+
+    def ready(self):
+        from management.images import register_image_derivatives
+        from management.tasks import register_file_inspection
+        from .models import News, Notice, Translation, Information, InformationDocuments
+        from .search import connect_search_hooks
+
+        for model in (News, Notice, Translation, Information):
+            register_image_derivatives(model, 'image')
+        register_file_inspection(InformationDocuments, 'file')
+        connect_search_hooks()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from board.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-create the board search index from News, Notice, Translation and "
+        "Information, e.g. after bulk changes that bypass the save/delete hooks."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            count = rebuild_index()
+        except NotImplementedError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"{count} record(s) indexed")
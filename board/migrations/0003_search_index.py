@@ -0,0 +1,77 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE board_search USING fts5(
+        kind UNINDEXED, object_id UNINDEXED, university_id UNINDEXED,
+        title_uz, title_ko, content_uz, content_ko,
+        tokenize = 'trigram'
+    )
+    """,
+]
+
+POSTGRESQL_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE TABLE board_search (
+        id bigint PRIMARY KEY,
+        kind varchar(20) NOT NULL,
+        object_id bigint NOT NULL,
+        university_id bigint NOT NULL,
+        title_uz text, title_ko text, content_uz text, content_ko text,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title_uz, '') || ' ' || coalesce(title_ko, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(content_uz, '') || ' ' || coalesce(content_ko, '')), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX board_search_document ON board_search USING gin (document)",
+    """
+    CREATE INDEX board_search_trigram ON board_search USING gin ((
+        coalesce(title_uz, '') || ' ' || coalesce(title_ko, '') || ' '
+        || coalesce(content_uz, '') || ' ' || coalesce(content_ko, '')
+    ) gin_trgm_ops)
+    """,
+    "CREATE INDEX board_search_university ON board_search (university_id)",
+]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        statements, key_column = SQLITE_CREATE, "rowid"
+    elif connection.vendor == "postgresql":
+        statements, key_column = POSTGRESQL_CREATE, "id"
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+    # Index the existing records, keyed like board.search.document_key()
+    for code, table, kind in (
+        (1, "board_news", "news"),
+        (2, "board_notice", "notices"),
+        (3, "board_translation", "translations"),
+        (4, "board_information", "information"),
+    ):
+        schema_editor.execute(
+            f"INSERT INTO board_search ({key_column}, kind, object_id, university_id, "
+            f"title_uz, title_ko, content_uz, content_ko) "
+            f"SELECT id * 8 + {code}, '{kind}', id, university_id, "
+            f"title_uz, title_ko, content_uz, content_ko FROM {table}"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS board_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0002_translation_university'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-16 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0003_search_index'),
+        ('management', '0013_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='information',
+            index=models.Index(fields=['-date'], name='board_infor_date_c81dd3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='information',
+            index=models.Index(fields=['university', '-date'], name='board_infor_univers_98b710_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['-date'], name='board_news_date_23515b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['university', '-date'], name='board_news_univers_451c4a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['-date'], name='board_notic_date_b54548_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['university', '-date'], name='board_notic_univers_932117_idx'),
+        ),
+    ]
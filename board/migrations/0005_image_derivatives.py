@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-16 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='information',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='translation',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+    ]
@@ -8,12 +8,20 @@ class News(models.Model):
     content_uz = models.TextField()
     content_ko = models.TextField()
     image = models.ImageField(upload_to='news_images/', blank=True, null=True)
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
     date = models.DateTimeField(auto_now_add=True)
     university = models.ForeignKey(University, on_delete=models.CASCADE)
 
     def __str__(self):
         return self.title_uz
 
+    class Meta:
+        # List order, for all universities and for one
+        indexes = [
+            models.Index(fields=['-date']),
+            models.Index(fields=['university', '-date']),
+        ]
+
 
 class Notice(models.Model):
     title_uz = models.CharField(max_length=200, verbose_name='Title in Uzbek')
@@ -21,12 +29,20 @@ class Notice(models.Model):
     content_uz = models.TextField()
     content_ko = models.TextField()
     image = models.ImageField(upload_to='notice_images/', blank=True, null=True)
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
     date = models.DateTimeField(auto_now_add=True)
     university = models.ForeignKey(University, on_delete=models.CASCADE)
 
     def __str__(self):
         return self.title_uz
 
+    class Meta:
+        # List order, for all universities and for one
+        indexes = [
+            models.Index(fields=['-date']),
+            models.Index(fields=['university', '-date']),
+        ]
+
 
 class Translation(models.Model):
     title_uz = models.CharField(max_length=200, verbose_name='Title in Uzbek')
@@ -34,6 +50,7 @@ class Translation(models.Model):
     content_uz = models.TextField()
     content_ko = models.TextField()
     image = models.ImageField(upload_to='notice_images/', blank=True, null=True)
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
     university = models.ForeignKey(University, on_delete=models.CASCADE)
 
     def __str__(self):
@@ -46,12 +63,20 @@ class Information(models.Model):
     content_uz = models.TextField()
     content_ko = models.TextField()
     image = models.ImageField(upload_to='information_images/', blank=True, null=True)
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
     date = models.DateTimeField(auto_now_add=True)
     university = models.ForeignKey(University, on_delete=models.CASCADE)
 
     def __str__(self):
         return self.title_uz
 
+    class Meta:
+        # List order, for all universities and for one
+        indexes = [
+            models.Index(fields=['-date']),
+            models.Index(fields=['university', '-date']),
+        ]
+
 
 class InformationDocuments(models.Model):
     information = models.ForeignKey(Information, on_delete=models.CASCADE, related_name='documents')
@@ -0,0 +1,278 @@
+"""
+Full-text search over News, Notice, Translation and Information.
+
+The bilingual titles and contents of every record are copied into one
+``board_search`` table (created by migration 0003) and kept in sync by
+``post_save``/``post_delete`` hooks:
+
+- SQLite: an FTS5 table with the ``trigram`` tokenizer, so any substring of
+  three or more characters matches in Hangul, Cyrillic and Latin alike, with
+  no word splitting or stemming. Results are ranked by ``bm25()``.
+- PostgreSQL: a plain table with a ``simple`` ``tsvector`` for ranking and a
+  ``pg_trgm`` GIN index that serves the substring (``ILIKE``) matching.
+
+Every search term must occur in the record's title or content. Terms shorter
+than three characters cannot use a trigram index and are matched by scanning
+the index table. ``QuerySet.update()``, ``bulk_create`` and raw SQL bypass the
+hooks; run ``manage.py rebuild_search_index`` after them.
+
+On other databases there is no index: the hooks only log a warning, and
+searching or rebuilding raises ``NotImplementedError``.
+"""
+
+import html
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Information, News, Notice, Translation
+
+logger = logging.getLogger(__name__)
+
+_search_settings = getattr(settings, "BOARD_SEARCH", {})
+DEFAULT_LIMIT = _search_settings.get("DEFAULT_LIMIT", 20)
+MAX_LIMIT = _search_settings.get("MAX_LIMIT", 100)
+SNIPPET_LENGTH = _search_settings.get("SNIPPET_LENGTH", 160)
+MAX_TERMS = 8
+
+TABLE = "board_search"
+TEXT_COLUMNS = ("title_uz", "title_ko", "content_uz", "content_ko")
+
+# Result type -> model. The position is part of the index key, only append.
+SEARCH_MODELS = {
+    "news": News,
+    "notices": Notice,
+    "translations": Translation,
+    "information": Information,
+}
+_MODEL_TYPES = {model: name for name, model in SEARCH_MODELS.items()}
+_TYPE_CODES = {name: code for code, name in enumerate(SEARCH_MODELS, start=1)}
+
+
+def document_key(kind, object_id):
+    """Index row id of a record: unique across the four tables"""
+    return object_id * 8 + _TYPE_CODES[kind]
+
+
+def search_terms(query):
+    """Distinct whitespace-separated terms of ``query``, in order"""
+    terms = []
+    for term in query.split():
+        if term.lower() not in (t.lower() for t in terms):
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _like_pattern(term):
+    return "%" + re.sub(r"([\\%_])", r"\\\1", term) + "%"
+
+
+class SQLiteBackend:
+    key_column = "rowid"
+
+    def match_clause(self, terms):
+        """SQL condition and parameters selecting rows that contain every term"""
+        conditions, params = [], []
+        long_terms = [term for term in terms if len(term) >= 3]
+        if long_terms:
+            # Each quoted string is a substring of 3+ characters for the trigram tokenizer
+            conditions.append(f"{TABLE} MATCH %s")
+            params.append(" ".join('"' + term.replace('"', '""') + '"' for term in long_terms))
+        document = " || ' ' || ".join(TEXT_COLUMNS)
+        for term in terms:
+            if len(term) < 3:
+                conditions.append(f"({document}) LIKE %s ESCAPE '\\'")
+                params.append(_like_pattern(term))
+        return " AND ".join(conditions), params, bool(long_terms)
+
+    def search(self, cursor, terms, where, where_params, limit, offset):
+        match, params, ranked = self.match_clause(terms)
+        # Title matches weigh more than content matches
+        score = f"bm25({TABLE}, 0, 0, 0, 10.0, 10.0, 1.0, 1.0)" if ranked else "0"
+        cursor.execute(
+            f"SELECT kind, object_id, university_id, {', '.join(TEXT_COLUMNS)}, {score} AS score "
+            f"FROM {TABLE} WHERE {match}{where} "
+            f"ORDER BY score, {self.key_column} DESC LIMIT %s OFFSET %s",
+            params + where_params + [limit, offset],
+        )
+        # bm25() is negative, smaller is better
+        return [row[:-1] + (-row[-1],) for row in cursor.fetchall()]
+
+
+class PostgreSQLBackend:
+    key_column = "id"
+
+    def search(self, cursor, terms, where, where_params, limit, offset):
+        document = " || ' ' || ".join(f"coalesce({column}, '')" for column in TEXT_COLUMNS)
+        match = " AND ".join(f"({document}) ILIKE %s" for _ in terms)
+        cursor.execute(
+            f"SELECT kind, object_id, university_id, {', '.join(TEXT_COLUMNS)}, "
+            f"ts_rank(document, plainto_tsquery('simple', %s)) "
+            f"+ word_similarity(%s, {document}) AS score "
+            f"FROM {TABLE} WHERE {match}{where} "
+            f"ORDER BY score DESC, id DESC LIMIT %s OFFSET %s",
+            [" ".join(terms), " ".join(terms)]
+            + [_like_pattern(term) for term in terms]
+            + where_params
+            + [limit, offset],
+        )
+        return cursor.fetchall()
+
+
+def get_backend():
+    """Search backend of the database, or ``None`` if it has no search index"""
+    if connection.vendor == "postgresql":
+        return PostgreSQLBackend()
+    if connection.vendor == "sqlite":
+        return SQLiteBackend()
+    return None
+
+
+def require_backend():
+    backend = get_backend()
+    if backend is None:
+        raise NotImplementedError(f"Board search does not support {connection.vendor}.")
+    return backend
+
+
+def _hook_backend():
+    """Backend for the save/delete hooks, which must never break a board write"""
+    backend = get_backend()
+    if backend is None:
+        logger.warning(
+            "Board search does not support %s; the search index is not updated.",
+            connection.vendor,
+        )
+    return backend
+
+
+def index_document(instance):
+    """Add or replace the index row of a board record"""
+    backend = _hook_backend()
+    if backend is None:
+        return
+    kind = _MODEL_TYPES[type(instance)]
+    key = document_key(kind, instance.pk)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE {backend.key_column} = %s", [key])
+        cursor.execute(
+            f"INSERT INTO {TABLE} ({backend.key_column}, kind, object_id, university_id, "
+            f"{', '.join(TEXT_COLUMNS)}) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+            [key, kind, instance.pk, instance.university_id]
+            + [getattr(instance, column) for column in TEXT_COLUMNS],
+        )
+
+
+def remove_document(instance):
+    backend = _hook_backend()
+    if backend is None:
+        return
+    kind = _MODEL_TYPES[type(instance)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLE} WHERE {backend.key_column} = %s",
+            [document_key(kind, instance.pk)],
+        )
+
+
+def rebuild_index():
+    """Re-create every index row from the board tables; returns the row count"""
+    backend = require_backend()
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        for kind, model in SEARCH_MODELS.items():
+            cursor.execute(
+                f"INSERT INTO {TABLE} ({backend.key_column}, kind, object_id, university_id, "
+                f"{', '.join(TEXT_COLUMNS)}) "
+                f"SELECT id * 8 + %s, %s, id, university_id, {', '.join(TEXT_COLUMNS)} "
+                f"FROM {model._meta.db_table}",
+                [_TYPE_CODES[kind], kind],
+            )
+            count += cursor.rowcount
+    return count
+
+
+def _document_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_document(instance)
+
+
+def _document_deleted(sender, instance, **kwargs):
+    remove_document(instance)
+
+
+def connect_search_hooks():
+    for model in SEARCH_MODELS.values():
+        uid = f"board-search:{model._meta.label_lower}"
+        post_save.connect(_document_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(_document_deleted, sender=model, dispatch_uid=uid)
+
+
+def highlight(text, terms):
+    """HTML-escape ``text`` and wrap every occurrence of the terms in <mark>"""
+    if not text:
+        return ""
+    pattern = re.compile(
+        "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)),
+        re.IGNORECASE,
+    )
+    parts, position = [], 0
+    for found in pattern.finditer(text):
+        parts.append(html.escape(text[position:found.start()], quote=False))
+        parts.append(f"<mark>{html.escape(found.group(), quote=False)}</mark>")
+        position = found.end()
+    parts.append(html.escape(text[position:], quote=False))
+    return "".join(parts)
+
+
+def snippet(text, terms, length=SNIPPET_LENGTH):
+    """Highlighted excerpt of ``text`` around the first matching term"""
+    if not text:
+        return ""
+    lowered = text.lower()
+    found = [lowered.find(term.lower()) for term in terms]
+    found = [position for position in found if position >= 0]
+    start = max(0, min(found) - length // 4) if found else 0
+    excerpt = text[start:start + length]
+    return (
+        ("…" if start > 0 else "")
+        + highlight(excerpt, terms)
+        + ("…" if start + length < len(text) else "")
+    )
+
+
+def search(query, university_id=None, kinds=None, limit=DEFAULT_LIMIT, offset=0):
+    """
+    Ranked matches for ``query``, optionally limited to one university and to
+    some result types. Titles are highlighted and contents cut to snippets.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    where, where_params = "", []
+    if university_id is not None:
+        where += " AND university_id = %s"
+        where_params.append(university_id)
+    if kinds:
+        where += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+        where_params.extend(kinds)
+
+    with connection.cursor() as cursor:
+        rows = require_backend().search(cursor, terms, where, where_params, limit, offset)
+    return [
+        {
+            "type": kind,
+            "id": object_id,
+            "university": university_id,
+            "title_uz": highlight(title_uz, terms),
+            "title_ko": highlight(title_ko, terms),
+            "snippet_uz": snippet(content_uz, terms),
+            "snippet_ko": snippet(content_ko, terms),
+            "score": round(float(score), 4),
+        }
+        for kind, object_id, university_id, title_uz, title_ko, content_uz, content_ko, score in rows
+    ]
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.core.validators import FileExtensionValidator
 from django.core.files.images import get_image_dimensions
+from management.images import ImageSrcsetField
+from management.fastpath import CompiledSerializer, Computed, FirstOf, Format
 from .models import News, Notice, Translation, Information, InformationDocuments
 
 
@@ -9,12 +11,13 @@ class NewsSerializer(serializers.ModelSerializer):
     content = serializers.SerializerMethodField()
     university_name = serializers.CharField(source='university.__str__', read_only=True)
     has_image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image')
     
     class Meta:
         model = News
         fields = [
             'id', 'title_uz', 'title_ko', 'title', 'content_uz', 'content_ko', 
-            'content', 'image', 'has_image', 'date', 'university', 'university_name'
+            'content', 'image', 'image_srcset', 'has_image', 'date', 'university', 'university_name'
         ]
     
     def get_title(self, obj):
@@ -27,17 +30,28 @@ class NewsSerializer(serializers.ModelSerializer):
         return bool(obj.image)
 
 
+# values()-based counterpart of NewsSerializer for news_list
+NewsListSerializer = CompiledSerializer(
+    NewsSerializer,
+    title=FirstOf('title_ko', 'title_uz'),
+    content=FirstOf('content_ko', 'content_uz'),
+    has_image=Computed(bool, 'image'),
+    university_name=Format('{} / {}', 'university__name_ko', 'university__name_uz'),
+)
+
+
 class NoticeSerializer(serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     content = serializers.SerializerMethodField()
     university_name = serializers.CharField(source='university.__str__', read_only=True)
     has_image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image')
     
     class Meta:
         model = Notice
         fields = [
             'id', 'title_uz', 'title_ko', 'title', 'content_uz', 'content_ko', 
-            'content', 'image', 'has_image', 'date', 'university', 'university_name'
+            'content', 'image', 'image_srcset', 'has_image', 'date', 'university', 'university_name'
         ]
     
     def get_title(self, obj):
@@ -55,12 +69,13 @@ class TranslationSerializer(serializers.ModelSerializer):
     content = serializers.SerializerMethodField()
     university_name = serializers.CharField(source='university.__str__', read_only=True)
     has_image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image')
     
     class Meta:
         model = Translation
         fields = [
             'id', 'title_uz', 'title_ko', 'title', 'content_uz', 'content_ko',
-            'content', 'image', 'has_image', 'university', 'university_name'
+            'content', 'image', 'image_srcset', 'has_image', 'university', 'university_name'
         ]
     
     def get_title(self, obj):
@@ -95,6 +110,7 @@ class InformationSerializer(serializers.ModelSerializer):
     content = serializers.SerializerMethodField()
     university_name = serializers.CharField(source='university.__str__', read_only=True)
     has_image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image')
     documents = InformationDocumentsSerializer(many=True, read_only=True)
     document_count = serializers.SerializerMethodField()
     
@@ -102,7 +118,7 @@ class InformationSerializer(serializers.ModelSerializer):
         model = Information
         fields = [
             'id', 'title_uz', 'title_ko', 'title', 'content_uz', 'content_ko', 
-            'content', 'image', 'has_image', 'date', 'university', 'university_name',
+            'content', 'image', 'image_srcset', 'has_image', 'date', 'university', 'university_name',
             'documents', 'document_count'
         ]
     
@@ -25,6 +25,7 @@ from .views import (
     information_document_create,
     information_document_update,
     information_document_delete,
+    search,
 )
 
 urlpatterns = [
@@ -64,4 +65,7 @@ urlpatterns = [
          information_document_update, name="information_document_update"),
     path("information-documents/<int:document_id>/delete",
          information_document_delete, name="information_document_delete"),
+
+    # Search
+    path("board/search", search, name="board_search"),
 ]
\ No newline at end of file
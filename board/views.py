@@ -6,6 +6,7 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from .serializers import (
     NewsSerializer,
+    NewsListSerializer,
     NoticeSerializer,
     TranslationSerializer,
     InformationSerializer,
@@ -17,18 +18,7 @@ from .serializers import (
     InformationDocumentsCreateUpdateSerializer
 )
 from .models import News, Notice, Translation, Information, InformationDocuments
-from management.models import UniversityManager
-
-
-def get_user_university(user):
-    """Get university for university_staff users"""
-    try:
-        if user.groups.filter(name="university_staff").exists():
-            manager = UniversityManager.objects.get(user=user)
-            return manager.university
-    except UniversityManager.DoesNotExist:
-        pass
-    return None
+from . import search as board_search
 
 
 def process_form_data(data):
@@ -72,14 +62,13 @@ def format_serializer_errors(errors):
     return formatted_errors
 
 
-def filter_by_permissions(queryset, user):
-    """Filter queryset based on user permissions"""
-    if user.groups.filter(name="upsight_staff").exists():
+def filter_by_permissions(queryset, role):
+    """Filter queryset based on the requesting user's role"""
+    if role.is_upsight_staff:
         return queryset  # upsight_staff can see all
     
-    university = get_user_university(user)
-    if university:
-        return queryset.filter(university=university)
+    if role.university_id:
+        return queryset.filter(university_id=role.university_id)
     
     return queryset.none()  # No access if no proper role
 
@@ -91,21 +80,22 @@ def news_list(request):
     """Get list of news based on user role"""
     try:
         # Check permissions
-        if not (request.user.groups.filter(name="upsight_staff").exists() or 
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view news."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        news = News.objects.select_related('university').all().order_by('-date')
-        news = filter_by_permissions(news, request.user)
-        serializer = NewsSerializer(news, many=True, context={"request": request})
+        news = News.objects.all().order_by('-date')
+        news = filter_by_permissions(news, request.upsight_role)
+        data = NewsListSerializer.serialize(
+            NewsListSerializer.values(news), context={"request": request}
+        )
         
         return Response(
             {
-                "news": serializer.data,
-                "total_count": len(serializer.data),
+                "news": data,
+                "total_count": len(data),
             },
             status=status.HTTP_200_OK,
         )
@@ -123,8 +113,7 @@ def news_detail(request, news_id):
     """Get news details based on user role"""
     try:
         # Check permissions
-        if not (request.user.groups.filter(name="upsight_staff").exists() or 
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view news details."},
                 status=status.HTTP_403_FORBIDDEN
@@ -133,9 +122,8 @@ def news_detail(request, news_id):
         news = News.objects.select_related('university').get(id=news_id)
         
         # Check if user can access this news
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != news.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != news.university_id:
                 return Response(
                     {"error": "Permission denied. You can only view your university's news."},
                     status=status.HTTP_403_FORBIDDEN
@@ -163,8 +151,7 @@ def news_create(request):
     """Create news item with enhanced form data handling"""
     try:
         # Check permissions
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -177,9 +164,8 @@ def news_create(request):
         data = process_form_data(request.data)
         
         # Set university for university_staff
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if not user_university:
+        if request.upsight_role.is_university_staff:
+            if not request.upsight_role.university_id:
                 return Response(
                     {
                         "error": "University not found",
@@ -187,7 +173,7 @@ def news_create(request):
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            data['university'] = user_university.id
+            data['university'] = request.upsight_role.university_id
         
         serializer = NewsCreateUpdateSerializer(data=data)
         if serializer.is_valid():
@@ -235,8 +221,7 @@ def news_update(request, news_id):
     """Update news item with enhanced form data handling"""
     try:
         # Check permissions
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -257,9 +242,8 @@ def news_update(request, news_id):
             )
         
         # Check if user can update this news
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != news.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != news.university_id:
                 return Response(
                     {
                         "error": "Permission denied",
@@ -272,8 +256,8 @@ def news_update(request, news_id):
         data = process_form_data(request.data)
         
         # Ensure university doesn't change for university_staff
-        if request.user.groups.filter(name="university_staff").exists():
-            data['university'] = news.university.id
+        if request.upsight_role.is_university_staff:
+            data['university'] = news.university_id
         
         serializer = NewsCreateUpdateSerializer(
             news,
@@ -325,8 +309,7 @@ def news_delete(request, news_id):
     """Delete news item"""
     try:
         # Check permissions
-        if not (request.user.groups.filter(name="upsight_staff").exists() or 
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can delete news."},
                 status=status.HTTP_403_FORBIDDEN
@@ -335,9 +318,8 @@ def news_delete(request, news_id):
         news = News.objects.get(id=news_id)
         
         # Check if user can delete this news
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != news.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != news.university_id:
                 return Response(
                     {"error": "Permission denied. You can only delete your university's news."},
                     status=status.HTTP_403_FORBIDDEN
@@ -368,15 +350,14 @@ def news_delete(request, news_id):
 def notices_list(request):
     """Get list of notices based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or 
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view notices."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         notices = Notice.objects.select_related('university').all().order_by('-date')
-        notices = filter_by_permissions(notices, request.user)
+        notices = filter_by_permissions(notices, request.upsight_role)
         serializer = NoticeSerializer(notices, many=True, context={"request": request})
         
         return Response(
@@ -399,8 +380,7 @@ def notices_list(request):
 def notice_detail(request, notice_id):
     """Get notice details based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or 
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view notice details."},
                 status=status.HTTP_403_FORBIDDEN
@@ -408,9 +388,8 @@ def notice_detail(request, notice_id):
         
         notice = Notice.objects.select_related('university').get(id=notice_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != notice.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != notice.university_id:
                 return Response(
                     {"error": "Permission denied. You can only view your university's notices."},
                     status=status.HTTP_403_FORBIDDEN
@@ -437,8 +416,7 @@ def notice_detail(request, notice_id):
 def notice_create(request):
     """Create notice item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -450,9 +428,8 @@ def notice_create(request):
         # Process form data
         data = process_form_data(request.data)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if not user_university:
+        if request.upsight_role.is_university_staff:
+            if not request.upsight_role.university_id:
                 return Response(
                     {
                         "error": "University not found",
@@ -460,7 +437,7 @@ def notice_create(request):
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            data['university'] = user_university.id
+            data['university'] = request.upsight_role.university_id
         
         serializer = NoticeCreateUpdateSerializer(data=data)
         if serializer.is_valid():
@@ -506,8 +483,7 @@ def notice_create(request):
 def notice_update(request, notice_id):
     """Update notice item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -527,9 +503,8 @@ def notice_update(request, notice_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != notice.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != notice.university_id:
                 return Response(
                     {
                         "error": "Permission denied",
@@ -541,8 +516,8 @@ def notice_update(request, notice_id):
         # Process form data
         data = process_form_data(request.data)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            data['university'] = notice.university.id
+        if request.upsight_role.is_university_staff:
+            data['university'] = notice.university_id
         
         serializer = NoticeCreateUpdateSerializer(
             notice,
@@ -592,8 +567,7 @@ def notice_update(request, notice_id):
 def notice_delete(request, notice_id):
     """Delete notice item"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can delete notices."},
                 status=status.HTTP_403_FORBIDDEN
@@ -601,9 +575,8 @@ def notice_delete(request, notice_id):
         
         notice = Notice.objects.get(id=notice_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != notice.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != notice.university_id:
                 return Response(
                     {"error": "Permission denied. You can only delete your university's notices."},
                     status=status.HTTP_403_FORBIDDEN
@@ -634,15 +607,14 @@ def notice_delete(request, notice_id):
 def translations_list(request):
     """Get list of translations based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view translations."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         translations = Translation.objects.select_related('university').all()
-        translations = filter_by_permissions(translations, request.user)
+        translations = filter_by_permissions(translations, request.upsight_role)
         serializer = TranslationSerializer(translations, many=True, context={"request": request})
         
         return Response(
@@ -665,8 +637,7 @@ def translations_list(request):
 def translation_detail(request, translation_id):
     """Get translation details based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view translation details."},
                 status=status.HTTP_403_FORBIDDEN
@@ -674,9 +645,8 @@ def translation_detail(request, translation_id):
         
         translation = Translation.objects.select_related('university').get(id=translation_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != translation.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != translation.university_id:
                 return Response(
                     {"error": "Permission denied. You can only view your university's translations."},
                     status=status.HTTP_403_FORBIDDEN
@@ -703,8 +673,7 @@ def translation_detail(request, translation_id):
 def translation_create(request):
     """Create translation item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -716,9 +685,8 @@ def translation_create(request):
         # Process form data
         data = process_form_data(request.data)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if not user_university:
+        if request.upsight_role.is_university_staff:
+            if not request.upsight_role.university_id:
                 return Response(
                     {
                         "error": "University not found",
@@ -726,7 +694,7 @@ def translation_create(request):
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            data['university'] = user_university.id
+            data['university'] = request.upsight_role.university_id
         
         serializer = TranslationCreateUpdateSerializer(data=data)
         if serializer.is_valid():
@@ -772,8 +740,7 @@ def translation_create(request):
 def translation_update(request, translation_id):
     """Update translation item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -793,9 +760,8 @@ def translation_update(request, translation_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != translation.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != translation.university_id:
                 return Response(
                     {
                         "error": "Permission denied",
@@ -807,8 +773,8 @@ def translation_update(request, translation_id):
         # Process form data
         data = process_form_data(request.data)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            data['university'] = translation.university.id
+        if request.upsight_role.is_university_staff:
+            data['university'] = translation.university_id
         
         serializer = TranslationCreateUpdateSerializer(
             translation,
@@ -858,8 +824,7 @@ def translation_update(request, translation_id):
 def translation_delete(request, translation_id):
     """Delete translation item"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can delete translations."},
                 status=status.HTTP_403_FORBIDDEN
@@ -867,9 +832,8 @@ def translation_delete(request, translation_id):
         
         translation = Translation.objects.get(id=translation_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != translation.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != translation.university_id:
                 return Response(
                     {"error": "Permission denied. You can only delete your university's translations."},
                     status=status.HTTP_403_FORBIDDEN
@@ -900,8 +864,7 @@ def translation_delete(request, translation_id):
 def information_list(request):
     """Get list of information based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view information."},
                 status=status.HTTP_403_FORBIDDEN
@@ -909,7 +872,7 @@ def information_list(request):
         
         information = (Information.objects.select_related('university')
                        .prefetch_related('documents').all().order_by('-date'))
-        information = filter_by_permissions(information, request.user)
+        information = filter_by_permissions(information, request.upsight_role)
         serializer = InformationSerializer(information, many=True, context={"request": request})
         
         return Response(
@@ -932,8 +895,7 @@ def information_list(request):
 def information_detail(request, information_id):
     """Get information details based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view information details."},
                 status=status.HTTP_403_FORBIDDEN
@@ -942,9 +904,8 @@ def information_detail(request, information_id):
         information = (Information.objects.select_related('university')
                        .prefetch_related('documents').get(id=information_id))
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != information.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != information.university_id:
                 return Response(
                     {"error": "Permission denied. You can only view your university's information."},
                     status=status.HTTP_403_FORBIDDEN
@@ -971,8 +932,7 @@ def information_detail(request, information_id):
 def information_create(request):
     """Create information item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -984,9 +944,8 @@ def information_create(request):
         # Process form data
         data = process_form_data(request.data)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if not user_university:
+        if request.upsight_role.is_university_staff:
+            if not request.upsight_role.university_id:
                 return Response(
                     {
                         "error": "University not found",
@@ -994,7 +953,7 @@ def information_create(request):
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            data['university'] = user_university.id
+            data['university'] = request.upsight_role.university_id
         
         serializer = InformationCreateUpdateSerializer(data=data)
         if serializer.is_valid():
@@ -1040,8 +999,7 @@ def information_create(request):
 def information_update(request, information_id):
     """Update information item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -1061,9 +1019,8 @@ def information_update(request, information_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != information.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != information.university_id:
                 return Response(
                     {
                         "error": "Permission denied",
@@ -1075,8 +1032,8 @@ def information_update(request, information_id):
         # Process form data
         data = process_form_data(request.data)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            data['university'] = information.university.id
+        if request.upsight_role.is_university_staff:
+            data['university'] = information.university_id
         
         serializer = InformationCreateUpdateSerializer(
             information,
@@ -1126,8 +1083,7 @@ def information_update(request, information_id):
 def information_delete(request, information_id):
     """Delete information item"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can delete information."},
                 status=status.HTTP_403_FORBIDDEN
@@ -1135,9 +1091,8 @@ def information_delete(request, information_id):
         
         information = Information.objects.get(id=information_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != information.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != information.university_id:
                 return Response(
                     {"error": "Permission denied. You can only delete your university's information."},
                     status=status.HTTP_403_FORBIDDEN
@@ -1168,8 +1123,7 @@ def information_delete(request, information_id):
 def information_documents_list(request):
     """Get list of information documents based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view information documents."},
                 status=status.HTTP_403_FORBIDDEN
@@ -1178,10 +1132,10 @@ def information_documents_list(request):
         documents = InformationDocuments.objects.select_related('information__university').all()
         
         # Filter based on user permissions
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university:
-                documents = documents.filter(information__university=user_university)
+        if request.upsight_role.is_university_staff:
+            university_id = request.upsight_role.university_id
+            if university_id:
+                documents = documents.filter(information__university_id=university_id)
             else:
                 documents = documents.none()
         
@@ -1207,8 +1161,7 @@ def information_documents_list(request):
 def information_document_detail(request, document_id):
     """Get information document details based on user role"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view information document details."},
                 status=status.HTTP_403_FORBIDDEN
@@ -1216,9 +1169,8 @@ def information_document_detail(request, document_id):
         
         document = InformationDocuments.objects.select_related('information__university').get(id=document_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != document.information.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != document.information.university_id:
                 return Response(
                     {"error": "Permission denied. You can only view your university's information documents."},
                     status=status.HTTP_403_FORBIDDEN
@@ -1245,8 +1197,7 @@ def information_document_detail(request, document_id):
 def information_document_create(request):
     """Create information document item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -1259,11 +1210,10 @@ def information_document_create(request):
         data = process_form_data(request.data)
         
         # Validate information belongs to user's university for university_staff
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
+        if request.upsight_role.is_university_staff:
             try:
                 information = Information.objects.get(id=data.get('information'))
-                if user_university != information.university:
+                if request.upsight_role.university_id != information.university_id:
                     return Response(
                         {
                             "error": "Permission denied",
@@ -1332,8 +1282,7 @@ def information_document_create(request):
 def information_document_update(request, document_id):
     """Update information document item with enhanced form data handling"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {
                     "error": "Permission denied",
@@ -1353,9 +1302,8 @@ def information_document_update(request, document_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != document.information.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != document.information.university_id:
                 return Response(
                     {
                         "error": "Permission denied",
@@ -1415,8 +1363,7 @@ def information_document_update(request, document_id):
 def information_document_delete(request, document_id):
     """Delete information document item"""
     try:
-        if not (request.user.groups.filter(name="upsight_staff").exists() or
-                request.user.groups.filter(name="university_staff").exists()):
+        if not request.upsight_role.is_board_staff:
             return Response(
                 {"error": "Permission denied. Only staff can delete information documents."},
                 status=status.HTTP_403_FORBIDDEN
@@ -1424,9 +1371,8 @@ def information_document_delete(request, document_id):
         
         document = InformationDocuments.objects.select_related('information__university').get(id=document_id)
         
-        if request.user.groups.filter(name="university_staff").exists():
-            user_university = get_user_university(request.user)
-            if user_university != document.information.university:
+        if request.upsight_role.is_university_staff:
+            if request.upsight_role.university_id != document.information.university_id:
                 return Response(
                     {"error": "Permission denied. You can only delete your university's information documents."},
                     status=status.HTTP_403_FORBIDDEN
@@ -1449,3 +1395,76 @@ def information_document_delete(request, document_id):
             {"error": "Failed to delete information document", "details": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+# Search
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """Ranked full-text search over news, notices, translations and information"""
+    try:
+        role = request.upsight_role
+        if not role.is_board_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can search the board."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"error": "The 'q' parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+        unknown = set(kinds) - set(board_search.SEARCH_MODELS)
+        if unknown:
+            return Response(
+                {
+                    "error": f"Unknown type(s): {', '.join(sorted(unknown))}",
+                    "allowed": list(board_search.SEARCH_MODELS),
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', board_search.DEFAULT_LIMIT))
+            offset = int(request.query_params.get('offset', 0))
+            university_id = request.query_params.get('university')
+            university_id = int(university_id) if university_id else None
+        except ValueError:
+            return Response(
+                {"error": "'limit', 'offset' and 'university' must be integers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, board_search.MAX_LIMIT))
+        offset = max(0, offset)
+
+        # Same scoping as filter_by_permissions: university staff only see their own
+        if not role.is_upsight_staff:
+            university_id = role.university_id
+        if role.is_upsight_staff or university_id:
+            results = board_search.search(
+                query, university_id=university_id, kinds=kinds, limit=limit, offset=offset
+            )
+        else:
+            results = []
+
+        return Response(
+            {
+                "query": query,
+                "results": results,
+                "limit": limit,
+                "offset": offset,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except NotImplementedError as e:
+        return Response({"error": str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to search", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
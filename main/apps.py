@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from .caching import connect_invalidation
+        from .models import Carousel, News, Person, Experience, Gallery, GalleryItem, Feedback, Report
+
+        connect_invalidation(Carousel, News, Person, Experience, Gallery, GalleryItem, Feedback, Report)
+
+        from management.images import register_image_derivatives
+
+        for model in (Carousel, News, GalleryItem, Person):
+            register_image_derivatives(model, 'image')
@@ -0,0 +1,174 @@
+"""
+Response cache for the public ``main`` API.
+
+Cached responses are stored under a key built from the viewset, action,
+``language`` parameter, pk, renderer format and host, plus the current
+"generation" of every model the viewset depends on. Saving or deleting one of
+those models bumps its generation through ``post_save``/``post_delete``, so
+stale entries are simply never read again and expire on their own.
+
+Every cached response carries a strong ``ETag`` (hash of the rendered data)
+and a ``Last-Modified`` date (the latest generation), and conditional
+requests are answered with ``304 Not Modified`` straight from the cache.
+
+Generations only reach every worker through a shared backend (Redis,
+Memcached) under ``MAIN_API_CACHE["ALIAS"]``. With a per-process backend a
+save would only retire the entries of the worker that handled it, so nothing
+is cached and no validators are sent.
+"""
+
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+_cache_settings = getattr(settings, "MAIN_API_CACHE", {})
+CACHE_ALIAS = _cache_settings.get("ALIAS", "default")
+CACHE_TIMEOUT = _cache_settings.get("TIMEOUT", 300)
+KEY_PREFIX = "main-api"
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def cache_is_shared():
+    """Whether every worker process sees the same cache"""
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def _generation_key(model):
+    return f"{KEY_PREFIX}:generation:{model._meta.label_lower}"
+
+
+def get_generations(models):
+    """Current generation (nanosecond timestamp of the last change) per model"""
+    cache = get_cache()
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            # add() keeps a value another process may have set meanwhile
+            cache.add(key, now, timeout=None)
+        generations.update(cache.get_many(missing))
+    return [generations.get(key, 0) for key in keys]
+
+
+def bump_generation(model):
+    get_cache().set(_generation_key(model), time.time_ns(), timeout=None)
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    bump_generation(sender)
+
+
+def connect_invalidation(*models):
+    """Invalidate cached responses whenever one of ``models`` is saved or deleted"""
+    for model in models:
+        uid = f"main-api-cache:{model._meta.label_lower}"
+        post_save.connect(invalidate_cached_responses, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_cached_responses, sender=model, dispatch_uid=uid)
+
+
+def make_entry(data, renderer_format, last_modified):
+    """
+    Cache entry for serialized ``data``: plain JSON types (``ReturnList`` and
+    ``ReturnDict`` keep a reference to their serializer) plus validators.
+    """
+    payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+    digest = hashlib.sha256(f"{renderer_format}:{payload}".encode()).hexdigest()
+    return {
+        "data": json.loads(payload),
+        "etag": f'"{digest[:32]}"',
+        "last_modified": last_modified,
+    }
+
+
+def cached_response(func):
+    """
+    Cache a read-only viewset action and answer conditional requests.
+
+    Runs after authentication and permission checks, so access control is
+    unchanged. Only ``200`` responses are cached, and only with a shared
+    cache backend.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        if not cache_is_shared():
+            return func(self, request, *args, **kwargs)
+        generations = get_generations(self.cache_models)
+        key = self.get_response_cache_key(request, generations, kwargs)
+        cache = get_cache()
+        entry = cache.get(key)
+
+        if entry is None:
+            response = func(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            entry = make_entry(
+                response.data,
+                request.accepted_renderer.format,
+                last_modified=max(generations) // 10**9,
+            )
+            cache.set(key, entry, CACHE_TIMEOUT)
+
+        response = Response(entry["data"])
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(entry["last_modified"])
+        # Returns a 304 carrying the validators when the client is up to date
+        return get_conditional_response(
+            request,
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+            response=response,
+        )
+
+    return wrapper
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list``/``retrieve`` of a read-only viewset from the response cache.
+
+    ``cache_models`` lists every model whose changes affect the output
+    (including nested serializers). Extra actions opt in with
+    ``@cached_response``.
+    """
+
+    cache_models = ()
+
+    def get_response_cache_key(self, request, generations, kwargs):
+        pk = ",".join(f"{name}={value}" for name, value in sorted(kwargs.items()))
+        parts = [
+            KEY_PREFIX,
+            type(self).__name__,
+            self.action,
+            request.GET.get("language", "ko"),
+            pk,
+            request.accepted_renderer.format,
+            # Serializers build absolute URLs from the request
+            request.build_absolute_uri("/"),
+            *map(str, generations),
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    @cached_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
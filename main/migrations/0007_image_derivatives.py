@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-16 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_news_file_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carousel',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryitem',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.urls import reverse
 
 class Carousel(models.Model):
     image = models.ImageField(upload_to="carousel_images/")
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
 
     def __str__(self):
         return f"img: {self.id}"
@@ -13,6 +14,7 @@ class News(models.Model):
     title_ko = models.CharField(max_length=100, null=True, blank=True)
     title_uz = models.CharField(max_length=100, null=True, blank=True)
     image = models.ImageField(upload_to="news_images/")
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
     content_ko = models.TextField(null=True, blank=True)
     content_uz = models.TextField(null=True, blank=True)
     file_field = models.FileField(
@@ -39,6 +41,7 @@ class Person(models.Model):
     position_uz = models.CharField(max_length=50)
     position_ko = models.CharField(max_length=50)
     image = models.ImageField(upload_to="person_images/")
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
 
     def get_full_name(self, language="ko"):
         return self.full_name_ko if language == "ko" else self.full_name_uz
@@ -87,6 +90,7 @@ class GalleryItem(models.Model):
     description_ko = models.TextField(null=True, blank=True)
     description_uz = models.TextField(null=True, blank=True)
     image = models.ImageField(upload_to="gallery_images/gallery_items_images/")
+    image_derivatives = models.CharField(max_length=100, blank=True, null=True, editable=False)
 
     def get_description(self, language="ko"):
         return self.description_ko if language == "ko" else self.description_uz
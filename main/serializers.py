@@ -1,14 +1,18 @@
 from rest_framework import serializers
+from management.images import ImageSrcsetField
 from .models import Carousel, News, Person, Experience, Gallery, GalleryItem, AboutUs, Feedback, Report
 
 
 class CarouselSerializer(serializers.ModelSerializer):
+    image_srcset = ImageSrcsetField(source='image')
+
     class Meta:
         model = Carousel
-        fields = '__all__'
+        exclude = ['image_derivatives']
 
 
 class NewsSerializer(serializers.ModelSerializer):
+    image_srcset = ImageSrcsetField(source='image')
     title = serializers.SerializerMethodField()
     content = serializers.SerializerMethodField()
     detail_url = serializers.SerializerMethodField()
@@ -29,7 +33,7 @@ class NewsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = News
-        fields = '__all__'
+        exclude = ['image_derivatives']
 
 
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -45,14 +49,16 @@ class ExperienceSerializer(serializers.ModelSerializer):
 
 
 class PersonSerializer(serializers.ModelSerializer):
+    image_srcset = ImageSrcsetField(source='image')
     experiences = ExperienceSerializer(many=True, read_only=True)
 
     class Meta:
         model = Person
-        fields = '__all__'
+        exclude = ['image_derivatives']
 
 
 class GalleryItemSerializer(serializers.ModelSerializer):
+    image_srcset = ImageSrcsetField(source='image')
     description = serializers.SerializerMethodField()
 
     def get_description(self, obj):
@@ -61,7 +67,7 @@ class GalleryItemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = GalleryItem
-        fields = '__all__'
+        exclude = ['image_derivatives']
 
 
 class GallerySerializer(serializers.ModelSerializer):
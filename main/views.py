@@ -2,16 +2,19 @@ from rest_framework import viewsets
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Carousel, News, Person, Gallery, AboutUs, Feedback, GalleryItem, Report
+from .caching import CachedResponseMixin, cached_response
+from .models import Carousel, News, Person, Experience, Gallery, AboutUs, Feedback, GalleryItem, Report
 from .serializers import CarouselSerializer, NewsSerializer, FeedbackSerializer, ExperienceSerializer, PersonSerializer, GallerySerializer, GalleryItemSerializer, AboutUsSerializer, ReportSerializer
 
 
-class CarouselViewSet(viewsets.ReadOnlyModelViewSet):
+class CarouselViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (Carousel,)
     queryset = Carousel.objects.all()
     serializer_class = CarouselSerializer
 
 
-class NewsViewSet(viewsets.ReadOnlyModelViewSet):
+class NewsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (News,)
     queryset = News.objects.all().order_by('-id')
     serializer_class = NewsSerializer
 
@@ -21,8 +24,9 @@ class NewsViewSet(viewsets.ReadOnlyModelViewSet):
         return context
 
 
-class PersonViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Person.objects.all()
+class PersonViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (Person, Experience)
+    queryset = Person.objects.prefetch_related('experiences')
     serializer_class = PersonSerializer
 
     def get_serializer_context(self):
@@ -31,6 +35,7 @@ class PersonViewSet(viewsets.ReadOnlyModelViewSet):
         return context
 
     @action(detail=True, methods=['get'])
+    @cached_response
     def experiences(self, request, pk=None):
         person = self.get_object()
         experiences = person.experiences.all()
@@ -49,8 +54,9 @@ class GalleryItemViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
         
         
-class GalleryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Gallery.objects.all()
+class GalleryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (Gallery, GalleryItem)
+    queryset = Gallery.objects.prefetch_related('items')
     serializer_class = GallerySerializer
 
     def get_serializer_context(self):
@@ -59,6 +65,7 @@ class GalleryViewSet(viewsets.ReadOnlyModelViewSet):
         return context
 
     @action(detail=True, methods=['get'])
+    @cached_response
     def items(self, request, pk=None):
         gallery = self.get_object()
         items = gallery.items.all()
@@ -71,7 +78,8 @@ class AboutUsViewSet(viewsets.ModelViewSet):
     serializer_class = AboutUsSerializer
 
 
-class FeedbackViewSet(viewsets.ReadOnlyModelViewSet):
+class FeedbackViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (Feedback,)
     queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
 
@@ -81,6 +89,7 @@ class FeedbackViewSet(viewsets.ReadOnlyModelViewSet):
         return context
         
         
-class ReportViewSet(viewsets.ReadOnlyModelViewSet):
+class ReportViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_models = (Report,)
     queryset = Report.objects.all()
     serializer_class = ReportSerializer
\ No newline at end of file
@@ -21,7 +21,10 @@ from .models import (
     CareerCounsel,
     CareerHistory,
     ClassPayment,
-    EnterancePayment
+    EnterancePayment,
+    BackgroundJob,
+    PaymentRollup,
+    StudentBalance,
 )
 
 
@@ -426,3 +429,39 @@ class CareerAdmin(ModelAdmin):
         return f"{obj.name_ko} / {obj.name_uz}"
 
     get_name_display.short_description = "Name (KO/UZ)"
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(ModelAdmin):
+    list_display = ["id", "task", "status", "attempts", "object_type", "object_id", "created_at", "finished_at"]
+    list_filter = ["status", "task"]
+    search_fields = ["object_type", "object_id"]
+    readonly_fields = ["locked_by", "locked_at", "created_at", "finished_at"]
+
+
+@admin.register(PaymentRollup)
+class PaymentRollupAdmin(ModelAdmin):
+    list_display = ["period", "payment_type", "university", "class_model", "total_amount", "payment_count", "updated_at"]
+    list_filter = ["payment_type", "period"]
+
+    def has_add_permission(self, request):
+        # Rows are maintained from the payment tables (see management/rollups.py)
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StudentBalance)
+class StudentBalanceAdmin(ModelAdmin):
+    list_display = ["student", "class_model", "registration_state", "expected_amount", "paid_amount", "outstanding_amount", "unpaid_months", "updated_at"]
+    list_filter = ["registration_state", "unpaid_months"]
+    search_fields = ["student__name_ko", "student__name_uz", "student__student_id"]
+    list_select_related = ["student", "class_model"]
+
+    def has_add_permission(self, request):
+        # Rows are maintained from the payment tables (see management/balances.py)
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
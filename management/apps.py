@@ -4,3 +4,33 @@ from django.apps import AppConfig
 class ManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'management'
+
+    def ready(self):
+        # Connect the signal handlers that invalidate cached JWT user state
+        from . import authentication  # noqa: F401
+        from main.caching import connect_invalidation
+
+        from .balances import connect_balance_hooks
+        from .images import register_image_derivatives
+        from .models import (
+            AttachedDocument,
+            Class,
+            ClassTimeTable,
+            Employee,
+            EmployeeDocument,
+            EnteranceDocument,
+            Student,
+            University,
+        )
+        from .rollups import connect_rollup_hooks
+        from .tasks import register_file_inspection
+
+        register_image_derivatives(Student, "picture")
+        register_image_derivatives(Employee, "picture")
+        register_image_derivatives(University, "logo")
+        for model in (AttachedDocument, EmployeeDocument, EnteranceDocument):
+            register_file_inspection(model, "file")
+        connect_rollup_hooks()
+        connect_balance_hooks()
+        # Cached schedule weeks (see management/schedule.py)
+        connect_invalidation(Class, ClassTimeTable, Employee)
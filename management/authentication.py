@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import UniversityManager
+
+
+class UpsightTokenUser(TokenUser):
+    """
+    Stateless user backed by the claims that ``get_tokens_for_user`` puts into
+    every token (``groups``, ``role``, ``user_type``, ``university_id``).
+    """
+
+    @property
+    def group_names(self):
+        return self.token.get("groups", [])
+
+
+class RevocationCache:
+    """Bounded, thread-safe LRU cache of user state with a time-to-live"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache_settings = getattr(settings, "JWT_REVOCATION_CACHE", {})
+revocation_cache = RevocationCache(
+    max_size=_cache_settings.get("MAX_SIZE", 4096),
+    ttl=_cache_settings.get("TTL", 60),
+)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_revocation_cache(sender, instance, **kwargs):
+    revocation_cache.discard(instance.pk)
+
+
+@receiver(post_save, sender=UniversityManager)
+@receiver(post_delete, sender=UniversityManager)
+def invalidate_manager_revocation_cache(sender, instance, **kwargs):
+    revocation_cache.discard(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_group_revocation_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        revocation_cache.discard(instance.pk)
+    elif pk_set is None:
+        # group.user_set.clear() does not say which users it removed
+        revocation_cache.clear()
+    else:
+        for user_id in pk_set:
+            revocation_cache.discard(user_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_all_revocation_cache(sender, **kwargs):
+    # Renaming or deleting a group changes the group names of its members
+    revocation_cache.clear()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the role and university claims in the token.
+
+    Instead of loading the ``User`` row on every request it returns an
+    ``UpsightTokenUser``. The database is only consulted to check that the
+    user still exists and is active, still has the groups and managed
+    university the token claims (and, when ``CHECK_REVOKE_TOKEN`` is on, that
+    the password has not changed), and that answer is cached in-process for
+    ``JWT_REVOCATION_CACHE["TTL"]`` seconds. Tokens issued before the
+    ``groups`` claim was added fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if "groups" not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        self.check_revocation(user_id, validated_token)
+        return UpsightTokenUser(validated_token)
+
+    def check_revocation(self, user_id, validated_token):
+        state = revocation_cache.get(user_id)
+        if state is None:
+            state = self.load_revocation_state(user_id)
+            revocation_cache.set(user_id, state)
+
+        exists, is_active, password_hash, group_names, university_id = state
+        if not exists:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+                raise AuthenticationFailed(
+                    "The user's password has been changed.", code="password_changed"
+                )
+        if (
+            tuple(sorted(validated_token.get("groups") or ())) != group_names
+            # Employee tokens carry no university claim
+            or validated_token.get("university_id", university_id) != university_id
+        ):
+            raise AuthenticationFailed(
+                "The user's role has been changed.", code="role_changed"
+            )
+
+    @staticmethod
+    def load_revocation_state(user_id):
+        """
+        (exists, is_active, password hash, sorted group names, managed
+        university id) of a user, from one query
+        """
+        rows = list(
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(
+                "is_active", "password", "groups__name", "manager_profile__university_id"
+            )
+        )
+        if not rows:
+            return (False, False, None, (), None)
+        is_active, password, _, university_id = rows[0]
+        group_names = tuple(sorted({row[2] for row in rows if row[2]}))
+        return (True, is_active, get_md5_hash_password(password), group_names, university_id)
@@ -0,0 +1,162 @@
+"""
+Incremental maintenance of the ``StudentBalance`` arrears table.
+
+A balance is one student row of a class's payment matrix
+(``management.payment_matrix``). The due months of an active registration
+are ``1..current_month``, capped at ``period``. Each due month is expected to
+pay ``tuition_fee``, and every due month paid below the fee adds its
+remainder to ``outstanding_amount``. Inactive registrations owe nothing.
+
+``post_save``/``post_delete`` hooks on ``ClassPayment``,
+``ClassStudentRegistration`` and ``Class`` recompute the affected balances
+inside the writer's transaction, with the matrix's single grouped query
+restricted to the student (or the whole class). Bulk operations
+(``bulk_create``, ``QuerySet.update``, raw SQL) bypass the hooks; run
+``manage.py rebuild_balances`` after them.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .models import Class, ClassPayment, ClassStudentRegistration, StudentBalance
+from .payment_matrix import CLASS_COLUMNS, build_payment_matrices
+
+BALANCE_ATTR = "_student_balance_pair"
+BALANCE_FIELDS = (
+    "registration_state",
+    "due_months",
+    "expected_amount",
+    "paid_amount",
+    "outstanding_amount",
+    "unpaid_months",
+    "first_unpaid_month",
+)
+BATCH_SIZE = 1000
+# Classes whose matrices are computed together by rebuild_balances()
+CLASS_CHUNK_SIZE = 200
+
+
+def _balances(matrix):
+    """StudentBalance objects for the student rows of a payment matrix"""
+    fee = matrix["tuition_fee"]
+    for student in matrix["students"]:
+        active = student["registration_state"] == 1
+        due = max(0, min(matrix["current_month"], matrix["period"])) if active else 0
+        unpaid = [month for month, flag in zip(matrix["months"], student["outstanding"]) if flag]
+        yield StudentBalance(
+            student_id=student["id"],
+            class_model_id=matrix["class_id"],
+            registration_state=student["registration_state"],
+            due_months=due,
+            expected_amount=fee * due,
+            paid_amount=student["total_paid"],
+            outstanding_amount=student["outstanding_amount"],
+            unpaid_months=len(unpaid),
+            first_unpaid_month=unpaid[0] if unpaid else None,
+        )
+
+
+def refresh_balances(class_id, student_ids=None, create=True):
+    """
+    Recompute the balances of a class, or of ``student_ids`` in it. With
+    ``create=False`` only existing rows are updated, for deletions that may
+    be part of a cascade removing the class or student itself.
+    """
+    class_row = Class.objects.filter(pk=class_id).values(*CLASS_COLUMNS).first()
+    if class_row is None:
+        return 0
+    matrix = build_payment_matrices([class_row], student_ids)[class_id]
+    balances = list(_balances(matrix))
+    current = StudentBalance.objects.filter(class_model_id=class_id)
+    if student_ids is not None:
+        current = current.filter(student_id__in=student_ids)
+
+    with transaction.atomic():
+        if not create:
+            now = timezone.now()
+            for balance in balances:
+                current.filter(student_id=balance.student_id).update(
+                    **{field: getattr(balance, field) for field in BALANCE_FIELDS},
+                    updated_at=now,
+                )
+            return len(balances)
+        # Students no longer registered in the class
+        current.exclude(student_id__in=[balance.student_id for balance in balances]).delete()
+        StudentBalance.objects.bulk_create(
+            balances,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["student", "class_model"],
+            update_fields=[*BALANCE_FIELDS, "updated_at"],
+        )
+    return len(balances)
+
+
+def _pair(instance):
+    return instance.class_model_id, instance.student_id
+
+
+def _load_previous_pair(sender, instance, raw=False, **kwargs):
+    """Remember the class and student a changed payment or registration had"""
+    if raw or instance.pk is None:
+        setattr(instance, BALANCE_ATTR, None)
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list("class_model_id", "student_id")
+    setattr(instance, BALANCE_ATTR, previous.first())
+
+
+def _pair_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, BALANCE_ATTR, None)
+    for class_id, student_id in {previous, _pair(instance)} - {None}:
+        refresh_balances(class_id, [student_id])
+
+
+def _payment_deleted(sender, instance, **kwargs):
+    class_id, student_id = _pair(instance)
+    refresh_balances(class_id, [student_id], create=False)
+
+
+def _registration_deleted(sender, instance, **kwargs):
+    class_id, student_id = _pair(instance)
+    StudentBalance.objects.filter(class_model_id=class_id, student_id=student_id).delete()
+
+
+def _class_saved(sender, instance, created, raw=False, **kwargs):
+    # A new class has no registrations yet
+    if not raw and not created:
+        refresh_balances(instance.pk)
+
+
+def connect_balance_hooks():
+    for model in (ClassPayment, ClassStudentRegistration):
+        uid = f"student-balance:{model._meta.label_lower}"
+        pre_save.connect(_load_previous_pair, sender=model, dispatch_uid=uid)
+        post_save.connect(_pair_saved, sender=model, dispatch_uid=uid)
+    post_delete.connect(
+        _payment_deleted, sender=ClassPayment, dispatch_uid="student-balance:payment"
+    )
+    post_delete.connect(
+        _registration_deleted,
+        sender=ClassStudentRegistration,
+        dispatch_uid="student-balance:registration",
+    )
+    post_save.connect(_class_saved, sender=Class, dispatch_uid="student-balance:class")
+
+
+def rebuild_balances():
+    """Recompute every balance from the class, registration and payment tables"""
+    class_rows = list(Class.objects.order_by("id").values(*CLASS_COLUMNS))
+    count = 0
+    with transaction.atomic():
+        StudentBalance.objects.all().delete()
+        for start in range(0, len(class_rows), CLASS_CHUNK_SIZE):
+            matrices = build_payment_matrices(class_rows[start:start + CLASS_CHUNK_SIZE])
+            balances = [
+                balance for matrix in matrices.values() for balance in _balances(matrix)
+            ]
+            StudentBalance.objects.bulk_create(balances, batch_size=BATCH_SIZE)
+            count += len(balances)
+    return count
@@ -0,0 +1,313 @@
+"""
+Endpoint benchmarks for ``manage.py benchmark_endpoints``.
+
+Every named GET route of ``management``, ``board`` and ``main`` is requested
+with the Django test client as an ``upsight_staff`` user against generated
+data, in a test database and with private caches set up by the command. Each
+endpoint gets its SQL query count (cold caches), latency percentiles over
+repeated requests and the peak Python memory allocated while serving it.
+
+Detail routes use the first object of their model. The seeded data keeps a
+fixed number of parents (universities, classes, teachers, the first career,
+person, gallery and information post) and grows their children with the
+scale, so a query count that rises between scales points at an N+1.
+"""
+
+import math
+import time
+import tracemalloc
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from board.models import Information, InformationDocuments, News, Notice, Translation
+from main import models as main_models
+from main.caching import get_cache
+
+from .middleware import QueryRecorder
+from .models import (
+    BackgroundJob,
+    Career,
+    CareerCounsel,
+    CareerHistory,
+    Class,
+    ClassPayment,
+    Employee,
+    Enterance,
+    EnterancePayment,
+    Organ,
+    Student,
+    University,
+)
+from .schedule import feed_token
+
+URLCONFS = ("management.urls", "board.urls", "main.urls")
+
+# URL keyword -> model whose first row fills it
+KWARG_MODELS = {
+    "student_id": Student,
+    "employee_id": Employee,
+    "class_id": Class,
+    "university_id": University,
+    "enterance_id": Enterance,
+    "organ_id": Organ,
+    "career_id": Career,
+    "job_id": BackgroundJob,
+    "news_id": News,
+    "notice_id": Notice,
+    "translation_id": Translation,
+    "information_id": Information,
+    "document_id": InformationDocuments,
+    "gallery_pk": main_models.Gallery,
+}
+# Keywords whose model depends on the route
+ROUTE_KWARG_MODELS = {
+    ("entrance_payment_detail", "payment_id"): EnterancePayment,
+    ("class_payment_detail", "payment_id"): ClassPayment,
+}
+# Query strings of endpoints that need parameters, or functions of the URL kwargs
+QUERY_STRINGS = {
+    "board_search": "q=matni",
+    "teacher_calendar": lambda kwargs: f"token={feed_token(kwargs['employee_id'])}",
+}
+
+
+class Endpoint:
+    def __init__(self, name, pattern, callback):
+        self.name = name
+        self.pattern = pattern
+        self.callback = callback
+
+    @property
+    def accepts_get(self):
+        actions = getattr(self.callback, "actions", None)
+        if actions is not None:
+            return "get" in actions
+        view_class = getattr(self.callback, "cls", None)
+        if view_class is not None:
+            return hasattr(view_class, "get")
+        return True
+
+    def kwarg_model(self, kwarg):
+        model = ROUTE_KWARG_MODELS.get((self.name, kwarg)) or KWARG_MODELS.get(kwarg)
+        if model is None and kwarg == "pk":
+            model = self.callback.cls.queryset.model
+        return model
+
+    def build_path(self):
+        kwargs = {}
+        for kwarg in self.pattern.regex.groupindex:
+            model = self.kwarg_model(kwarg)
+            if model is None:
+                raise LookupError(f"No sample object for <{kwarg}> in {self.name}")
+            pk = model.objects.order_by("pk").values_list("pk", flat=True).first()
+            if pk is None:
+                raise LookupError(f"No {model._meta.label} rows for {self.name}")
+            kwargs[kwarg] = pk
+        path = reverse(self.name, kwargs=kwargs)
+        if self.name in QUERY_STRINGS:
+            query = QUERY_STRINGS[self.name]
+            path += "?" + (query(kwargs) if callable(query) else query)
+        return path
+
+
+def _walk(patterns, seen):
+    for entry in patterns:
+        if isinstance(entry, URLResolver):
+            yield from _walk(entry.url_patterns, seen)
+        elif isinstance(entry, URLPattern):
+            # Unnamed routes duplicate router routes; ".json" suffixes share names
+            if not entry.name or entry.name in seen:
+                continue
+            if "format" in entry.pattern.regex.groupindex:
+                continue
+            seen.add(entry.name)
+            yield Endpoint(entry.name, entry.pattern, entry.callback)
+
+
+def discover_endpoints(urlconfs=URLCONFS):
+    """Named routes of ``urlconfs`` that answer GET requests"""
+    seen = set()
+    endpoints = []
+    for urlconf in urlconfs:
+        module = __import__(urlconf, fromlist=["urlpatterns"])
+        endpoints.extend(
+            endpoint for endpoint in _walk(module.urlpatterns, seen) if endpoint.accepts_get
+        )
+    return endpoints
+
+
+def private_caches():
+    """
+    ``CACHES`` with a separate in-process cache for every configured alias, so
+    a benchmark never writes to or clears the deployment's cache
+    """
+    return {
+        alias: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"benchmark-{alias}",
+        }
+        for alias in settings.CACHES
+    }
+
+
+def seed_dataset(scale, seed=0):
+    """Generate ``scale`` rows per child table (see the module docstring)"""
+    call_command(
+        "seed_scale",
+        universities=2,
+        employees=4,
+        students=scale,
+        classes=3,
+        entrances=1,
+        class_payments=scale * 2,
+        enterance_payments=scale,
+        posts=scale,
+        seed=seed,
+        prefix=f"bench{scale}",
+        stdout=StringIO(),
+    )
+    today = timezone.localdate()
+
+    Organ.objects.bulk_create(
+        Organ(
+            name_uz=f"Tashkilot {i}",
+            name_ko=f"기관 {i}",
+            type="language",
+            nationality="uzbek",
+            email=f"bench{scale}-organ-{i}@example.com",
+            agreement_date=today,
+        )
+        for i in range(scale)
+    )
+    Career.objects.bulk_create(
+        Career(name_uz=f"Karyera {i}", name_ko=f"경력 {i}", birth_date=today, gender="male")
+        for i in range(scale)
+    )
+    first_career = Career.objects.order_by("pk").first()
+    CareerHistory.objects.bulk_create(
+        CareerHistory(
+            career=first_career,
+            work_title_uz="Ish",
+            work_title_ko="일",
+            start_date=today,
+            region_uz="Seul",
+            region_ko="서울",
+        )
+        for _ in range(scale)
+    )
+    CareerCounsel.objects.bulk_create(
+        CareerCounsel(career=first_career, date=today) for _ in range(scale)
+    )
+
+    first_information = Information.objects.order_by("pk").first()
+    InformationDocuments.objects.bulk_create(
+        InformationDocuments(
+            information=first_information,
+            file=f"information_documents/bench-{i}.pdf",
+            document_uz=f"Hujjat {i}",
+            document_ko=f"문서 {i}",
+        )
+        for i in range(scale)
+    )
+    BackgroundJob.objects.bulk_create(
+        BackgroundJob(task="files.inspect", payload={"index": i}, status="done")
+        for i in range(scale)
+    )
+
+    main_models.Carousel.objects.bulk_create(
+        main_models.Carousel(image=f"carousel_images/bench-{i}.jpg") for i in range(scale)
+    )
+    main_models.News.objects.bulk_create(
+        main_models.News(title_ko=f"뉴스 {i}", title_uz=f"Yangilik {i}", image=f"news_images/bench-{i}.jpg")
+        for i in range(scale)
+    )
+    main_models.Person.objects.bulk_create(
+        main_models.Person(position_uz="Xodim", position_ko="직원", image=f"person_images/bench-{i}.jpg")
+        for i in range(scale)
+    )
+    first_person = main_models.Person.objects.order_by("pk").first()
+    main_models.Experience.objects.bulk_create(
+        main_models.Experience(person=first_person, experience_ko=f"경험 {i}", experience_uz=f"Tajriba {i}")
+        for i in range(scale)
+    )
+    main_models.Gallery.objects.bulk_create(
+        main_models.Gallery(title_ko=f"갤러리 {i}", title_uz=f"Galereya {i}", image=f"gallery_images/bench-{i}.jpg")
+        for i in range(scale)
+    )
+    first_gallery = main_models.Gallery.objects.order_by("pk").first()
+    main_models.GalleryItem.objects.bulk_create(
+        main_models.GalleryItem(gallery=first_gallery, image=f"gallery_images/gallery_items_images/bench-{i}.jpg")
+        for i in range(scale)
+    )
+    main_models.AboutUs.objects.bulk_create(
+        main_models.AboutUs(fullname=f"Bench {i}") for i in range(scale)
+    )
+    main_models.Feedback.objects.bulk_create(
+        main_models.Feedback(fullname_uz=f"Bench {i}", image=f"feedback/bench-{i}.jpg")
+        for i in range(scale)
+    )
+    main_models.Report.objects.create()
+
+
+def benchmark_client():
+    user = User.objects.create_user(username="benchmark-staff", is_staff=True)
+    user.groups.add(Group.objects.get_or_create(name="upsight_staff")[0])
+    # Gives /api/auth/profile an employee to return
+    Employee.objects.filter(
+        pk=Employee.objects.order_by("pk").values("pk")[:1]
+    ).update(user=user)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _get(client, path):
+    response = client.get(path)
+    if response.streaming:
+        # Streaming responses (CSV exports) only query while being consumed
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def measure(client, connection, path, repeat):
+    """Query count, latency percentiles (ms) and peak memory (KiB) of GET ``path``"""
+    get_cache().clear()
+    # Counted with an execute wrapper: with DEBUG on, connection.queries_log
+    # is already full after seeding and stops growing
+    recorder = QueryRecorder(keep=0)
+    with connection.execute_wrapper(recorder):
+        response = _get(client, path)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _get(client, path)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    get_cache().clear()
+    tracemalloc.start()
+    try:
+        _get(client, path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": response.status_code,
+        "queries": recorder.count,
+        "p50_ms": round(percentile(timings, 0.5), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
@@ -0,0 +1,221 @@
+"""
+Room and teacher double-booking checks for ``ClassTimeTable``.
+
+Two timetable slots of different classes conflict when they are on the same
+day, overlap in time (slots that only touch do not) and either share the
+class ``classroom`` (compared case-insensitively) or a teacher
+(``teacher_first``/``teacher_second``).
+
+``TimetableIndex`` loads the slots in one query and groups them per
+(day, room) and (day, teacher), each group sorted by start time. Every
+overlap of the schedule is then found in one sweep over the groups,
+O(n log n) plus the number of conflicts, and a candidate slot is checked by
+bisecting its groups.
+"""
+
+import bisect
+import heapq
+from collections import defaultdict, namedtuple
+
+from .models import ClassTimeTable
+
+WEEKDAYS = [day for day, _ in ClassTimeTable.WEEKDAY_CHOICES]
+SLOT_COLUMNS = (
+    "id",
+    "class_model_id",
+    "days",
+    "start_time",
+    "end_time",
+    "class_model__classroom",
+    "class_model__teacher_first_id",
+    "class_model__teacher_first__name_ko",
+    "class_model__teacher_first__name_uz",
+    "class_model__teacher_second_id",
+    "class_model__teacher_second__name_ko",
+    "class_model__teacher_second__name_uz",
+)
+
+Slot = namedtuple(
+    "Slot", "id class_id day start_time end_time start end classroom teachers"
+)
+
+
+def _seconds(time):
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+def make_slot(day, start_time, end_time, classroom, teachers, class_id=None, slot_id=None):
+    return Slot(
+        slot_id,
+        class_id,
+        day,
+        start_time,
+        end_time,
+        _seconds(start_time),
+        _seconds(end_time),
+        classroom,
+        tuple(sorted({teacher for teacher in teachers if teacher is not None})),
+    )
+
+
+def _keys(slot):
+    """The (kind, day, resource) groups a slot occupies"""
+    room = (slot.classroom or "").strip().casefold()
+    if room:
+        yield ("room", slot.day, room)
+    for teacher in slot.teachers:
+        yield ("teacher", slot.day, teacher)
+
+
+class TimetableIndex:
+    def __init__(self, slots, teacher_names=None):
+        self.teacher_names = teacher_names or {}
+        self.groups = defaultdict(list)
+        for slot in slots:
+            for key in _keys(slot):
+                self.groups[key].append(slot)
+        self.starts, self.longest = {}, {}
+        for key, group in self.groups.items():
+            group.sort(key=lambda slot: (slot.start, slot.end, slot.id))
+            self.starts[key] = [slot.start for slot in group]
+            self.longest[key] = max(slot.end - slot.start for slot in group)
+
+    @classmethod
+    def build(cls, timetables=None):
+        """Index ``timetables`` (default: all of them), loaded in one query"""
+        if timetables is None:
+            timetables = ClassTimeTable.objects.all()
+        slots, names = [], {}
+        for row in timetables.order_by().values(*SLOT_COLUMNS):
+            teachers = []
+            for position in ("first", "second"):
+                teacher = row[f"class_model__teacher_{position}_id"]
+                teachers.append(teacher)
+                names[teacher] = (
+                    f"{row[f'class_model__teacher_{position}__name_ko']} / "
+                    f"{row[f'class_model__teacher_{position}__name_uz']}"
+                )
+            slots.append(
+                make_slot(
+                    row["days"],
+                    row["start_time"],
+                    row["end_time"],
+                    row["class_model__classroom"],
+                    teachers,
+                    class_id=row["class_model_id"],
+                    slot_id=row["id"],
+                )
+            )
+        return cls(slots, names)
+
+    def overlapping(self, slot):
+        """(group key, indexed slot) pairs that conflict with ``slot``"""
+        for key in _keys(slot):
+            group = self.groups.get(key)
+            if not group:
+                continue
+            starts = self.starts[key]
+            # No slot of the group is longer than ``longest``, so one starting
+            # that long before ``slot`` has ended by the time it starts
+            low = bisect.bisect_right(starts, slot.start - self.longest[key])
+            high = bisect.bisect_left(starts, slot.end)
+            for other in group[low:high]:
+                if (
+                    other.end > slot.start
+                    and other.class_id != slot.class_id
+                    and other.id != slot.id
+                ):
+                    yield key, other
+
+    def conflicts(self):
+        """(group key, earlier slot, later slot) for every overlap in the index"""
+        for key, group in self.groups.items():
+            # Slots that are still running, by end time
+            running = []
+            for slot in group:
+                while running and running[0][0] <= slot.start:
+                    heapq.heappop(running)
+                for _, _, other in running:
+                    if other.class_id != slot.class_id:
+                        yield key, other, slot
+                heapq.heappush(running, (slot.end, slot.id, slot))
+
+    def conflict_row(self, key, first, second):
+        kind, day, resource = key
+        row = {"kind": kind, "day": day}
+        if kind == "room":
+            row["classroom"] = first.classroom
+        else:
+            row["teacher_id"] = resource
+            row["teacher_name"] = self.teacher_names.get(resource)
+        row["first"] = _slot_row(first)
+        row["second"] = _slot_row(second)
+        row["overlap_start"] = max(first.start_time, second.start_time)
+        row["overlap_end"] = min(first.end_time, second.end_time)
+        return row
+
+    def report(self, day=None, kind=None):
+        """Every conflict of the index as API rows, by day, kind, resource and time"""
+        rows = [
+            self.conflict_row(key, first, second)
+            for key, first, second in self.conflicts()
+            if (day is None or key[1] == day) and (kind is None or key[0] == kind)
+        ]
+        day_order = {day: position for position, day in enumerate(WEEKDAYS)}
+        rows.sort(
+            key=lambda row: (
+                day_order.get(row["day"], len(WEEKDAYS)),
+                row["kind"],
+                str(row.get("classroom") or row.get("teacher_id")),
+                row["overlap_start"],
+                row["first"]["timetable_id"],
+                row["second"]["timetable_id"],
+            )
+        )
+        return rows
+
+
+def _slot_row(slot):
+    return {
+        "timetable_id": slot.id,
+        "class_id": slot.class_id,
+        "start_time": slot.start_time,
+        "end_time": slot.end_time,
+    }
+
+
+def slot_conflicts(class_model, days, start_time, end_time, exclude_id=None):
+    """
+    Messages describing the timetable slots that a slot of ``class_model`` on
+    ``days`` from ``start_time`` to ``end_time`` would double-book, checked
+    against the stored timetables of those days (one query).
+    """
+    if isinstance(days, str):
+        days = [days]
+    if not days or class_model is None or start_time >= end_time:
+        return []
+    timetables = ClassTimeTable.objects.filter(days__in=days)
+    if exclude_id is not None:
+        timetables = timetables.exclude(id=exclude_id)
+    index = TimetableIndex.build(timetables)
+    messages = []
+    for day in days:
+        slot = make_slot(
+            day,
+            start_time,
+            end_time,
+            class_model.classroom,
+            (class_model.teacher_first_id, class_model.teacher_second_id),
+            class_id=class_model.pk,
+        )
+        for (kind, _, resource), other in index.overlapping(slot):
+            booked = (
+                f"Classroom {other.classroom}"
+                if kind == "room"
+                else f"Teacher {index.teacher_names.get(resource, resource)}"
+            )
+            messages.append(
+                f"{booked} is already booked on {day} from "
+                f"{other.start_time:%H:%M} to {other.end_time:%H:%M} by class {other.class_id}."
+            )
+    return messages
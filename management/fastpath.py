@@ -0,0 +1,360 @@
+"""
+Compiled, ``values()``-based serialization for hot list endpoints.
+
+A ``CompiledSerializer`` wraps an existing DRF ``ModelSerializer`` and produces
+exactly the same representation, but reads plain ``values()`` rows instead of
+model instances and skips DRF's per-field ``get_attribute`` dispatch. The field
+plan is worked out once per serializer class; each request only binds the
+request-dependent parts (absolute media URLs, the active time zone) and then
+runs one tight loop per row.
+
+Model fields with a plain ``source`` are compiled automatically. Method fields
+and dotted/callable sources must be described with one of the specs below:
+
+    StudentListSerializer = CompiledSerializer(
+        StudentSerializer,
+        name=FirstOf("name_ko", "name_uz"),
+        avatar=MediaURL("picture", storage=default_storage, default=PLACEHOLDER),
+    )
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .images import (
+    ImageSrcsetField,
+    build_srcset,
+    derivatives_field_name,
+    thumbnail_name,
+    url_builder,
+)
+
+
+class Spec:
+    """Describes how to compute one output field from a ``values()`` row"""
+
+    columns = ()
+
+    def bind(self, context):
+        """Return a ``row -> value`` accessor for the current request"""
+        raise NotImplementedError
+
+    def prepare(self, rows, context):
+        """Hook to load data for all rows at once before they are serialized"""
+
+
+class Column(Spec):
+    """A single column, optionally passed through ``convert`` when not None"""
+
+    def __init__(self, column, convert=None):
+        self.column = column
+        self.columns = (column,)
+        self.convert = convert
+
+    def bind(self, context):
+        column, convert = self.column, self.convert
+        if convert is None:
+            return lambda row: row[column]
+
+        def accessor(row):
+            value = row[column]
+            return None if value is None else convert(value)
+
+        return accessor
+
+
+class FirstOf(Spec):
+    """``row[a] or row[b] or ...`` - the bilingual ``name_ko or name_uz`` idiom"""
+
+    def __init__(self, *columns):
+        self.columns = columns
+
+    def bind(self, context):
+        first, *rest = self.columns
+
+        def accessor(row):
+            value = row[first]
+            for column in rest:
+                value = value or row[column]
+            return value
+
+        return accessor
+
+
+class Constant(Spec):
+    """The same value for every row"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def bind(self, context):
+        value = self.value
+        return lambda row: value
+
+
+class Display(Spec):
+    """Equivalent of ``get_<field>_display()`` for a choices column"""
+
+    def __init__(self, column, choices):
+        self.column = column
+        self.columns = (column,)
+        self.labels = {key: str(label) for key, label in choices}
+
+    def bind(self, context):
+        column, labels = self.column, self.labels
+
+        def accessor(row):
+            value = row[column]
+            return labels.get(value, value)
+
+        return accessor
+
+
+class Format(Spec):
+    """``template.format(*columns)``, e.g. ``University.__str__``"""
+
+    def __init__(self, template, *columns):
+        self.template = template
+        self.columns = columns
+
+    def bind(self, context):
+        template, columns = self.template, self.columns
+        return lambda row: template.format(*(row[column] for column in columns))
+
+
+class Computed(Spec):
+    """``func(*columns)`` for logic the other specs do not cover"""
+
+    def __init__(self, func, *columns):
+        self.func = func
+        self.columns = columns
+
+    def bind(self, context):
+        func, columns = self.func, self.columns
+        return lambda row: func(*(row[column] for column in columns))
+
+
+class MediaURL(Spec):
+    """
+    URL of a stored file, made absolute with the request like DRF's FileField.
+
+    Empty files produce ``default``; when ``absolute_only`` is set (the
+    ``get_avatar`` idiom) a missing request also produces ``default``.
+    With ``thumbnail`` set the URL is that of the thumbnail variant once the
+    ``<column>_derivatives`` column says it exists.
+    """
+
+    def __init__(
+        self, column, storage=None, default=None, absolute_only=False, thumbnail=False
+    ):
+        self.column = column
+        self.columns = (column,)
+        self.storage = storage
+        self.default = default
+        self.absolute_only = absolute_only
+        self.thumbnail = thumbnail
+        if thumbnail:
+            self.columns += (derivatives_field_name(column),)
+
+    def bind(self, context):
+        column, default, storage = self.column, self.default, self.storage
+        if self.thumbnail:
+            derivatives = derivatives_field_name(column)
+
+            def url(row):
+                name = row[column]
+                return storage.url(thumbnail_name(name, row[derivatives] == name))
+
+        else:
+
+            def url(row):
+                return storage.url(row[column])
+
+        request = context.get("request")
+        if request is None:
+            if self.absolute_only:
+                return lambda row: default
+            return lambda row: url(row) if row[column] else default
+
+        build_absolute_uri = request.build_absolute_uri
+        return lambda row: (
+            build_absolute_uri(url(row)) if row[column] else default
+        )
+
+
+class DateTimeColumn(Spec):
+    """
+    A ``DateTimeField`` column rendered like DRF's ``DateTimeField``.
+
+    DRF looks up the active time zone for every value; here it is resolved
+    once in ``bind`` and aware values are formatted directly. Anything else
+    (naive values, custom formats) goes through the DRF field unchanged.
+    """
+
+    def __init__(self, column, field):
+        self.column = column
+        self.columns = (column,)
+        self.field = field
+
+    def bind(self, context):
+        column, field = self.column, self.field
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = (
+            field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        )
+        if (
+            field_timezone is None
+            or output_format is None
+            or output_format.lower() != ISO_8601
+        ):
+            return Column(column, convert=field.to_representation).bind(context)
+
+        to_representation = field.to_representation
+
+        def accessor(row):
+            value = row[column]
+            if not value:
+                return None
+            if value.tzinfo is None:
+                return to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+
+        return accessor
+
+
+class Srcset(Spec):
+    """An ``ImageSrcsetField``: the srcset map of an image column"""
+
+    def __init__(self, column, storage):
+        self.column = column
+        self.columns = (column, derivatives_field_name(column))
+        self.storage = storage
+
+    def bind(self, context):
+        column, storage = self.column, self.storage
+        derivatives = derivatives_field_name(column)
+        build_url = url_builder(context.get("request"))
+        return lambda row: (
+            build_srcset(storage, row[column], build_url, row[derivatives] == row[column])
+            if row[column]
+            else None
+        )
+
+
+class Nested(Spec):
+    """
+    A reverse relation serialized with another ``CompiledSerializer``.
+
+    All children of the current rows are loaded with a single query in
+    ``prepare`` and grouped by their foreign key.
+    """
+
+    columns = ("id",)
+
+    def __init__(self, compiled, queryset, fk):
+        self.compiled = compiled
+        self.queryset = queryset
+        self.fk = fk
+
+    def prepare(self, rows, context):
+        parent_ids = [row["id"] for row in rows]
+        children = list(
+            self.compiled.values(
+                self.queryset.filter(**{f"{self.fk}__in": parent_ids}), self.fk
+            )
+        )
+        groups = defaultdict(list)
+        for child, data in zip(children, self.compiled.serialize(children, context)):
+            groups[child[self.fk]].append(data)
+        context.setdefault("_nested", {})[id(self)] = groups
+
+    def bind(self, context):
+        groups = context["_nested"][id(self)]
+        return lambda row: groups.get(row["id"], [])
+
+
+def _spec_for_field(field, model):
+    """Derive a spec for a DRF field that maps directly onto a model column"""
+    source = field.source
+    if "." in source or source == "*":
+        return None
+    try:
+        model_field = model._meta.get_field(source)
+    except Exception:
+        return None
+    if model_field.is_relation and not model_field.concrete:
+        return None
+
+    if isinstance(field, ImageSrcsetField):
+        return Srcset(source, model_field.storage)
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return Column(source)
+    if isinstance(field, serializers.FileField):
+        if not getattr(field, "use_url", True):
+            return Column(source, convert=lambda name: name or None)
+        return MediaURL(source, storage=model_field.storage)
+    if isinstance(field, serializers.DateTimeField):
+        return DateTimeColumn(source, field)
+    if isinstance(field, (serializers.CharField, serializers.IntegerField)):
+        # The database already returns str/int, which is what DRF would emit
+        return Column(source)
+    return Column(source, convert=field.to_representation)
+
+
+class CompiledSerializer:
+    """Fast read-only counterpart of a DRF ``ModelSerializer`` for list endpoints"""
+
+    def __init__(self, serializer_class, **overrides):
+        self.serializer_class = serializer_class
+        self.overrides = overrides
+        self._plan = None
+
+    @property
+    def plan(self):
+        if self._plan is None:
+            self._plan = self._compile()
+        return self._plan
+
+    def _compile(self):
+        model = self.serializer_class.Meta.model
+        plan = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            spec = self.overrides.get(name) or _spec_for_field(field, model)
+            if spec is None:
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{name} cannot be compiled "
+                    f"automatically; pass a spec for it to CompiledSerializer."
+                )
+            plan.append((name, spec))
+        return plan
+
+    @property
+    def columns(self):
+        columns = []
+        for _, spec in self.plan:
+            for column in spec.columns:
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def values(self, queryset, *extra):
+        """``queryset.values()`` with every column the plan needs plus ``extra``"""
+        columns = self.columns + [column for column in extra if column not in self.columns]
+        return queryset.values(*columns)
+
+    def serialize(self, rows, context=None):
+        """Serialize ``values()`` rows into a list of plain dicts"""
+        context = dict(context or {})
+        rows = list(rows)
+        for _, spec in self.plan:
+            spec.prepare(rows, context)
+        accessors = [(name, spec.bind(context)) for name, spec in self.plan]
+        return [{name: accessor(row) for name, accessor in accessors} for row in rows]
@@ -0,0 +1,217 @@
+"""
+Resized and WebP derivatives of uploaded images.
+
+For an upload stored as ``news_images/photo.jpg`` every configured width gets
+two files next to it:
+
+    news_images/derivatives/photo-64w.jpg
+    news_images/derivatives/photo-64w.webp
+
+Saving one of the fields passed to ``register_image_derivatives`` queues an
+``images.generate_derivatives`` job (see ``management/tasks.py``); existing
+uploads can be backfilled with ``manage.py generate_image_derivatives``. Images are never upscaled: a
+variant wider than the original keeps the original size, so the names (and
+therefore the URLs) depend only on the original file name.
+
+Each registered field has a ``<field>_derivatives`` column holding the file
+name the stored derivatives were made from. The job writes it when it
+finishes, so serializers know whether the variants exist without asking the
+storage, and replacing the upload makes the column stale by itself.
+"""
+
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+from main.caching import bump_generation
+
+logger = logging.getLogger(__name__)
+
+_derivative_settings = getattr(settings, "IMAGE_DERIVATIVES", {})
+DERIVATIVE_WIDTHS = tuple(sorted(_derivative_settings.get("WIDTHS", (64, 320, 640, 1280))))
+THUMBNAIL_WIDTH = _derivative_settings.get("THUMBNAIL_WIDTH", 64)
+QUALITY = _derivative_settings.get("QUALITY", 85)
+WEBP_QUALITY = _derivative_settings.get("WEBP_QUALITY", 80)
+DERIVATIVES_DIR = "derivatives"
+
+# model -> image field names, filled by register_image_derivatives
+registered_image_fields = {}
+
+
+def derivative_name(name, width, webp=False):
+    """Storage name of the ``width`` variant of ``name``"""
+    directory, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    if webp:
+        ext = ".webp"
+    return os.path.join(directory, DERIVATIVES_DIR, f"{stem}-{width}w{ext}")
+
+
+def derivatives_field_name(field_name):
+    """Column recording which upload of ``field_name`` has derivatives"""
+    return f"{field_name}_derivatives"
+
+
+def derivatives_ready(instance, field_name):
+    """Whether the current file of ``field_name`` has derivatives, from the row alone"""
+    fieldfile = getattr(instance, field_name)
+    return bool(fieldfile) and (
+        getattr(instance, derivatives_field_name(field_name)) == fieldfile.name
+    )
+
+
+def mark_derivatives(model, pk, field_name, name):
+    """Record that ``name`` has derivatives, unless the row has another file by now"""
+    # update() sends no post_save, which would queue the job again
+    updated = model._default_manager.filter(pk=pk, **{field_name: name}).update(
+        **{derivatives_field_name(field_name): name}
+    )
+    if updated:
+        bump_generation(model)
+    return bool(updated)
+
+
+def has_derivatives(storage, name):
+    """
+    Whether derivatives of ``name`` are available. The smallest WebP variant
+    is written last, so its presence means the whole set is complete.
+    """
+    return storage.exists(derivative_name(name, DERIVATIVE_WIDTHS[0], webp=True))
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == "JPEG":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buffer, "JPEG", quality=QUALITY, optimize=True, progressive=True)
+    elif image_format == "WEBP":
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def _store(storage, name, content):
+    # Overwrite instead of letting the storage pick an alternative name
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def generate_derivatives(storage, name):
+    """Create all width variants of ``name`` in its own format and as WebP"""
+    with storage.open(name, "rb") as source:
+        with Image.open(source) as original:
+            # Multi-picture JPEGs from phone cameras open as MPO
+            image_format = "JPEG" if original.format == "MPO" else original.format
+            image = ImageOps.exif_transpose(original)
+            image.load()
+
+    variants = []
+    for width in DERIVATIVE_WIDTHS:
+        variant = image.copy()
+        if variant.width > width:
+            height = max(1, round(variant.height * width / variant.width))
+            variant = variant.resize((width, height), Image.LANCZOS)
+        variants.append((width, variant))
+
+    for width, variant in variants:
+        _store(storage, derivative_name(name, width), _encode(variant, image_format))
+    for width, variant in reversed(variants):
+        _store(storage, derivative_name(name, width, webp=True), _encode(variant, "WEBP"))
+
+
+def ensure_derivatives(fieldfile):
+    """
+    Generate derivatives for ``fieldfile`` unless they already exist, and
+    record them on its row. Returns whether new files were created.
+    """
+    if not fieldfile:
+        return False
+    created = False
+    if not has_derivatives(fieldfile.storage, fieldfile.name):
+        try:
+            generate_derivatives(fieldfile.storage, fieldfile.name)
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError, ValueError):
+            logger.warning("Could not create derivatives of %s", fieldfile.name, exc_info=True)
+            return False
+        created = True
+    instance = fieldfile.instance
+    mark_derivatives(type(instance), instance.pk, fieldfile.field.name, fieldfile.name)
+    return created
+
+
+def register_image_derivatives(model, *field_names):
+    """Queue derivative generation for ``field_names`` whenever ``model`` is saved"""
+
+    def create_derivatives(sender, instance, **kwargs):
+        from .tasks import enqueue_image_derivatives
+
+        enqueue_image_derivatives(instance, field_names)
+
+    for field_name in field_names:
+        try:
+            model._meta.get_field(derivatives_field_name(field_name))
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                f"{model._meta.label} needs a {derivatives_field_name(field_name)} "
+                f"column to register {field_name} for image derivatives."
+            )
+    registered_image_fields[model] = field_names
+    post_save.connect(
+        create_derivatives,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"image-derivatives:{model._meta.label_lower}",
+    )
+
+
+def thumbnail_name(name, ready, width=THUMBNAIL_WIDTH):
+    """Name of the ``width`` variant when derivatives are ``ready``, otherwise ``name``"""
+    if ready:
+        return derivative_name(name, width)
+    return name
+
+
+def build_srcset(storage, name, build_url, ready):
+    """
+    ``{"src", "widths", "webp"}`` map for ``name``; the width maps are empty
+    until derivatives are ``ready``.
+    """
+    srcset = {"src": build_url(storage.url(name)), "widths": {}, "webp": {}}
+    if ready:
+        for width in DERIVATIVE_WIDTHS:
+            key = str(width)
+            srcset["widths"][key] = build_url(storage.url(derivative_name(name, width)))
+            srcset["webp"][key] = build_url(
+                storage.url(derivative_name(name, width, webp=True))
+            )
+    return srcset
+
+
+def url_builder(request):
+    """Absolute URLs when a request is available, like DRF's ``ImageField``"""
+    if request is None:
+        return lambda url: url
+    return request.build_absolute_uri
+
+
+class ImageSrcsetField(serializers.ReadOnlyField):
+    """Serializes an image field as a ``build_srcset`` map (``None`` when empty)"""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        build_url = url_builder(self.context.get("request"))
+        ready = derivatives_ready(value.instance, value.field.name)
+        return build_srcset(value.storage, value.name, build_url, ready)
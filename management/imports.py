@@ -0,0 +1,299 @@
+"""
+Bulk import of spreadsheet rows into a model.
+
+``BulkImporter`` reads a CSV (or XLSX, when openpyxl is installed) file and
+validates every row with the model fields' own ``clean()`` before anything
+is written, checking the unique key against a set preloaded in one query.
+The rows are inserted with batched ``bulk_create`` in one transaction. The
+result is a per-row error report.
+
+Hashing dominates the cost (PBKDF2 takes about half a second per password),
+so each distinct password is hashed once: rows sharing a password, such as
+the ``default_password`` of an intake, share its hash. The management
+commands hash in a process pool (``workers``); imports uploaded over HTTP
+stay in the request's process and are bounded by ``max_rows`` and
+``max_passwords`` instead.
+"""
+
+import csv
+import datetime
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .models import Student
+
+_import_settings = getattr(settings, "BULK_IMPORT", {})
+BATCH_SIZE = _import_settings.get("BATCH_SIZE", 1000)
+HASH_WORKERS = _import_settings.get("HASH_WORKERS") or os.cpu_count() or 1
+WEB_MAX_ROWS = _import_settings.get("WEB_MAX_ROWS", 5000)
+WEB_MAX_PASSWORDS = _import_settings.get("WEB_MAX_PASSWORDS", 20)
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be read as a table of rows"""
+
+
+def _setup_worker():
+    # Processes started with "spawn" (macOS, Windows) import Django from scratch
+    if not apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, workers=1):
+    """Map each distinct password to a hash, hashing in parallel processes"""
+    distinct = sorted(set(passwords))
+    if len(distinct) <= 1 or workers <= 1:
+        return {password: make_password(password) for password in distinct}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+        hashes = pool.map(make_password, distinct, chunksize=max(1, len(distinct) // (workers * 4)))
+        return dict(zip(distinct, hashes))
+
+
+def read_rows(uploaded, filename):
+    """Yield (row_number, {header: value}) for the data rows of a CSV/XLSX file"""
+    if filename.lower().endswith(".xlsx"):
+        yield from _read_xlsx(uploaded)
+        return
+    try:
+        text = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        if not reader.fieldnames:
+            raise ImportFileError("The file is empty.")
+        for number, row in enumerate(reader, start=2):
+            if any(value and value.strip() for value in row.values() if isinstance(value, str)):
+                yield number, row
+    except UnicodeDecodeError:
+        raise ImportFileError("CSV files must be UTF-8 encoded.")
+    except csv.Error as e:
+        raise ImportFileError(f"Invalid CSV: {e}")
+
+
+def _read_xlsx(uploaded):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("XLSX import requires the openpyxl package; upload a CSV file.")
+    try:
+        sheet = load_workbook(uploaded, read_only=True, data_only=True).active
+    except Exception as e:
+        raise ImportFileError(f"Invalid XLSX file: {e}")
+    rows = sheet.iter_rows(values_only=True)
+    header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+    if not any(header):
+        raise ImportFileError("The file is empty.")
+    for number, values in enumerate(rows, start=2):
+        if any(value not in (None, "") for value in values):
+            yield number, dict(zip(header, values))
+
+
+def _normalize(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, str):
+        value = value.strip()
+    return value
+
+
+class BulkImporter:
+    """
+    Validate and insert rows for ``model``.
+
+    ``columns`` are the accepted headers (model field names); ``unique_field``
+    must not repeat within the file or match an existing row, and
+    ``password_field`` is stored hashed. ``max_rows`` and ``max_passwords``
+    (distinct passwords to hash) reject larger files with ``ImportFileError``.
+    """
+
+    model = None
+    columns = ()
+    unique_field = None
+    password_field = "password"
+
+    def __init__(
+        self,
+        default_password=None,
+        batch_size=BATCH_SIZE,
+        workers=1,
+        max_rows=None,
+        max_passwords=None,
+    ):
+        self.default_password = default_password
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_rows = max_rows
+        self.max_passwords = max_passwords
+        self.fields = {name: self.model._meta.get_field(name) for name in self.columns}
+        # Accept choice labels ("Male") as well as values ("M")
+        self.choice_aliases = {
+            name: {str(label).lower(): value for value, label in field.choices}
+            | {str(value).lower(): value for value, _ in field.choices}
+            for name, field in self.fields.items()
+            if field.choices
+        }
+
+    def existing_keys(self):
+        keys = self.model.objects.order_by().values_list(self.unique_field, flat=True)
+        return {str(key) for key in keys}
+
+    def load_related_ids(self):
+        """Primary keys of the rows foreign key columns may point to, one query each"""
+        self.related_ids = {
+            name: {
+                str(pk)
+                for pk in field.related_model.objects.order_by().values_list("pk", flat=True)
+            }
+            for name, field in self.fields.items()
+            if field.many_to_one
+        }
+
+    def clean_value(self, name, field, raw):
+        if field.many_to_one:
+            # ForeignKey.clean() would query the database once per row
+            value = field.target_field.to_python(raw)
+            if value is not None and str(value) not in self.related_ids[name]:
+                raise ValidationError(
+                    f"{field.related_model._meta.verbose_name} {value} does not exist."
+                )
+            if value is None and not field.null:
+                raise ValidationError("This field cannot be blank.")
+            return value
+        return field.clean(raw, None)
+
+    def clean_row(self, row):
+        """Return (values, errors) for one row, using the model field validation"""
+        values, errors = {}, {}
+        for name, field in self.fields.items():
+            raw = _normalize(row.get(name))
+            if name == self.password_field and raw in (None, "") and self.default_password:
+                raw = self.default_password
+            if raw in (None, ""):
+                if field.has_default():
+                    raw = field.get_default()
+                else:
+                    raw = None if field.null else ""
+            elif name in self.choice_aliases:
+                raw = self.choice_aliases[name].get(str(raw).lower(), raw)
+            try:
+                values[field.attname] = self.clean_value(name, field, raw)
+            except ValidationError as e:
+                errors[name] = e.messages
+        return values, errors
+
+    def validate(self, rows):
+        """Split numbered rows into valid ones and a per-row error report"""
+        seen = self.existing_keys()
+        self.load_related_ids()
+        valid, report = [], []
+        for number, row in rows:
+            if not valid and not report:
+                unknown = set(row) - set(self.columns) - {None, ""}
+                if unknown:
+                    raise ImportFileError(
+                        f"Unknown column(s): {', '.join(sorted(unknown))}. "
+                        f"Expected: {', '.join(self.columns)}"
+                    )
+            values, errors = self.clean_row(row)
+            key = values.get(self.unique_field)
+            if key is not None and str(key) in seen:
+                errors.setdefault(self.unique_field, []).append(
+                    f"{self.unique_field} {key!r} already exists."
+                )
+            elif key is not None and key != "":
+                seen.add(str(key))
+            if errors:
+                report.append({"row": number, self.unique_field: key or None, "errors": errors})
+            else:
+                valid.append((number, values))
+        return valid, report
+
+    def limit_rows(self, rows):
+        for count, row in enumerate(rows, start=1):
+            if count > self.max_rows:
+                raise ImportFileError(
+                    f"The file has more than {self.max_rows} rows; split it or use "
+                    f"the management command."
+                )
+            yield row
+
+    def build(self, values):
+        return self.model(**values)
+
+    def insert(self, valid):
+        hashes = hash_passwords(
+            [values[self.password_field] for _, values in valid], workers=self.workers
+        )
+        objects = []
+        for _, values in valid:
+            values[self.password_field] = hashes[values[self.password_field]]
+            objects.append(self.build(values))
+        with transaction.atomic():
+            self.create(objects)
+        return len(objects)
+
+    def create(self, objects):
+        self.model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def run(self, rows, dry_run=False, partial=False):
+        """
+        Import ``rows``. Unless ``partial``, nothing is inserted when any row
+        has errors.
+        """
+        if self.max_rows is not None:
+            rows = self.limit_rows(rows)
+        valid, report = self.validate(rows)
+        if self.max_passwords is not None:
+            passwords = len({values[self.password_field] for _, values in valid})
+            if passwords > self.max_passwords:
+                raise ImportFileError(
+                    f"The file has {passwords} distinct passwords; at most "
+                    f"{self.max_passwords} can be hashed here. Use a default password "
+                    f"or the management command."
+                )
+        result = {
+            "total_rows": len(valid) + len(report),
+            "valid_rows": len(valid),
+            "created": 0,
+            "errors": report,
+            "dry_run": dry_run,
+        }
+        if dry_run or not valid or (report and not partial):
+            return result
+        try:
+            result["created"] = self.insert(valid)
+        except IntegrityError as e:
+            # A concurrent import or edit inserted one of the keys meanwhile
+            result["errors"].append({"row": None, "errors": {"non_field_errors": [str(e)]}})
+        return result
+
+
+class StudentImporter(BulkImporter):
+    model = Student
+    columns = (
+        "student_id",
+        "password",
+        "name_ko",
+        "name_uz",
+        "birth_date",
+        "gender",
+        "telephone",
+        "address",
+        "email",
+        "high_school",
+        "college",
+        "university",
+        "master",
+        "other_education",
+        "guardian_name_ko",
+        "guardian_name_uz",
+        "guardian_telephone",
+        "guardian_relationship",
+    )
+    unique_field = "student_id"
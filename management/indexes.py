@@ -0,0 +1,42 @@
+"""
+Indexes whose SQL depends on the database backend.
+"""
+
+from django.db import models
+from django.db.models import OrderBy
+from django.db.models.functions import Collate, Upper
+from django.db.models.indexes import IndexExpression
+
+
+class PrefixIndex(models.Index):
+    """
+    Index serving case-insensitive prefix lookups (``istartswith``) on one
+    text field.
+
+    SQLite only applies its LIKE optimization to a ``NOCASE`` index, and
+    PostgreSQL matches ``UPPER(col) LIKE UPPER(...)`` with an ``UPPER`` index
+    in ``text_pattern_ops``. Other backends get a plain index, which their
+    case-insensitive collations can use. Declared in ``Meta.indexes``, the
+    index is part of the migration state and survives table rebuilds.
+    """
+
+    def __init__(self, *, fields, name, **kwargs):
+        if len(fields) != 1:
+            raise ValueError("PrefixIndex takes exactly one field.")
+        super().__init__(fields=fields, name=name, **kwargs)
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        vendor = schema_editor.connection.vendor
+        if vendor == "sqlite":
+            expression = Collate(self.fields[0], "NOCASE")
+        elif vendor == "postgresql":
+            from django.contrib.postgres.indexes import OpClass
+
+            # What django.contrib.postgres does when installed: keep the
+            # operator class outside the parentheses of the expression
+            IndexExpression.register_wrappers(OrderBy, OpClass, Collate)
+            expression = OpClass(Upper(self.fields[0]), name="text_pattern_ops")
+        else:
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = models.Index(expression, name=self.name)
+        return index.create_sql(model, schema_editor, using=using, **kwargs)
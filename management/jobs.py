@@ -0,0 +1,142 @@
+"""
+Lightweight job queue backed by the ``BackgroundJob`` table.
+
+Tasks are plain functions registered with ``@task("name")``; ``enqueue``
+stores a row and ``manage.py run_jobs`` executes pending rows in a thread
+pool. Workers claim a job with a conditional ``UPDATE`` (only one worker can
+move it from its current state), so several worker processes can share the
+table on any database backend.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+_queue_settings = getattr(settings, "JOB_QUEUE", {})
+EAGER = _queue_settings.get("EAGER", False)
+MAX_ATTEMPTS = _queue_settings.get("MAX_ATTEMPTS", 3)
+RETRY_DELAY = _queue_settings.get("RETRY_DELAY", 30)
+STALE_AFTER = _queue_settings.get("STALE_AFTER", 600)
+
+TASKS = {}
+
+
+def task(name):
+    """Register a function as the handler of ``name`` jobs"""
+
+    def decorator(func):
+        TASKS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(task_name, payload=None, instance=None, max_attempts=MAX_ATTEMPTS):
+    """
+    Store a job for ``task_name``. ``instance`` links the job to a model
+    object so its status can be looked up through the jobs API.
+    """
+    if task_name not in TASKS:
+        raise ValueError(f"Unknown task: {task_name}")
+    job = BackgroundJob.objects.create(
+        task=task_name,
+        payload=payload or {},
+        object_type=instance._meta.label_lower if instance is not None else None,
+        object_id=str(instance.pk) if instance is not None else None,
+        max_attempts=max_attempts,
+    )
+    if EAGER:
+        transaction.on_commit(lambda: run_job(claim_job("eager", job_id=job.pk)))
+    return job
+
+
+def claim_job(worker_id, job_id=None):
+    """
+    Lock the next runnable job for ``worker_id`` and return it, or ``None``.
+    Jobs left ``running`` for longer than ``STALE_AFTER`` seconds (e.g. by a
+    killed worker) are picked up again, or failed once they have used up
+    ``max_attempts``.
+    """
+    now = timezone.now()
+    stale = Q(status="running", locked_at__lt=now - timedelta(seconds=STALE_AFTER))
+    # A job that keeps killing its worker (e.g. out of memory) must not be
+    # retried forever
+    BackgroundJob.objects.filter(stale, attempts__gte=F("max_attempts")).update(
+        status="failed",
+        error="The worker stopped while running the job.",
+        locked_by=None,
+        locked_at=None,
+        finished_at=now,
+    )
+    runnable = Q(status="pending", run_after__lte=now) | stale
+    candidates = BackgroundJob.objects.filter(runnable)
+    if job_id is not None:
+        candidates = candidates.filter(pk=job_id)
+    candidates = candidates.order_by("run_after", "id").values_list(
+        "id", "status", "locked_at"
+    )[:20]
+
+    for candidate_id, current_status, locked_at in candidates:
+        claimed = BackgroundJob.objects.filter(
+            pk=candidate_id, status=current_status, locked_at=locked_at
+        ).update(
+            status="running",
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return BackgroundJob.objects.get(pk=candidate_id)
+    return None
+
+
+def run_job(job):
+    """Execute a claimed job and record its outcome"""
+    if job is None:
+        return None
+
+    func = TASKS.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f"No handler registered for task {job.task!r}")
+        result = func(**job.payload)
+    except Exception:
+        job.error = traceback.format_exc()
+        if func is not None and job.attempts < job.max_attempts:
+            job.status = "pending"
+            job.run_after = timezone.now() + timedelta(
+                seconds=RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = "failed"
+            job.finished_at = timezone.now()
+        logger.warning("Job %s (%s) failed", job.pk, job.task, exc_info=True)
+    else:
+        job.status = "done"
+        job.result = result
+        job.error = None
+        job.finished_at = timezone.now()
+
+    job.locked_by = None
+    job.locked_at = None
+    job.save(
+        update_fields=[
+            "status",
+            "result",
+            "error",
+            "run_after",
+            "locked_by",
+            "locked_at",
+            "finished_at",
+        ]
+    )
+    return job
@@ -0,0 +1,222 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from management.benchmarks import (
+    benchmark_client,
+    discover_endpoints,
+    measure,
+    private_caches,
+    seed_dataset,
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "endpoints.json"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every GET endpoint of the management, board and main APIs on "
+        "generated data in a throwaway test database, with private caches. --check "
+        "fails on N+1 queries and on query count regressions against the committed "
+        "baseline; latency is only gated with --check-latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="10,80",
+            help="Comma-separated row counts; query counts must not grow between them",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Timed requests per endpoint")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--baseline",
+            default=str(DEFAULT_BASELINE),
+            help="Query count baseline (paths, statuses and query counts only)",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Rewrite the baseline with the query counts of this run",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the full results, including latency and memory, to this file",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare query counts with the baseline and exit with an error on regressions",
+        )
+        parser.add_argument(
+            "--check-latency",
+            metavar="RESULTS",
+            help="Also fail on p95 regressions against results saved with --output "
+            "on this machine",
+        )
+        parser.add_argument(
+            "--latency-threshold",
+            type=float,
+            default=1.0,
+            help="Allowed p95 increase for --check-latency as a fraction (1.0 = twice as slow)",
+        )
+        parser.add_argument(
+            "--latency-floor-ms",
+            type=float,
+            default=5.0,
+            help="Ignore p95 increases smaller than this many milliseconds",
+        )
+        parser.add_argument("--endpoint", action="append", help="Only run these URL names")
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted({int(scale) for scale in options["scales"].split(",")})
+        except ValueError:
+            raise CommandError("--scales must be a comma-separated list of integers.")
+        if len(scales) < 2:
+            raise CommandError("At least two --scales are needed to detect N+1 queries.")
+
+        endpoints = discover_endpoints()
+        if options["endpoint"]:
+            endpoints = [e for e in endpoints if e.name in options["endpoint"]]
+
+        # The live database and cache are never touched: rows (and sequences)
+        # go to a test database, cache writes and clear() to private caches
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(CACHES=private_caches()):
+                results = {
+                    endpoint.name: {"path": None, "queries": {}} for endpoint in endpoints
+                }
+                for scale in scales:
+                    self.stdout.write(f"Scale {scale}")
+                    self.run_scale(scale, scale == scales[-1], endpoints, results, options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        report = {"scales": scales, "repeat": options["repeat"], "endpoints": results}
+        problems = self.find_n_plus_one(report)
+        if options["check"]:
+            problems += self.compare_queries(report, options["baseline"])
+        if options["check_latency"]:
+            problems += self.compare_latency(report, options)
+
+        if options["output"]:
+            self.write(options["output"], report)
+        if options["update_baseline"]:
+            self.write(options["baseline"], self.query_baseline(report))
+
+        if problems:
+            for problem in problems:
+                self.stderr.write(problem)
+            if options["check"] or options["check_latency"]:
+                raise CommandError(f"{len(problems)} endpoint regression(s)")
+        else:
+            self.stdout.write(self.style.SUCCESS("No regressions found"))
+
+    def run_scale(self, scale, largest, endpoints, results, options):
+        """Seed ``scale`` rows, request every endpoint and roll everything back"""
+        repeat = options["repeat"] if largest else 1
+        try:
+            with transaction.atomic():
+                seed_dataset(scale, seed=options["seed"])
+                client = benchmark_client()
+                for endpoint in endpoints:
+                    path = endpoint.build_path()
+                    measured = measure(client, connection, path, repeat)
+                    result = results[endpoint.name]
+                    result["queries"][str(scale)] = measured.pop("queries")
+                    if largest:
+                        # Latency and memory are reported for the largest scale
+                        result.update(path=path, **measured)
+                    self.stdout.write(
+                        f"  {endpoint.name:<32} {measured['status']} "
+                        f"{result['queries'][str(scale)]:>3} queries  "
+                        f"p95 {measured['p95_ms']:.1f} ms"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def find_n_plus_one(self, report):
+        problems = []
+        scales = [str(scale) for scale in report["scales"]]
+        for name, result in report["endpoints"].items():
+            counts = [result["queries"][scale] for scale in scales]
+            if any(later > earlier for earlier, later in zip(counts, counts[1:])):
+                problems.append(
+                    f"{name}: query count changes with the row count "
+                    f"({', '.join(f'{s} rows: {c}' for s, c in zip(scales, counts))})"
+                )
+            if result["status"] >= 500:
+                problems.append(f"{name}: status {result['status']}")
+        return problems
+
+    def write(self, path, data):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+        self.stdout.write(f"Results written to {path}")
+
+    def query_baseline(self, report):
+        """The machine-independent part of a report, which is committed"""
+        return {
+            "scales": report["scales"],
+            "endpoints": {
+                name: {key: result[key] for key in ("path", "queries", "status")}
+                for name, result in report["endpoints"].items()
+            },
+        }
+
+    def load(self, path, hint):
+        try:
+            return json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            raise CommandError(f"No results at {path}; {hint}")
+
+    def compare_queries(self, report, path):
+        baseline = self.load(path, "run with --update-baseline to create it.")
+        problems = []
+        scale = str(report["scales"][-1])
+        for name, result in report["endpoints"].items():
+            expected = baseline["endpoints"].get(name)
+            if expected is None:
+                continue
+            expected_queries = expected["queries"].get(scale)
+            if expected_queries is not None and result["queries"][scale] > expected_queries:
+                problems.append(
+                    f"{name}: {result['queries'][scale]} queries, baseline {expected_queries}"
+                )
+        return problems
+
+    def compare_latency(self, report, options):
+        previous = self.load(options["check_latency"], "save results with --output first.")
+        problems = []
+        for name, result in report["endpoints"].items():
+            expected = previous["endpoints"].get(name)
+            if expected is None or "p95_ms" not in expected:
+                continue
+            limit = max(
+                expected["p95_ms"] * (1 + options["latency_threshold"]),
+                expected["p95_ms"] + options["latency_floor_ms"],
+            )
+            if result["p95_ms"] > limit:
+                problems.append(
+                    f"{name}: p95 {result['p95_ms']:.1f} ms, baseline {expected['p95_ms']:.1f} ms"
+                )
+        return problems
@@ -0,0 +1,185 @@
+import datetime
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from board.models import News
+from board.serializers import NewsListSerializer, NewsSerializer
+from management.benchmarks import private_caches
+from management.models import Class, ClassTimeTable, Employee, Student, University
+from management.renderers import FastJSONRenderer
+from management.serializers import (
+    ClassListSerializer,
+    ClassSerializer,
+    EmployeeListSerializer,
+    EmployeeSerializer,
+    StudentListSerializer,
+    StudentSerializer,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF serializers with the compiled list serializers on generated "
+        "rows, in a throwaway test database with private caches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        self.rows = options["rows"]
+        self.repeat = options["repeat"]
+        self.request = Request(APIRequestFactory().get("/"))
+
+        # Rows go to a test database and cache writes to private caches
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(CACHES=private_caches()), transaction.atomic():
+                self.create_rows()
+                self.run_benchmarks()
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            runner.teardown_databases(old_config)
+
+    def create_rows(self):
+        n = self.rows
+        today = datetime.date.today()
+        university = University.objects.create(
+            name_ko="벤치마크", name_uz="Benchmark", agreement_date=today
+        )
+        Student.objects.bulk_create(
+            Student(
+                student_id=f"bench-{i}",
+                name_ko="" if i % 2 else f"학생 {i}",
+                name_uz=f"Talaba {i}",
+                birth_date=datetime.date(2000, 1, 1),
+                gender="MF"[i % 2],
+                telephone="010",
+                address="Seoul",
+                email=f"bench{i}@example.com",
+                picture=f"students/{i}.jpg" if i % 3 == 0 else "",
+                guardian_name_ko="보호자",
+                guardian_name_uz="Vasiy",
+                guardian_telephone="010",
+                guardian_relationship="F",
+                password="bench",
+            )
+            for i in range(n)
+        )
+        Employee.objects.bulk_create(
+            Employee(
+                employee_id=f"bench-{i}",
+                name_ko=f"직원 {i}",
+                name_uz=f"Xodim {i}",
+                birth_date=datetime.date(1990, 1, 1),
+                gender="M",
+                start_date=today,
+                telephone="010",
+                address="Seoul",
+                email=f"bench-employee{i}@example.com",
+                position="Teacher",
+                picture=f"employees/{i}.jpg" if i % 3 == 0 else "",
+                password="bench",
+            )
+            for i in range(n)
+        )
+        teacher = Employee.objects.filter(employee_id="bench-0").get()
+        Class.objects.bulk_create(
+            Class(
+                teacher_first=teacher,
+                teacher_second=teacher,
+                level="low",
+                lecture="topik",
+                group=i % 10 + 1,
+                opening_date=today,
+                period=3,
+                tuition_fee=Decimal("500000.00"),
+                classroom=f"R{i}",
+            )
+            for i in range(n)
+        )
+        ClassTimeTable.objects.bulk_create(
+            ClassTimeTable(
+                class_model=class_model,
+                days="monday",
+                start_time=datetime.time(9 + hour),
+                end_time=datetime.time(10 + hour, 30),
+            )
+            for class_model in Class.objects.filter(teacher_first=teacher)
+            for hour in range(2)
+        )
+        News.objects.bulk_create(
+            News(
+                title_ko=f"뉴스 {i}",
+                title_uz=f"Yangilik {i}",
+                content_ko="내용",
+                content_uz="Matn",
+                image=f"news_images/{i}.jpg" if i % 2 else None,
+                university=university,
+            )
+            for i in range(n)
+        )
+        self.querysets = {
+            "students": Student.objects.filter(student_id__startswith="bench-"),
+            "employees": Employee.objects.filter(employee_id__startswith="bench-"),
+            "classes": Class.objects.filter(teacher_first=teacher),
+            "news": News.objects.filter(university=university),
+        }
+
+    def run_benchmarks(self):
+        cases = [
+            ("students", StudentSerializer, StudentListSerializer, None),
+            ("employees", EmployeeSerializer, EmployeeListSerializer, None),
+            ("classes", ClassSerializer, ClassListSerializer, "timetables"),
+            ("news", NewsSerializer, NewsListSerializer, None),
+        ]
+        context = {"request": self.request}
+        for name, serializer_class, compiled, prefetch in cases:
+            queryset = self.querysets[name]
+
+            def drf():
+                objects = queryset.prefetch_related(prefetch) if prefetch else queryset
+                if name == "news":
+                    objects = objects.select_related("university")
+                data = serializer_class(objects, many=True, context=context).data
+                return JSONRenderer().render(data)
+
+            def fast():
+                data = compiled.serialize(compiled.values(queryset), context=context)
+                return FastJSONRenderer().render(data)
+
+            drf_time, drf_output = self.measure(drf)
+            fast_time, fast_output = self.measure(fast)
+            if drf_output != fast_output:
+                raise CommandError(f"{name}: compiled output differs from DRF output")
+
+            self.stdout.write(
+                f"{name:<10} {self.rows} rows  drf {drf_time * 1000:8.1f} ms  "
+                f"compiled {fast_time * 1000:8.1f} ms  "
+                f"x{drf_time / fast_time:.1f}  ({len(fast_output)} bytes, identical)"
+            )
+
+    def measure(self, func):
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            output = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,143 @@
+import io
+import sqlite3
+import time
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+def _copy_value(value):
+    """One field of a CSV row for COPY: NULL is unquoted, everything else quoted"""
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        value = "\\x" + value.hex()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy every table of a SQLite database into the configured (PostgreSQL) "
+        "database in batches, with COPY on PostgreSQL. The target must be migrated "
+        "to the same state; its tables are emptied first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Path of the SQLite database file")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Target database alias")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Do not ask before emptying the target tables",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.target = connections[options["database"]]
+        try:
+            self.source = sqlite3.connect(f"file:{options['source']}?mode=ro", uri=True)
+        except sqlite3.OperationalError as e:
+            raise CommandError(f"Cannot open {options['source']}: {e}")
+
+        self.check_migrations()
+        source_tables = {
+            name
+            for (name,) in self.source.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        models = [
+            model
+            for model in apps.get_models(include_auto_created=True)
+            if model._meta.managed and not model._meta.proxy
+            and model._meta.db_table in source_tables
+        ]
+
+        if options["interactive"]:
+            answer = input(
+                f"This empties {len(models)} table(s) of the "
+                f"'{self.target.settings_dict['NAME']}' database. Type 'yes' to continue: "
+            )
+            if answer != "yes":
+                raise CommandError("Copy cancelled.")
+
+        started = time.perf_counter()
+        # One transaction: foreign keys are checked at commit, so tables can be
+        # copied in any order and a failure leaves the target untouched
+        with transaction.atomic(using=self.target.alias):
+            with self.target.cursor() as cursor:
+                tables = [model._meta.db_table for model in models]
+                for sql in self.target.ops.sql_flush(
+                    no_style(), tables, reset_sequences=False, allow_cascade=True
+                ):
+                    cursor.execute(sql)
+                for model in models:
+                    count = self.copy_table(cursor, model)
+                    self.stdout.write(f"{model._meta.db_table}: {count} row(s)")
+                # Continue the id sequences after the copied ids
+                for sql in self.target.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
+        self.source.close()
+        self.stdout.write(
+            self.style.SUCCESS(f"Copied {len(models)} table(s) in {time.perf_counter() - started:.1f}s")
+        )
+        # The board search index is not a model table; it is rebuilt from the copy
+        if self.target.alias == DEFAULT_DB_ALIAS:
+            call_command("rebuild_search_index", stdout=self.stdout)
+        else:
+            self.stdout.write("Run `manage.py rebuild_search_index` against the target next.")
+
+    def check_migrations(self):
+        """Source and target must have the same columns, i.e. the same migrations"""
+        try:
+            source = set(self.source.execute("SELECT app, name FROM django_migrations"))
+        except sqlite3.DatabaseError as e:
+            raise CommandError(f"The source is not a migrated Django database: {e}")
+        with self.target.cursor() as cursor:
+            cursor.execute("SELECT app, name FROM django_migrations")
+            target = set(cursor.fetchall())
+        if source != target:
+            missing = sorted(f"{app}.{name}" for app, name in source ^ target)
+            raise CommandError(
+                "Run `manage.py migrate` on both databases first; applied migrations "
+                f"differ: {', '.join(missing[:10])}"
+            )
+
+    def copy_table(self, cursor, model):
+        table = model._meta.db_table
+        columns = [field.column for field in model._meta.local_concrete_fields]
+        quoted = ", ".join(self.target.ops.quote_name(column) for column in columns)
+        rows = self.source.execute(
+            f"SELECT {', '.join(f'[{column}]' for column in columns)} FROM [{table}]"
+        )
+        count = 0
+        while True:
+            batch = rows.fetchmany(self.batch_size)
+            if not batch:
+                return count
+            if self.target.vendor == "postgresql":
+                self.copy_batch(cursor, f"{self.target.ops.quote_name(table)} ({quoted})", batch)
+            else:
+                placeholders = ", ".join(["%s"] * len(columns))
+                cursor.executemany(
+                    f"INSERT INTO {self.target.ops.quote_name(table)} ({quoted}) "
+                    f"VALUES ({placeholders})",
+                    batch,
+                )
+            count += len(batch)
+
+    def copy_batch(self, cursor, target, batch):
+        data = "".join(",".join(_copy_value(value) for value in row) + "\n" for row in batch)
+        sql = f"COPY {target} FROM STDIN WITH (FORMAT csv)"
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):
+            # psycopg2
+            raw.copy_expert(sql, io.StringIO(data))
+        else:
+            # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(data)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from management.images import (
+    derivatives_field_name,
+    derivatives_ready,
+    ensure_derivatives,
+    generate_derivatives,
+    mark_derivatives,
+    registered_image_fields,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create resized and WebP derivatives for images uploaded before the "
+        "derivative pipeline existed and record them on their rows (or "
+        "regenerate all of them with --force)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives that already exist, e.g. after changing IMAGE_DERIVATIVES",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        for model, field_names in registered_image_fields.items():
+            created = 0
+            columns = [derivatives_field_name(field_name) for field_name in field_names]
+            for instance in model.objects.only("pk", *field_names, *columns).iterator():
+                for field_name in field_names:
+                    fieldfile = getattr(instance, field_name)
+                    if not fieldfile:
+                        continue
+                    if not force and derivatives_ready(instance, field_name):
+                        continue
+                    if not fieldfile.storage.exists(fieldfile.name):
+                        self.stderr.write(f"Missing file: {fieldfile.name}")
+                        continue
+                    if force:
+                        generate_derivatives(fieldfile.storage, fieldfile.name)
+                        mark_derivatives(model, instance.pk, field_name, fieldfile.name)
+                        created += 1
+                    elif ensure_derivatives(fieldfile):
+                        created += 1
+            self.stdout.write(f"{model._meta.label}: {created} image(s) processed")
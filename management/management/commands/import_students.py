@@ -0,0 +1,67 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.imports import (
+    BATCH_SIZE,
+    HASH_WORKERS,
+    ImportFileError,
+    StudentImporter,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create students from a CSV/XLSX file whose headers are Student field "
+        "names. Nothing is imported if any row is invalid, unless --partial is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--default-password", help="Password for rows without one")
+        parser.add_argument("--dry-run", action="store_true", help="Only validate the file")
+        parser.add_argument("--partial", action="store_true", help="Import the valid rows anyway")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--workers", type=int, default=HASH_WORKERS, help="Password hashing processes"
+        )
+        parser.add_argument("--report", help="Write the per-row error report to this JSON file")
+
+    def get_importer_class(self, options):
+        return StudentImporter
+
+    def handle(self, *args, **options):
+        importer = self.get_importer_class(options)(
+            default_password=options["default_password"],
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+        )
+        started = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as source:
+                result = importer.run(
+                    read_rows(source, options["path"]),
+                    dry_run=options["dry_run"],
+                    partial=options["partial"],
+                )
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for error in result["errors"][:20]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        if len(result["errors"]) > 20:
+            self.stderr.write(f"... and {len(result['errors']) - 20} more row(s) with errors")
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as report:
+                json.dump(result, report, ensure_ascii=False, indent=2, default=str)
+
+        self.stdout.write(
+            f"{result['total_rows']} row(s) read, {result['valid_rows']} valid, "
+            f"{len(result['errors'])} with errors, {result['created']} created "
+            f"in {elapsed:.1f}s"
+        )
+        if result["errors"] and not result["created"] and not options["dry_run"]:
+            raise CommandError("Nothing was imported; fix the rows above or use --partial.")
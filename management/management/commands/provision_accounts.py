@@ -0,0 +1,18 @@
+from management.provisioning import ACCOUNT_IMPORTERS
+
+from .import_students import Command as ImportCommand
+
+
+class Command(ImportCommand):
+    help = (
+        "Bulk-create employees, university managers or organ managers and their "
+        "login users from a CSV/XLSX file, without the per-record save() path. "
+        "Nothing is imported if any row is invalid, unless --partial is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(ACCOUNT_IMPORTERS))
+        super().add_arguments(parser)
+
+    def get_importer_class(self, options):
+        return ACCOUNT_IMPORTERS[options["kind"]]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from management.balances import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the StudentBalance table from classes, registrations and class "
+        "payments, e.g. after bulk imports or updates that bypass the incremental hooks."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_balances()
+        self.stdout.write(f"{count} balance row(s) written")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from management.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the PaymentRollup table from ClassPayment and EnterancePayment, "
+        "e.g. after bulk imports that bypass the incremental hooks."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(f"{count} rollup row(s) written")
@@ -0,0 +1,81 @@
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from management.jobs import claim_job, run_job
+
+_queue_settings = getattr(settings, "JOB_QUEUE", {})
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the BackgroundJob table with a pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=_queue_settings.get("CONCURRENCY", 4),
+            help="Number of jobs processed in parallel",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=_queue_settings.get("POLL_INTERVAL", 1.0),
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as no runnable jobs are left",
+        )
+        parser.add_argument(
+            "--worker-id",
+            default=f"{socket.gethostname()}:{os.getpid()}",
+            help="Name recorded in locked_by",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        self.once = options["once"]
+        self.poll_interval = options["poll_interval"]
+        concurrency = max(1, options["concurrency"])
+        worker_id = options["worker_id"]
+
+        self.stdout.write(f"Worker {worker_id} started with {concurrency} thread(s)")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(self.work, f"{worker_id}/{index}")
+                for index in range(concurrency)
+            ]
+            try:
+                while not all(future.done() for future in futures):
+                    time.sleep(0.5)
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping after the current jobs finish...")
+                self.stop.set()
+
+        processed = sum(future.result() for future in futures)
+        self.stdout.write(f"Worker {worker_id} stopped, {processed} job(s) processed")
+
+    def work(self, thread_id):
+        processed = 0
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                job = run_job(claim_job(thread_id))
+                if job is not None:
+                    processed += 1
+                    self.stdout.write(f"[{thread_id}] {job}")
+                    continue
+                if self.once:
+                    break
+                self.stop.wait(self.poll_interval)
+        finally:
+            connection.close()
+        return processed
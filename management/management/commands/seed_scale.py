@@ -0,0 +1,427 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from board.models import Information, News, Notice, Translation
+from board.search import get_backend, rebuild_index
+from management.models import (
+    Class,
+    ClassPayment,
+    ClassStudentRegistration,
+    ClassTimeTable,
+    Employee,
+    Enterance,
+    EnterancePayment,
+    EnteranceStudentRegistration,
+    Student,
+    University,
+)
+from management.balances import rebuild_balances
+from management.rollups import rebuild_rollups
+
+WEEKDAYS = [day for day, _ in ClassTimeTable.WEEKDAY_CHOICES]
+START_TIMES = [datetime.time(hour) for hour in range(9, 20)]
+FEES = [Decimal(fee) for fee in ("300000.00", "450000.00", "600000.00", "900000.00")]
+FIRST_DATE = datetime.date(2023, 1, 1)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create synthetic universities, staff, students, classes, entrances, "
+        "registrations, payments and board posts for load testing. Output is "
+        "deterministic for a given --seed; rows are tagged with --prefix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--universities", type=int, default=20)
+        parser.add_argument("--employees", type=int, default=200)
+        parser.add_argument("--students", type=int, default=10000)
+        parser.add_argument("--classes", type=int, default=300)
+        parser.add_argument("--entrances", type=int, default=5, help="Entrances per university")
+        parser.add_argument("--class-payments", type=int, default=100000)
+        parser.add_argument("--enterance-payments", type=int, default=20000)
+        parser.add_argument("--posts", type=int, default=100, help="Board posts of each kind")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="scale",
+            help="Prefix of generated IDs and e-mails, must not be in use yet",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of every generated employee and student (hashed once)",
+        )
+        parser.add_argument(
+            "--with-users",
+            action="store_true",
+            help="Also create the Django users employees log in with",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.prefix = prefix = options["prefix"]
+        if options["classes"] and not options["employees"]:
+            raise CommandError("--classes needs at least one employee as teacher.")
+        if Student.objects.filter(student_id__startswith=f"{prefix}-").exists() or (
+            Employee.objects.filter(employee_id__startswith=f"{prefix}-").exists()
+        ):
+            raise CommandError(f'Prefix "{prefix}" is already in use.')
+
+        # Employee.save() hashes each password and creates a User per row;
+        # hashing once and inserting in bulk is what makes large volumes feasible.
+        self.password = make_password(options["password"])
+
+        with transaction.atomic():
+            universities = self.step("universities", self.create_universities, options["universities"])
+            employees = self.step("employees", self.create_employees, options["employees"])
+            if options["with_users"]:
+                self.step("users", self.create_users, employees)
+            students = self.step("students", self.create_students, options["students"])
+            classes = self.step("classes", self.create_classes, options["classes"], employees)
+            self.step("timetables", self.create_timetables, classes)
+            entrances = self.step(
+                "entrances", self.create_entrances, universities, options["entrances"]
+            )
+            class_registrations = self.step(
+                "class registrations", self.create_class_registrations, students, classes
+            )
+            enterance_registrations = self.step(
+                "entrance registrations",
+                self.create_enterance_registrations,
+                students,
+                entrances,
+            )
+            self.step(
+                "class payments",
+                self.create_class_payments,
+                class_registrations,
+                options["class_payments"],
+            )
+            self.step(
+                "entrance payments",
+                self.create_enterance_payments,
+                enterance_registrations,
+                options["enterance_payments"],
+            )
+            self.step("board posts", self.create_posts, universities, options["posts"])
+            # bulk_create bypasses the incremental rollup, balance and search index hooks
+            self.step("payment rollups", rebuild_rollups)
+            self.step("student balances", rebuild_balances)
+            if get_backend() is not None:
+                self.step("board search index", rebuild_index)
+
+    def step(self, label, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        count = result if isinstance(result, int) else len(result)
+        self.stdout.write(f"{label}: {count} in {time.perf_counter() - started:.1f}s")
+        return result
+
+    def insert(self, model, objects):
+        created = 0
+        for batch in batched(objects, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+        return created
+
+    def ids(self, queryset, *fields):
+        """Primary keys (plus ``fields``) of the rows just inserted, in insert order"""
+        rows = queryset.order_by("id").values_list("id", *fields)
+        return list(rows) if fields else [row[0] for row in rows]
+
+    def date_between(self, start, days):
+        return start + datetime.timedelta(days=self.random.randrange(days))
+
+    def create_universities(self, count):
+        rnd = self.random
+        self.insert(
+            University,
+            (
+                University(
+                    name_ko=f"대학교 {i}",
+                    name_uz=f"Universitet {i}",
+                    grade=rnd.choice(University.GRADE_OPTIONS)[0],
+                    years=rnd.choice(University.YEARS_OPTIONS)[0],
+                    email=f"{self.prefix}-university-{i}@example.com",
+                    contract=rnd.choice(University.CONTRACT_OPTIONS)[0],
+                    agreement_date=self.date_between(FIRST_DATE, 1000),
+                )
+                for i in range(count)
+            ),
+        )
+        return self.ids(
+            University.objects.filter(email__startswith=f"{self.prefix}-university-")
+        )
+
+    def create_employees(self, count):
+        rnd = self.random
+        positions = ["Teacher"] * 6 + ["Staff", "Manager", "Director", "Other"]
+        self.insert(
+            Employee,
+            (
+                Employee(
+                    employee_id=f"{self.prefix}-e{i}",
+                    password=self.password,
+                    name_ko=f"직원 {i}",
+                    name_uz=f"Xodim {i}",
+                    birth_date=self.date_between(datetime.date(1960, 1, 1), 12000),
+                    gender=rnd.choice("MF"),
+                    start_date=self.date_between(FIRST_DATE, 1000),
+                    telephone=f"+998{rnd.randrange(10**8, 10**9)}",
+                    address="Tashkent",
+                    email=f"{self.prefix}-e{i}@example.com",
+                    position=rnd.choice(positions),
+                    salary=Decimal(rnd.randrange(300, 3000) * 10000),
+                )
+                for i in range(count)
+            ),
+        )
+        return self.ids(
+            Employee.objects.filter(employee_id__startswith=f"{self.prefix}-e"),
+            "employee_id",
+            "email",
+            "name_ko",
+        )
+
+    def create_users(self, employees):
+        self.insert(
+            User,
+            (
+                User(
+                    username=employee_id,
+                    email=email,
+                    first_name=name,
+                    password=self.password,
+                    is_active=True,
+                    is_staff=True,
+                )
+                for _, employee_id, email, name in employees
+            ),
+        )
+        user_ids = dict(
+            User.objects.filter(username__startswith=f"{self.prefix}-e").values_list(
+                "username", "id"
+            )
+        )
+        group, _ = Group.objects.get_or_create(name="upsight_staff")
+        self.insert(
+            User.groups.through,
+            (User.groups.through(user_id=user_id, group=group) for user_id in user_ids.values()),
+        )
+        for batch in batched(employees, self.batch_size):
+            Employee.objects.bulk_update(
+                [Employee(pk=pk, user_id=user_ids[employee_id]) for pk, employee_id, *_ in batch],
+                ["user"],
+            )
+        return len(user_ids)
+
+    def create_students(self, count):
+        rnd = self.random
+        self.insert(
+            Student,
+            (
+                Student(
+                    student_id=f"{self.prefix}-s{i}",
+                    password=self.password,
+                    name_ko=f"학생 {i}",
+                    name_uz=f"Talaba {i}",
+                    birth_date=self.date_between(datetime.date(1995, 1, 1), 3650),
+                    gender=rnd.choice("MF"),
+                    telephone=f"+998{rnd.randrange(10**8, 10**9)}",
+                    address="Tashkent",
+                    email=f"{self.prefix}-s{i}@example.com",
+                    guardian_name_ko=f"보호자 {i}",
+                    guardian_name_uz=f"Vasiy {i}",
+                    guardian_telephone=f"+998{rnd.randrange(10**8, 10**9)}",
+                    guardian_relationship=rnd.choice("FM"),
+                )
+                for i in range(count)
+            ),
+        )
+        return self.ids(Student.objects.filter(student_id__startswith=f"{self.prefix}-s"))
+
+    def create_classes(self, count, employees):
+        rnd = self.random
+        teachers = [row[0] for row in employees]
+        self.insert(
+            Class,
+            (
+                Class(
+                    teacher_first_id=rnd.choice(teachers),
+                    teacher_second_id=rnd.choice(teachers),
+                    level=rnd.choice(Class.LEVEL_OPTIONS)[0],
+                    lecture=rnd.choice(Class.LECTURE_OPTIONS)[0],
+                    group=rnd.randint(1, 10),
+                    opening_date=self.date_between(FIRST_DATE, 1000),
+                    period=rnd.choice(Class.PERIOD_OPTIONS)[0],
+                    tuition_fee=rnd.choice(FEES),
+                    classroom=f"{self.prefix}-room-{i}",
+                )
+                for i in range(count)
+            ),
+        )
+        return self.ids(
+            Class.objects.filter(classroom__startswith=f"{self.prefix}-room-"),
+            "period",
+            "opening_date",
+            "tuition_fee",
+        )
+
+    def create_timetables(self, classes):
+        rnd = self.random
+
+        def timetables():
+            for class_id, *_ in classes:
+                start = rnd.choice(START_TIMES)
+                end = datetime.time(start.hour + 2)
+                for day in rnd.sample(WEEKDAYS, rnd.randint(1, 3)):
+                    yield ClassTimeTable(
+                        class_model_id=class_id, days=day, start_time=start, end_time=end
+                    )
+
+        return self.insert(ClassTimeTable, timetables())
+
+    def create_entrances(self, universities, per_university):
+        rnd = self.random
+
+        def entrances():
+            for university_id in universities:
+                for i in range(per_university):
+                    from_date = self.date_between(FIRST_DATE, 1000)
+                    yield Enterance(
+                        university_id=university_id,
+                        years=rnd.choice(Enterance.YEAR_OPTIONS)[0],
+                        kind=rnd.choice(Enterance.KIND_OPTIONS)[0],
+                        order=rnd.choice(Enterance.ORDER_OPTIONS)[0],
+                        from_date=from_date,
+                        to_date=from_date + datetime.timedelta(days=90),
+                        contract_no=f"{self.prefix}-{university_id}-{i}",
+                        state=rnd.choice(Enterance.STATE_OPTIONS)[0],
+                    )
+
+        self.insert(Enterance, entrances())
+        return self.ids(
+            Enterance.objects.filter(contract_no__startswith=f"{self.prefix}-"),
+            "from_date",
+        )
+
+    def create_class_registrations(self, students, classes):
+        """Every student attends one class, a third of them a second one"""
+        if not classes:
+            return []
+        rnd = self.random
+        registrations = []
+        for student_id in students:
+            picks = rnd.sample(classes, min(len(classes), 2 if rnd.random() < 0.33 else 1))
+            registrations.extend((student_id, *class_row) for class_row in picks)
+        self.insert(
+            ClassStudentRegistration,
+            (
+                ClassStudentRegistration(
+                    student_id=student_id,
+                    class_model_id=class_id,
+                    state=rnd.choices((1, 2, 3), weights=(8, 1, 1))[0],
+                )
+                for student_id, class_id, *_ in registrations
+            ),
+        )
+        return registrations
+
+    def create_enterance_registrations(self, students, entrances):
+        """Sixty percent of the students applied to one entrance"""
+        if not entrances:
+            return []
+        rnd = self.random
+        registrations = [
+            (student_id, *rnd.choice(entrances))
+            for student_id in students
+            if rnd.random() < 0.6
+        ]
+        self.insert(
+            EnteranceStudentRegistration,
+            (
+                EnteranceStudentRegistration(
+                    enterance_id=enterance_id,
+                    student_id=student_id,
+                    date=self.date_between(from_date, 60),
+                    state=rnd.choice(EnteranceStudentRegistration.STATE_OPTIONS)[0],
+                )
+                for student_id, enterance_id, from_date in registrations
+            ),
+        )
+        return registrations
+
+    def create_class_payments(self, registrations, count):
+        """Monthly tuition payments of registered students"""
+        if not registrations:
+            return 0
+        rnd = self.random
+
+        def payments():
+            for _ in range(count):
+                student_id, class_id, period, opening_date, fee = rnd.choice(registrations)
+                month = rnd.randint(1, period)
+                yield ClassPayment(
+                    student_id=student_id,
+                    class_model_id=class_id,
+                    payment_month=month,
+                    date=opening_date + datetime.timedelta(days=30 * (month - 1) + rnd.randrange(30)),
+                    amount=fee if rnd.random() < 0.8 else (fee / 2).quantize(Decimal("0.01")),
+                )
+
+        return self.insert(ClassPayment, payments())
+
+    def create_enterance_payments(self, registrations, count):
+        if not registrations:
+            return 0
+        rnd = self.random
+
+        def payments():
+            for _ in range(count):
+                student_id, enterance_id, from_date = rnd.choice(registrations)
+                yield EnterancePayment(
+                    student_id=student_id,
+                    enterance_id=enterance_id,
+                    date=self.date_between(from_date, 90),
+                    amount=Decimal(rnd.randrange(10, 200) * 10000),
+                )
+
+        return self.insert(EnterancePayment, payments())
+
+    def create_posts(self, universities, count):
+        if not universities:
+            return 0
+        rnd = self.random
+        created = 0
+        for model in (News, Notice, Translation, Information):
+            name = model._meta.verbose_name
+            created += self.insert(
+                model,
+                (
+                    model(
+                        title_ko=f"{name} {i}",
+                        title_uz=f"{name} {i}",
+                        content_ko=f"{name} {i} 내용",
+                        content_uz=f"{name} {i} matni",
+                        university_id=rnd.choice(universities),
+                    )
+                    for i in range(count)
+                ),
+            )
+        return created
@@ -0,0 +1,179 @@
+"""
+In-process request metrics in the Prometheus text exposition format.
+
+``RequestMetricsMiddleware`` records one observation per request, labelled
+with the resolved URL name; ``metrics_view`` serves them at ``/api/metrics``.
+Metrics live in the memory of each worker process, so with several workers
+each scrape sees the process that answered it (scrape workers individually,
+or aggregate by ``instance`` in Prometheus).
+"""
+
+import bisect
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+_metrics_settings = getattr(settings, "REQUEST_METRICS", {})
+LATENCY_BUCKETS = _metrics_settings.get(
+    "LATENCY_BUCKETS", (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+QUERY_BUCKETS = _metrics_settings.get("QUERY_BUCKETS", (0, 1, 2, 5, 10, 20, 50, 100, 200))
+SIZE_BUCKETS = _metrics_settings.get(
+    "SIZE_BUCKETS", (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One slot per bucket plus +Inf, then the running sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0]
+            series[index] += 1
+            series[-1] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series):
+                cumulative += count
+                le = (("le", _format_number(float(bound))),)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+ENDPOINT_LABELS = ("endpoint", "method")
+
+requests_total = Counter(
+    "upsight_http_requests_total",
+    "Requests by endpoint, method and status code.",
+    ("endpoint", "method", "status"),
+)
+request_duration = Histogram(
+    "upsight_http_request_duration_seconds",
+    "Request latency in seconds.",
+    ENDPOINT_LABELS,
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "upsight_http_request_sql_queries",
+    "SQL queries issued per request.",
+    ENDPOINT_LABELS,
+    QUERY_BUCKETS,
+)
+request_sql_duration = Counter(
+    "upsight_http_request_sql_seconds_total",
+    "Total time spent in SQL queries, in seconds.",
+    ENDPOINT_LABELS,
+)
+response_size = Histogram(
+    "upsight_http_response_size_bytes",
+    "Response body size in bytes (streaming responses are not counted).",
+    ENDPOINT_LABELS,
+    SIZE_BUCKETS,
+)
+
+REGISTRY = [requests_total, request_duration, request_queries, request_sql_duration, response_size]
+
+
+def record_request(endpoint, method, status, duration, queries, sql_duration, size):
+    labels = (endpoint, method)
+    requests_total.inc((endpoint, method, str(status)))
+    request_duration.observe(labels, duration)
+    request_queries.observe(labels, queries)
+    request_sql_duration.inc(labels, sql_duration)
+    if size is not None:
+        response_size.observe(labels, size)
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+def _client_allowed(request):
+    """
+    Scrapers must send ``Authorization: Bearer <TOKEN>``; without a TOKEN
+    configured the endpoint is closed. A non-empty ALLOWED_IPS additionally
+    restricts the client address.
+    """
+    token = _metrics_settings.get("TOKEN")
+    if not token or not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return False
+    allowed_ips = _metrics_settings.get("ALLOWED_IPS", ())
+    return not allowed_ips or request.META.get("REMOTE_ADDR") in allowed_ips
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint"""
+    if not _client_allowed(request):
+        return HttpResponseForbidden("Metrics require a valid bearer token.")
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
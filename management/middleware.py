@@ -0,0 +1,125 @@
+import heapq
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+
+from .metrics import record_request
+from .permissions import resolve_upsight_role
+
+logger = logging.getLogger("upsight.requests")
+
+
+class UpsightRoleMiddleware:
+    """
+    Attach a lazily resolved ``upsight_role`` to every request.
+
+    The role is evaluated on first access, after DRF has authenticated the
+    request and replaced ``request.user``, so JWT users are resolved correctly
+    and requests that never check a role cost no queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.upsight_role = SimpleLazyObject(
+            lambda: resolve_upsight_role(request.user)
+        )
+        return self.get_response(request)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that counts and times queries, keeping the slowest ones"""
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.keep:
+                entry = (elapsed, self.count, sql)
+                if len(self.slowest) < self.keep:
+                    heapq.heappush(self.slowest, entry)
+                else:
+                    heapq.heappushpop(self.slowest, entry)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, SQL query count/time and response size per resolved URL
+    name (exposed at ``/api/metrics``), and log requests that exceed the
+    ``REQUEST_METRICS`` thresholds together with their slowest queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, "REQUEST_METRICS", {})
+        self.enabled = config.get("ENABLED", True)
+        self.slow_request_ms = config.get("SLOW_REQUEST_MS", 1000)
+        self.max_queries = config.get("MAX_QUERIES", 50)
+        self.slowest_queries = config.get("SLOWEST_QUERIES", 5)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = QueryRecorder(self.slowest_queries)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        endpoint = self.endpoint_name(request)
+        size = None if response.streaming else len(response.content)
+        record_request(
+            endpoint,
+            request.method,
+            response.status_code,
+            duration,
+            recorder.count,
+            recorder.duration,
+            size,
+        )
+
+        if duration * 1000 > self.slow_request_ms or recorder.count > self.max_queries:
+            self.log_slow_request(request, endpoint, response, duration, recorder)
+        return response
+
+    @staticmethod
+    def endpoint_name(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unresolved"
+        return match.view_name or match.route or "unresolved"
+
+    def log_slow_request(self, request, endpoint, response, duration, recorder):
+        slowest = "".join(
+            f"\n  {elapsed * 1000:.1f} ms (query #{index}): {sql}"
+            for elapsed, index, sql in sorted(recorder.slowest, reverse=True)
+        )
+        logger.warning(
+            "Slow request %s %s [%s] -> %s: %.1f ms, %d queries, %.1f ms in SQL%s",
+            request.method,
+            request.get_full_path(),
+            endpoint,
+            response.status_code,
+            duration * 1000,
+            recorder.count,
+            recorder.duration * 1000,
+            slowest,
+        )
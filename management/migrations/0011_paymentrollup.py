@@ -0,0 +1,40 @@
+# Generated by Django 5.0.2 on 2026-10-16 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0010_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(verbose_name='Month')),
+                ('payment_type', models.CharField(choices=[('entrance', 'Entrance'), ('class', 'Class')], max_length=20)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payment_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_model', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payment_rollups', to='management.class')),
+                ('university', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payment_rollups', to='management.university')),
+            ],
+            options={
+                'verbose_name': 'Payment Rollup',
+                'verbose_name_plural': 'Payment Rollups',
+                'ordering': ['-period', 'payment_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='paymentrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('payment_type', 'entrance')), fields=('period', 'university'), name='unique_entrance_payment_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='paymentrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('payment_type', 'class')), fields=('period', 'class_model'), name='unique_class_payment_rollup'),
+        ),
+    ]
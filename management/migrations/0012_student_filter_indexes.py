@@ -0,0 +1,80 @@
+# Generated by Django 5.0.2 on 2026-10-16 18:53
+
+from django.db import migrations, models
+
+# ?search= prefix lookups (istartswith) can only use an index built for them:
+# a NOCASE index for SQLite's LIKE optimization, an UPPER(...) pattern index
+# on PostgreSQL. Neither can be declared portably in Meta.indexes. Migration
+# 0016 replaces them with management.indexes.PrefixIndex.
+PREFIX_COLUMNS = ("name_ko", "name_uz", "student_id", "telephone")
+
+
+def create_prefix_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for column in PREFIX_COLUMNS:
+        if vendor == "sqlite":
+            expression = f"{column} COLLATE NOCASE"
+        elif vendor == "postgresql":
+            expression = f"UPPER({column}::text) text_pattern_ops"
+        else:
+            return
+        schema_editor.execute(
+            f"CREATE INDEX student_{column}_prefix_idx ON management_student ({expression})"
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        for column in PREFIX_COLUMNS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS student_{column}_prefix_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0011_paymentrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classstudentregistration',
+            index=models.Index(fields=['class_model', 'state', 'student'], name='management__class_m_8ee990_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enterancestudentregistration',
+            index=models.Index(fields=['state', 'student'], name='management__state_34d380_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enterancestudentregistration',
+            index=models.Index(fields=['enterance', 'state', 'student'], name='management__enteran_9b8cc0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['-created_at', '-id'], name='management__created_a60925_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['gender', '-created_at', '-id'], name='management__gender_77bbf1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('high_school__gt', '')), fields=['-created_at', '-id'], name='student_high_school_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('college__gt', '')), fields=['-created_at', '-id'], name='student_college_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('university__gt', '')), fields=['-created_at', '-id'], name='student_university_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('master__gt', '')), fields=['-created_at', '-id'], name='student_master_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('other_education__gt', '')), fields=['-created_at', '-id'], name='student_other_education_idx'),
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
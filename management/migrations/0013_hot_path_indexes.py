@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2026-10-16 18:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0012_student_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classpayment',
+            index=models.Index(fields=['-date', '-id'], name='management__date_506f88_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classpayment',
+            index=models.Index(fields=['class_model', 'payment_month'], name='management__class_m_bd7655_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['-created_at', '-id'], name='management__created_c996e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enterancepayment',
+            index=models.Index(fields=['-date', '-id'], name='management__date_07cba1_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.2 on 2026-10-16 19:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0013_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('registration_state', models.IntegerField(choices=[(1, 'Do'), (2, 'Undo'), (3, 'End')])),
+                ('due_months', models.IntegerField(default=0)),
+                ('expected_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('outstanding_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('unpaid_months', models.IntegerField(default=0)),
+                ('first_unpaid_month', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='management.class')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='management.student')),
+            ],
+            options={
+                'verbose_name': 'Student Balance',
+                'verbose_name_plural': 'Student Balances',
+                'indexes': [models.Index(condition=models.Q(('outstanding_amount__gt', 0)), fields=['-outstanding_amount', '-id'], name='student_balance_arrears_idx'), models.Index(condition=models.Q(('outstanding_amount__gt', 0)), fields=['class_model', '-outstanding_amount', '-id'], name='student_balance_class_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studentbalance',
+            constraint=models.UniqueConstraint(fields=('student', 'class_model'), name='unique_student_balance'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-16 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0014_student_balance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='picture_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='picture_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='university',
+            name='logo_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.2 on 2026-10-16 19:37
+
+import management.indexes
+from django.db import migrations
+
+# Migration 0012 created these indexes with raw SQL, outside the migration
+# state; replace them with the PrefixIndex declarations of Student.Meta
+PREFIX_COLUMNS = ("name_ko", "name_uz", "student_id", "telephone")
+
+
+def drop_raw_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        for column in PREFIX_COLUMNS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS student_{column}_prefix_idx")
+
+
+def create_raw_prefix_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for column in PREFIX_COLUMNS:
+        if vendor == "sqlite":
+            expression = f"{column} COLLATE NOCASE"
+        elif vendor == "postgresql":
+            expression = f"UPPER({column}::text) text_pattern_ops"
+        else:
+            return
+        schema_editor.execute(
+            f"CREATE INDEX student_{column}_prefix_idx ON management_student ({expression})"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0015_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_raw_prefix_indexes, create_raw_prefix_indexes),
+        migrations.AddIndex(
+            model_name='student',
+            index=management.indexes.PrefixIndex(fields=['name_ko'], name='student_name_ko_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=management.indexes.PrefixIndex(fields=['name_uz'], name='student_name_uz_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=management.indexes.PrefixIndex(fields=['student_id'], name='student_student_id_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=management.indexes.PrefixIndex(fields=['telephone'], name='student_telephone_prefix_idx'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import User, Group
 from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
+from .indexes import PrefixIndex
 from .validators import validate_image_size, validate_pdf_file, validate_file_size
 
 
@@ -40,6 +43,10 @@ class University(models.Model):
         blank=True,
         null=True,
     )
+    # File name of logo whose derivatives exist (see management/images.py)
+    logo_derivatives = models.CharField(
+        max_length=100, blank=True, null=True, editable=False
+    )
 
     def __str__(self):
         return f"{self.name_ko} / {self.name_uz}"
@@ -64,6 +71,10 @@ class Student(models.Model):
         blank=True,
         null=True,
     )
+    # File name of picture whose derivatives exist (see management/images.py)
+    picture_derivatives = models.CharField(
+        max_length=100, blank=True, null=True, editable=False
+    )
 
     # Education Background
     high_school = models.CharField(max_length=200, blank=True, null=True)
@@ -101,6 +112,42 @@ class Student(models.Model):
         verbose_name = "Student"
         verbose_name_plural = "Students"
         ordering = ["-created_at"]
+        indexes = [
+            # students_list filters, in its keyset order
+            models.Index(fields=["-created_at", "-id"]),
+            models.Index(fields=["gender", "-created_at", "-id"]),
+            # ?education=: partial, so each only holds the students with that level
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(high_school__gt=""),
+                name="student_high_school_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(college__gt=""),
+                name="student_college_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(university__gt=""),
+                name="student_university_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(master__gt=""),
+                name="student_master_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(other_education__gt=""),
+                name="student_other_education_idx",
+            ),
+            # ?search= prefix lookups (istartswith)
+            PrefixIndex(fields=["name_ko"], name="student_name_ko_prefix_idx"),
+            PrefixIndex(fields=["name_uz"], name="student_name_uz_prefix_idx"),
+            PrefixIndex(fields=["student_id"], name="student_student_id_prefix_idx"),
+            PrefixIndex(fields=["telephone"], name="student_telephone_prefix_idx"),
+        ]
 
 
 class AttachedDocument(models.Model):
@@ -178,6 +225,10 @@ class Employee(models.Model):
         blank=True,
         null=True,
     )
+    # File name of picture whose derivatives exist (see management/images.py)
+    picture_derivatives = models.CharField(
+        max_length=100, blank=True, null=True, editable=False
+    )
 
     # Authentication
     employee_id = models.CharField(max_length=50, unique=True, verbose_name="ID")
@@ -231,6 +282,7 @@ class Employee(models.Model):
         verbose_name = "Employee"
         verbose_name_plural = "Employees"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"])]
 
 
 class EmployeeDocument(models.Model):
@@ -335,6 +387,10 @@ class EnteranceStudentRegistration(models.Model):
         verbose_name = "Entrance Student Registration"
         verbose_name_plural = "Entrance Student Registrations"
         unique_together = ("enterance", "student")
+        indexes = [
+            models.Index(fields=["state", "student"]),
+            models.Index(fields=["enterance", "state", "student"]),
+        ]
 
 
 class EnterancePayment(models.Model):
@@ -349,6 +405,10 @@ class EnterancePayment(models.Model):
         Enterance, related_name="consulting_payments", on_delete=models.CASCADE
     )
 
+    class Meta:
+        # Keyset order of the payment lists
+        indexes = [models.Index(fields=["-date", "-id"])]
+
 
 class EnteranceDocument(models.Model):
     enterance = models.ForeignKey(
@@ -498,6 +558,17 @@ class ClassTimeTable(models.Model):
         }
         return [day_mapping.get(day, day) for day in self.days]
 
+    def clean(self):
+        """Refuse slots that double-book the class's classroom or teachers"""
+        from .conflicts import slot_conflicts
+
+        if self.class_model_id and self.days and self.start_time and self.end_time:
+            conflicts = slot_conflicts(
+                self.class_model, self.days, self.start_time, self.end_time, exclude_id=self.pk
+            )
+            if conflicts:
+                raise ValidationError(conflicts)
+
     def __str__(self):
         days_display = ", ".join(self.get_days_display())
         return f"{days_display} {self.start_time}-{self.end_time}"
@@ -520,6 +591,7 @@ class ClassStudentRegistration(models.Model):
 
     class Meta:
         unique_together = ("student", "class_model")
+        indexes = [models.Index(fields=["class_model", "state", "student"])]
 
 
 class StudentRegistration(models.Model):
@@ -550,6 +622,14 @@ class ClassPayment(models.Model):
     )
     payment_month = models.IntegerField(verbose_name="To'lov oyi", default=1)
 
+    class Meta:
+        indexes = [
+            # Keyset order of the payment lists
+            models.Index(fields=["-date", "-id"]),
+            # Class detail payments filtered by ?month=
+            models.Index(fields=["class_model", "payment_month"]),
+        ]
+
 
 class Organ(models.Model):
     TYPE_OPTIONS = (
@@ -716,3 +796,132 @@ class CareerCounsel(models.Model):
     career = models.ForeignKey(
         Career, related_name="counsels", on_delete=models.CASCADE
     )
+
+
+class BackgroundJob(models.Model):
+    STATUS_OPTIONS = (
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+    task = models.CharField(max_length=100, verbose_name="Task")
+    payload = models.JSONField(default=dict, blank=True)
+    object_type = models.CharField(max_length=100, blank=True, null=True)
+    object_id = models.CharField(max_length=64, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_OPTIONS, default="pending")
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+    class Meta:
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["object_type", "object_id"]),
+        ]
+
+
+class PaymentRollup(models.Model):
+    """
+    Monthly payment totals per university (entrance payments) or class (class
+    payments), kept up to date by ``management.rollups``.
+    """
+
+    PAYMENT_TYPE_OPTIONS = (
+        ("entrance", "Entrance"),
+        ("class", "Class"),
+    )
+    period = models.DateField(verbose_name="Month")
+    payment_type = models.CharField(max_length=20, choices=PAYMENT_TYPE_OPTIONS)
+    university = models.ForeignKey(
+        University,
+        related_name="payment_rollups",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+    )
+    class_model = models.ForeignKey(
+        Class,
+        related_name="payment_rollups",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+    )
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payment_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.period:%Y-%m} {self.payment_type}: {self.total_amount}"
+
+    class Meta:
+        verbose_name = "Payment Rollup"
+        verbose_name_plural = "Payment Rollups"
+        ordering = ["-period", "payment_type"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "university"],
+                condition=models.Q(payment_type="entrance"),
+                name="unique_entrance_payment_rollup",
+            ),
+            models.UniqueConstraint(
+                fields=["period", "class_model"],
+                condition=models.Q(payment_type="class"),
+                name="unique_class_payment_rollup",
+            ),
+        ]
+
+
+class StudentBalance(models.Model):
+    """
+    What a student owes a class, derived from the payment matrix and kept up
+    to date by ``management.balances``.
+    """
+
+    student = models.ForeignKey(Student, related_name="balances", on_delete=models.CASCADE)
+    class_model = models.ForeignKey(Class, related_name="balances", on_delete=models.CASCADE)
+    registration_state = models.IntegerField(choices=ClassStudentRegistration.STATE_OPTIONS)
+    due_months = models.IntegerField(default=0)
+    expected_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    outstanding_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unpaid_months = models.IntegerField(default=0)
+    first_unpaid_month = models.IntegerField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.student} / {self.class_model}: {self.outstanding_amount}"
+
+    class Meta:
+        verbose_name = "Student Balance"
+        verbose_name_plural = "Student Balances"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "class_model"], name="unique_student_balance"
+            ),
+        ]
+        indexes = [
+            # Arrears list, largest debts first, and its ?class= filter
+            models.Index(
+                fields=["-outstanding_amount", "-id"],
+                condition=models.Q(outstanding_amount__gt=0),
+                name="student_balance_arrears_idx",
+            ),
+            models.Index(
+                fields=["class_model", "-outstanding_amount", "-id"],
+                condition=models.Q(outstanding_amount__gt=0),
+                name="student_balance_class_idx",
+            ),
+        ]
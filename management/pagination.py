@@ -0,0 +1,143 @@
+import base64
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Q
+
+
+class PaginationError(ValueError):
+    """Raised when the cursor or page size query parameters are invalid"""
+
+
+class KeysetPaginator:
+    """
+    Keyset (cursor) paginator for list endpoints.
+
+    Pages are selected with a ``WHERE (key) < (last key)`` condition over the
+    given ordering, e.g. ``("-created_at", "-id")``, instead of an OFFSET, so
+    every page costs the same regardless of how deep the client has scrolled.
+    The last ordering field must be unique to make the key total.
+
+    Query parameters:
+    - ``cursor``: opaque token returned as ``next_cursor`` by the previous page
+    - ``page_size``: number of rows per page, capped at ``MAX_PAGE_SIZE``
+    - ``with_count``: when true, the total row count is returned as ``total_count``
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "with_count"
+
+    def __init__(self, request, ordering):
+        config = getattr(settings, "KEYSET_PAGINATION", {})
+        self.default_page_size = config.get("PAGE_SIZE", 100)
+        self.max_page_size = config.get("MAX_PAGE_SIZE", 1000)
+
+        self.request = request
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip("-") for name in self.ordering]
+        self.page_size = self._get_page_size()
+        self.cursor = self._decode_cursor(request.GET.get(self.cursor_query_param))
+        self.with_count = request.GET.get(self.count_query_param, "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        self.next_cursor = None
+        self.total_count = None
+
+    def _get_page_size(self):
+        value = self.request.GET.get(self.page_size_query_param)
+        if not value:
+            return self.default_page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise PaginationError("Page size must be a valid integer")
+        if page_size < 1:
+            raise PaginationError("Page size must be a positive integer")
+        return min(page_size, self.max_page_size)
+
+    def _decode_cursor(self, token):
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (ValueError, UnicodeDecodeError):
+            raise PaginationError("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise PaginationError("Invalid cursor")
+        return values
+
+    def _encode_cursor(self, row):
+        values = []
+        for name in self.fields:
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            values.append(value)
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _output_field(self, queryset, name):
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    def filter_queryset(self, queryset):
+        """Restrict ``queryset`` to the rows that come after the current cursor"""
+        if self.cursor is None:
+            return queryset
+
+        try:
+            values = [
+                self._output_field(queryset, name).to_python(value)
+                for name, value in zip(self.fields, self.cursor)
+            ]
+        except Exception:
+            raise PaginationError("Invalid cursor")
+
+        # (a, b, c) > (x, y, z)  <=>  a > x OR (a = x AND b > y) OR ...
+        condition = Q()
+        for index, order in enumerate(self.ordering):
+            lookup = "lt" if order.startswith("-") else "gt"
+            branch = Q(**{f"{self.fields[index]}__{lookup}": values[index]})
+            for name, value in zip(self.fields[:index], values[:index]):
+                branch &= Q(**{name: value})
+            condition |= branch
+        return queryset.filter(condition)
+
+    def paginate_queryset(self, queryset, filtered=False):
+        """
+        Return one page of ``queryset`` as a list.
+
+        Pass ``filtered=True`` when the cursor condition was already applied
+        through ``filter_queryset`` (e.g. to each half of a ``union()``); the
+        caller is then responsible for setting ``total_count``.
+        """
+        if not filtered:
+            if self.with_count:
+                self.total_count = queryset.count()
+            queryset = self.filter_queryset(queryset)
+
+        rows = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        if len(rows) > self.page_size:
+            rows = rows[: self.page_size]
+            self.next_cursor = self._encode_cursor(rows[-1])
+        return rows
+
+    def get_page_info(self):
+        """Pagination metadata to merge into the list response"""
+        info = {
+            "next_cursor": self.next_cursor,
+            "has_more": self.next_cursor is not None,
+            "page_size": self.page_size,
+        }
+        if self.with_count:
+            info["total_count"] = self.total_count
+        return info
@@ -0,0 +1,137 @@
+"""
+Students x months payment grid of a class.
+
+One grouped query joins every registration of the requested classes to the
+payments the student made for that same class and sums them per
+``payment_month``; the grid is then filled in Python. ``Class.tuition_fee``
+is the fee of one month. A month is outstanding for a student whose
+registration is active (state 1) when it is due, i.e. not after
+``Class.current_month``, and less than the fee has been paid for it.
+
+Payments of students with no registration in the class are not part of the
+grid; payments recorded for months outside ``1..period`` count in the
+student's ``total_paid`` but have no column.
+"""
+
+from decimal import Decimal
+
+from django.db.models import F, FilteredRelation, Q, Sum
+from django.utils import timezone
+
+from .models import Class, ClassStudentRegistration
+
+CLASS_COLUMNS = ("id", "period", "current_month", "tuition_fee")
+CENT = Decimal("0.01")
+
+
+def active_classes(today=None):
+    """Classes that have opened and not yet run past their last month"""
+    today = today or timezone.localdate()
+    return Class.objects.filter(opening_date__lte=today, current_month__lte=F("period"))
+
+
+def _paid_rows(class_ids, student_ids=None):
+    """(registration, month, paid) rows of the classes, from one grouped query"""
+    registrations = ClassStudentRegistration.objects.filter(class_model_id__in=class_ids)
+    if student_ids is not None:
+        registrations = registrations.filter(student_id__in=student_ids)
+    return (
+        registrations.annotate(
+            class_payment=FilteredRelation(
+                "student__class_payments",
+                condition=Q(student__class_payments__class_model=F("class_model")),
+            )
+        )
+        .values(
+            "class_model_id",
+            "student_id",
+            "state",
+            "student__student_id",
+            "student__name_ko",
+            "student__name_uz",
+            month=F("class_payment__payment_month"),
+        )
+        .annotate(paid=Sum("class_payment__amount"))
+        .order_by("class_model_id", "student__name_uz", "student_id", "month")
+    )
+
+
+def _empty_matrix(class_row):
+    period = max(class_row["period"], 0)
+    return {
+        "class_id": class_row["id"],
+        "tuition_fee": class_row["tuition_fee"],
+        "period": period,
+        "current_month": class_row["current_month"],
+        "months": list(range(1, period + 1)),
+        "students": [],
+        "month_totals": [Decimal("0.00")] * period,
+        "total_paid": Decimal("0.00"),
+        "total_outstanding": Decimal("0.00"),
+        "outstanding_students": 0,
+    }
+
+
+def _student_row(matrix, row):
+    period = matrix["period"]
+    return {
+        "id": row["student_id"],
+        "student_id": row["student__student_id"],
+        "name_ko": row["student__name_ko"],
+        "name_uz": row["student__name_uz"],
+        "registration_state": row["state"],
+        "paid": [Decimal("0.00")] * period,
+        "outstanding": [False] * period,
+        "total_paid": Decimal("0.00"),
+        "outstanding_amount": Decimal("0.00"),
+    }
+
+
+def _settle(matrix, student):
+    """Flag the due months ``student`` has not fully paid and add up the arrears"""
+    if student["registration_state"] != 1:
+        return
+    fee = matrix["tuition_fee"]
+    due = min(matrix["current_month"], matrix["period"])
+    for index in range(due):
+        if student["paid"][index] < fee:
+            student["outstanding"][index] = True
+            student["outstanding_amount"] += fee - student["paid"][index]
+    if student["outstanding_amount"]:
+        matrix["total_outstanding"] += student["outstanding_amount"]
+        matrix["outstanding_students"] += 1
+
+
+def build_payment_matrices(class_rows, student_ids=None):
+    """
+    Payment grid of each class in ``class_rows`` (dicts with CLASS_COLUMNS),
+    keyed by class id; only of ``student_ids`` if given.
+    """
+    matrices = {row["id"]: _empty_matrix(row) for row in class_rows}
+    student = None
+    for row in _paid_rows(list(matrices), student_ids):
+        matrix = matrices[row["class_model_id"]]
+        if student is None or (student["id"], student["_class"]) != (
+            row["student_id"], row["class_model_id"]
+        ):
+            if student is not None:
+                _settle(matrices[student.pop("_class")], student)
+            student = _student_row(matrix, row)
+            student["_class"] = row["class_model_id"]
+            matrix["students"].append(student)
+        if row["paid"] is None:
+            # The LEFT JOIN found no payment of this student
+            continue
+        paid = row["paid"].quantize(CENT)
+        student["total_paid"] += paid
+        matrix["total_paid"] += paid
+        if 1 <= row["month"] <= matrix["period"]:
+            student["paid"][row["month"] - 1] = paid
+            matrix["month_totals"][row["month"] - 1] += paid
+    if student is not None:
+        _settle(matrices[student.pop("_class")], student)
+    return matrices
+
+
+def build_payment_matrix(class_row):
+    return build_payment_matrices([class_row])[class_row["id"]]
@@ -0,0 +1,84 @@
+from django.contrib.auth.models import User
+from rest_framework.permissions import BasePermission
+
+from .authentication import UpsightTokenUser
+
+
+class UpsightRole:
+    """
+    Groups and university scope of the requesting user, resolved once per request.
+
+    Views read it as ``request.upsight_role`` (set lazily by
+    ``UpsightRoleMiddleware``) instead of querying ``user.groups`` and
+    ``UniversityManager`` for every check.
+    """
+
+    def __init__(self, groups=(), university_id=None):
+        self.groups = frozenset(groups)
+        self.is_upsight_staff = "upsight_staff" in self.groups
+        self.is_university_staff = "university_staff" in self.groups
+        self.is_board_staff = self.is_upsight_staff or self.is_university_staff
+        # Only university_staff users are scoped to a university
+        self.university_id = university_id if self.is_university_staff else None
+
+    def __repr__(self):
+        return f"<UpsightRole groups={sorted(self.groups)} university_id={self.university_id}>"
+
+
+def resolve_upsight_role(user):
+    """
+    Build the user's role from JWT claims when available, otherwise load the
+    group names and managed university in a single query.
+    """
+    if not user or not user.is_authenticated:
+        return UpsightRole()
+
+    if isinstance(user, UpsightTokenUser):
+        return UpsightRole(user.group_names, user.university_id)
+
+    rows = User.objects.filter(pk=user.pk).values_list(
+        "groups__name", "manager_profile__university_id"
+    )
+    groups = set()
+    university_id = None
+    for group_name, manager_university_id in rows:
+        if group_name:
+            groups.add(group_name)
+        university_id = manager_university_id
+    return UpsightRole(groups, university_id)
+
+
+def get_upsight_role(request):
+    """Return the cached role for ``request``, resolving it on first use"""
+    role = getattr(request, "upsight_role", None)
+    if role is None:
+        role = resolve_upsight_role(request.user)
+        request.upsight_role = role
+    return role
+
+
+class IsUpsightStaff(BasePermission):
+    """Allows access only to members of the upsight_staff group"""
+
+    message = "Permission denied. Only staff can access this resource."
+
+    def has_permission(self, request, view):
+        return get_upsight_role(request).is_upsight_staff
+
+
+class IsUniversityStaff(BasePermission):
+    """Allows access only to members of the university_staff group"""
+
+    message = "Permission denied. Only university staff can access this resource."
+
+    def has_permission(self, request, view):
+        return get_upsight_role(request).is_university_staff
+
+
+class IsBoardStaff(BasePermission):
+    """Allows access to upsight_staff and university_staff members"""
+
+    message = "Permission denied. Only staff can access this resource."
+
+    def has_permission(self, request, view):
+        return get_upsight_role(request).is_board_staff
@@ -0,0 +1,113 @@
+"""
+Bulk provisioning of staff accounts.
+
+``Employee``, ``UniversityManager`` and ``OrganManager`` create their login
+``User`` in ``save()``: a password hash, ``User.objects.create``,
+``Group.objects.get_or_create``, ``user.groups.add`` and a second save for
+every record. The importers here create the users, their group memberships
+(through the M2M table) and the domain rows with ``bulk_create`` instead,
+producing the same rows as ``save()`` would.
+"""
+
+from django.contrib.auth.models import Group, User
+
+from .imports import BulkImporter
+from .models import Employee, OrganManager, UniversityManager
+
+
+class AccountImporter(BulkImporter):
+    """``BulkImporter`` that also creates a ``User`` in ``group_name`` per row"""
+
+    group_name = None
+    email_field = None
+
+    def username(self, obj):
+        return str(getattr(obj, self.unique_field))
+
+    def existing_keys(self):
+        # The login name must be free in auth_user as well
+        return super().existing_keys() | set(
+            User.objects.order_by().values_list("username", flat=True)
+        )
+
+    def create(self, objects):
+        users = [
+            User(
+                username=self.username(obj),
+                email=getattr(obj, self.email_field) if self.email_field else "",
+                first_name=obj.name_ko or obj.name_uz,
+                password=obj.password,
+                is_active=True,
+                is_staff=True,
+            )
+            for obj in objects
+        ]
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+
+        usernames = [user.username for user in users]
+        user_ids = {}
+        for start in range(0, len(usernames), self.batch_size):
+            user_ids.update(
+                User.objects.filter(
+                    username__in=usernames[start : start + self.batch_size]
+                ).values_list("username", "id")
+            )
+
+        membership = User.groups.through
+        # Looked up per import: an id cached across requests would outlive
+        # a rolled back get_or_create
+        group = Group.objects.get_or_create(name=self.group_name)[0].pk
+        membership.objects.bulk_create(
+            [membership(user_id=user_ids[name], group_id=group) for name in usernames],
+            batch_size=self.batch_size,
+        )
+        for obj, name in zip(objects, usernames):
+            obj.user_id = user_ids[name]
+        super().create(objects)
+
+
+class EmployeeImporter(AccountImporter):
+    model = Employee
+    columns = (
+        "employee_id",
+        "password",
+        "name_ko",
+        "name_uz",
+        "birth_date",
+        "gender",
+        "start_date",
+        "telephone",
+        "address",
+        "email",
+        "college",
+        "university",
+        "graduate",
+        "position",
+        "salary",
+        "bonus",
+        "status",
+    )
+    unique_field = "employee_id"
+    group_name = "upsight_staff"
+    email_field = "email"
+
+
+class UniversityManagerImporter(AccountImporter):
+    model = UniversityManager
+    columns = ("manager_id", "password", "university", "name_ko", "name_uz", "phone_number")
+    unique_field = "manager_id"
+    group_name = "university_staff"
+
+
+class OrganManagerImporter(AccountImporter):
+    model = OrganManager
+    columns = ("manager_id", "password", "organ", "name_ko", "name_uz", "phone_number")
+    unique_field = "manager_id"
+    group_name = "organ_staff"
+
+
+ACCOUNT_IMPORTERS = {
+    "employees": EmployeeImporter,
+    "university-managers": UniversityManagerImporter,
+    "organ-managers": OrganManagerImporter,
+}
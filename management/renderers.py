@@ -0,0 +1,48 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.compat import INDENT_SEPARATORS, LONG_SEPARATORS, SHORT_SEPARATORS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that reuses one encoder per separator style.
+
+    The output is byte-for-byte identical to DRF's renderer. Building the
+    encoder once and turning off the circular-reference check (response data
+    is always a fresh tree of dicts and lists) saves a noticeable amount of
+    time on large list responses.
+    """
+
+    _encoders = {}
+
+    def get_encoder(self, indent, separators):
+        key = (indent, separators)
+        encoder = self._encoders.get(key)
+        if encoder is None:
+            encoder = self.encoder_class(
+                indent=indent,
+                ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict,
+                separators=separators,
+                check_circular=False,
+            )
+            self._encoders[key] = encoder
+        return encoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        if indent is None:
+            separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        else:
+            separators = INDENT_SEPARATORS
+
+        ret = self.get_encoder(indent, separators).encode(data)
+
+        # Same JavaScript-safe escaping as JSONRenderer
+        if "\u2028" in ret or "\u2029" in ret:
+            ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode()
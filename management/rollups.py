@@ -0,0 +1,171 @@
+"""
+Incremental maintenance of the ``PaymentRollup`` monthly totals.
+
+Every ``ClassPayment``/``EnterancePayment`` contributes its amount to one
+rollup row: (month of ``date``, "class", class) or (month, "entrance",
+university of the entrance). ``post_save``/``post_delete`` hooks move the
+contribution with ``UPDATE ... SET total = total + delta`` statements inside
+the payment's transaction, so concurrent payments never overwrite each other.
+
+Bulk operations (``bulk_create``, ``QuerySet.update``, raw SQL) and moving an
+entrance to another university bypass the hooks; run
+``manage.py rebuild_rollups`` after them.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from .models import ClassPayment, Enterance, EnterancePayment, PaymentRollup
+
+ROLLUP_ATTR = "_payment_rollup_state"
+
+
+def month_start(date):
+    return date.replace(day=1)
+
+
+def _rollup_state(instance):
+    """(payment_type, month, owner field, owner id, amount) of a payment, or None"""
+    values = instance.__dict__
+    if isinstance(instance, ClassPayment):
+        fields = ("date", "amount", "class_model_id")
+    else:
+        fields = ("date", "amount", "enterance_id")
+    # Deferred fields are missing from __dict__ and reading them would query
+    if any(values.get(field) is None for field in fields):
+        return None
+    date, amount, owner_id = (values[field] for field in fields)
+    if isinstance(instance, ClassPayment):
+        return ("class", month_start(date), "class_model_id", owner_id, amount)
+    return ("entrance", month_start(date), "enterance_id", owner_id, amount)
+
+
+def _resolve_owner(owner_field, owner_id):
+    """Rollup key field and value for a payment's class or entrance"""
+    if owner_field == "class_model_id":
+        return "class_model_id", owner_id
+    university_id = (
+        Enterance.objects.filter(pk=owner_id).values_list("university_id", flat=True).first()
+    )
+    return "university_id", university_id
+
+
+def apply_delta(state, sign):
+    """Add (sign=1) or remove (sign=-1) one payment's contribution"""
+    payment_type, period, owner_field, owner_id, amount = state
+    key_field, key_value = _resolve_owner(owner_field, owner_id)
+    if key_value is None:
+        return
+    lookup = {"period": period, "payment_type": payment_type, key_field: key_value}
+    rollups = PaymentRollup.objects.filter(**lookup)
+
+    with transaction.atomic():
+        updated = rollups.update(
+            total_amount=F("total_amount") + sign * amount,
+            payment_count=F("payment_count") + sign,
+        )
+        if updated:
+            if sign < 0:
+                rollups.filter(payment_count__lte=0).delete()
+            return
+        if sign < 0:
+            # Already removed, e.g. by a cascade from the university or class
+            return
+        try:
+            with transaction.atomic():
+                PaymentRollup.objects.create(
+                    **lookup, total_amount=amount, payment_count=1
+                )
+        except IntegrityError:
+            # Another transaction created the row first
+            rollups.update(
+                total_amount=F("total_amount") + amount,
+                payment_count=F("payment_count") + 1,
+            )
+
+
+def _load_previous_state(sender, instance, raw=False, **kwargs):
+    """Remember what an existing payment contributed before it is changed"""
+    if raw or instance.pk is None:
+        setattr(instance, ROLLUP_ATTR, None)
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    setattr(instance, ROLLUP_ATTR, previous and _rollup_state(previous))
+
+
+def _payment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, ROLLUP_ATTR, None)
+    current = _rollup_state(instance)
+    if previous == current:
+        return
+    if previous is not None:
+        apply_delta(previous, -1)
+    if current is not None:
+        apply_delta(current, 1)
+
+
+def _load_deleted_state(sender, instance, **kwargs):
+    state = _rollup_state(instance)
+    if state is None:
+        # Loaded with deferred fields
+        previous = sender.objects.filter(pk=instance.pk).first()
+        state = previous and _rollup_state(previous)
+    setattr(instance, ROLLUP_ATTR, state)
+
+
+def _payment_deleted(sender, instance, **kwargs):
+    state = getattr(instance, ROLLUP_ATTR, None)
+    if state is not None:
+        apply_delta(state, -1)
+
+
+def connect_rollup_hooks():
+    for model in (ClassPayment, EnterancePayment):
+        uid = f"payment-rollup:{model._meta.label_lower}"
+        pre_save.connect(_load_previous_state, sender=model, dispatch_uid=uid)
+        post_save.connect(_payment_saved, sender=model, dispatch_uid=uid)
+        pre_delete.connect(_load_deleted_state, sender=model, dispatch_uid=uid)
+        post_delete.connect(_payment_deleted, sender=model, dispatch_uid=uid)
+
+
+def rebuild_rollups():
+    """Recompute every rollup row from the payment tables; returns the row count"""
+    class_totals = (
+        ClassPayment.objects.annotate(period=TruncMonth("date"))
+        .values("period", "class_model_id")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    entrance_totals = (
+        EnterancePayment.objects.annotate(period=TruncMonth("date"))
+        .values("period", "enterance__university_id")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    rows = [
+        PaymentRollup(
+            period=row["period"],
+            payment_type="class",
+            class_model_id=row["class_model_id"],
+            total_amount=row["total"],
+            payment_count=row["count"],
+        )
+        for row in class_totals
+    ] + [
+        PaymentRollup(
+            period=row["period"],
+            payment_type="entrance",
+            university_id=row["enterance__university_id"],
+            total_amount=row["total"],
+            payment_count=row["count"],
+        )
+        for row in entrance_totals
+    ]
+    with transaction.atomic():
+        PaymentRollup.objects.all().delete()
+        PaymentRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,251 @@
+"""
+Concrete class sessions expanded from the weekly ``ClassTimeTable`` rules.
+
+A class meets on its timetable weekdays from ``opening_date`` until the same
+day ``period`` months later (exclusive). Sessions are expanded one week
+(Monday to Sunday) at a time, and all weeks of a request from one query.
+With a shared cache backend each week is cached under the main API cache
+generations of ``Class``, ``ClassTimeTable`` and ``Employee`` (see
+``main/caching.py``), so editing any of them retires every cached week. A
+per-process backend would keep serving weeks that another worker has
+changed, so without a shared one nothing is cached.
+
+Session times are wall-clock times of the timetable, without a time zone;
+the calendar feed writes them as floating times.
+"""
+
+import calendar
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+
+from main.caching import cache_is_shared, get_cache, get_generations
+
+from .models import Class, ClassTimeTable, Employee
+
+_schedule_settings = getattr(settings, "SCHEDULE", {})
+MAX_DAYS = _schedule_settings.get("MAX_DAYS", 92)
+CACHE_TIMEOUT = _schedule_settings.get("CACHE_TIMEOUT", 3600)
+FEED_PAST_DAYS = _schedule_settings.get("FEED_PAST_DAYS", 28)
+FEED_FUTURE_DAYS = _schedule_settings.get("FEED_FUTURE_DAYS", 182)
+
+CACHE_MODELS = (Class, ClassTimeTable, Employee)
+KEY_PREFIX = "schedule:week"
+FEED_SALT = "management.schedule.teacher-feed"
+
+WEEKDAY_NUMBERS = {day: number for number, (day, _) in enumerate(ClassTimeTable.WEEKDAY_CHOICES)}
+LEVEL_DISPLAY = dict(Class.LEVEL_OPTIONS)
+LECTURE_DISPLAY = dict(Class.LECTURE_OPTIONS)
+RULE_COLUMNS = (
+    "id",
+    "days",
+    "start_time",
+    "end_time",
+    "class_model_id",
+    "class_model__opening_date",
+    "class_model__period",
+    "class_model__classroom",
+    "class_model__group",
+    "class_model__level",
+    "class_model__lecture",
+    "class_model__teacher_first_id",
+    "class_model__teacher_first__name_ko",
+    "class_model__teacher_first__name_uz",
+    "class_model__teacher_second_id",
+    "class_model__teacher_second__name_ko",
+    "class_model__teacher_second__name_uz",
+)
+
+
+def add_months(day, months):
+    """The same day ``months`` later, or the last day of a shorter month"""
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    last_day = calendar.monthrange(year, month)[1]
+    return day.replace(year=year, month=month, day=min(day.day, last_day))
+
+
+def week_start(day):
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def _teachers(rule):
+    teachers = []
+    for position in ("first", "second"):
+        teacher = rule[f"class_model__teacher_{position}_id"]
+        if teacher is not None and teacher not in (t["id"] for t in teachers):
+            teachers.append(
+                {
+                    "id": teacher,
+                    "name": f"{rule[f'class_model__teacher_{position}__name_ko']} / "
+                    f"{rule[f'class_model__teacher_{position}__name_uz']}",
+                }
+            )
+    return teachers
+
+
+def _session(rule, day):
+    return {
+        "date": day,
+        "start_time": rule["start_time"],
+        "end_time": rule["end_time"],
+        "class_id": rule["class_model_id"],
+        "timetable_id": rule["id"],
+        "class_info": (
+            f"Group {rule['class_model__group']} - "
+            f"{LEVEL_DISPLAY.get(rule['class_model__level'], rule['class_model__level'])} "
+            f"{LECTURE_DISPLAY.get(rule['class_model__lecture'], rule['class_model__lecture'])}"
+        ),
+        "classroom": rule["class_model__classroom"],
+        "teachers": _teachers(rule),
+    }
+
+
+def expand_weeks(mondays):
+    """Sessions of each week starting on one of ``mondays``, from one query"""
+    weeks = {monday: [] for monday in mondays}
+    if not weeks:
+        return weeks
+    last_day = max(weeks) + datetime.timedelta(days=6)
+    rules = ClassTimeTable.objects.filter(
+        class_model__opening_date__lte=last_day, days__in=list(WEEKDAY_NUMBERS)
+    ).values(*RULE_COLUMNS)
+    for rule in rules:
+        opening = rule["class_model__opening_date"]
+        closing = add_months(opening, max(rule["class_model__period"], 0))
+        offset = datetime.timedelta(days=WEEKDAY_NUMBERS[rule["days"]])
+        for monday, sessions in weeks.items():
+            day = monday + offset
+            if opening <= day < closing:
+                sessions.append(_session(rule, day))
+    for sessions in weeks.values():
+        sessions.sort(
+            key=lambda session: (session["date"], session["start_time"], session["class_id"])
+        )
+    return weeks
+
+
+def schedule_generation():
+    """
+    Latest cache generation of the models sessions are built from, or None
+    without a shared cache, where generations only track this process's edits
+    """
+    if not cache_is_shared():
+        return None
+    return get_generations(CACHE_MODELS)
+
+
+def _week_key(monday, generations):
+    return f"{KEY_PREFIX}:{monday.isoformat()}:{':'.join(map(str, generations))}"
+
+
+def get_sessions(date_from, date_to, teacher=None, room=None, generations=None):
+    """
+    Sessions from ``date_from`` to ``date_to`` (inclusive), optionally of one
+    teacher id and/or one classroom (case-insensitive), in time order.
+    """
+    generations = generations or schedule_generation()
+    mondays = []
+    monday = week_start(date_from)
+    while monday <= date_to:
+        mondays.append(monday)
+        monday += datetime.timedelta(days=7)
+
+    if generations is None:
+        weeks = expand_weeks(mondays)
+    else:
+        cache = get_cache()
+        keys = {monday: _week_key(monday, generations) for monday in mondays}
+        cached = cache.get_many(keys.values())
+        weeks = {monday: cached[key] for monday, key in keys.items() if key in cached}
+        missing = expand_weeks([monday for monday in mondays if monday not in weeks])
+        if missing:
+            cache.set_many(
+                {keys[monday]: sessions for monday, sessions in missing.items()},
+                CACHE_TIMEOUT,
+            )
+            weeks.update(missing)
+
+    room = room.strip().casefold() if room else None
+    return [
+        session
+        for monday in mondays
+        for session in weeks[monday]
+        if date_from <= session["date"] <= date_to
+        and (teacher is None or any(t["id"] == teacher for t in session["teachers"]))
+        and (room is None or (session["classroom"] or "").strip().casefold() == room)
+    ]
+
+
+def schedule_etag(version, *parts):
+    """
+    Strong ETag of a schedule response: ``version`` is the generations, known
+    before expanding anything, or else the sessions themselves
+    """
+    raw = "|".join(map(str, (*version, *parts)))
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def feed_token(employee_id):
+    """Secret part of a teacher's calendar feed URL"""
+    return signing.Signer(salt=FEED_SALT).signature(str(employee_id))
+
+
+def check_feed_token(employee_id, token):
+    return constant_time_compare(feed_token(employee_id), token or "")
+
+
+def _ics_text(value):
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Split a content line into 75-octet pieces (RFC 5545, 3.1)"""
+    data = line.encode()
+    pieces = []
+    while len(data) > (74 if pieces else 75):
+        cut = 74 if pieces else 75
+        # Do not split a UTF-8 character
+        while cut and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        pieces.append(data[:cut].decode())
+        data = data[cut:]
+    pieces.append(data.decode())
+    return "\r\n ".join(pieces)
+
+
+def sessions_to_ics(sessions, name, stamp):
+    """iCalendar document of ``sessions``; ``stamp`` is a UTC datetime for DTSTAMP"""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Upsight//Class schedule//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ics_text(name)}",
+    ]
+    for session in sessions:
+        day = session["date"]
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{session['timetable_id']}-{day:%Y%m%d}@upsight",
+            f"DTSTAMP:{stamp:%Y%m%dT%H%M%SZ}",
+            f"DTSTART:{day:%Y%m%d}T{session['start_time']:%H%M%S}",
+            f"DTEND:{day:%Y%m%d}T{session['end_time']:%H%M%S}",
+            f"SUMMARY:{_ics_text(session['class_info'])}",
+        ]
+        if session["classroom"]:
+            lines.append(f"LOCATION:{_ics_text(session['classroom'])}")
+        teachers = ", ".join(teacher["name"] for teacher in session["teachers"])
+        lines += [f"DESCRIPTION:{_ics_text(teachers)}", "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
@@ -1,6 +1,22 @@
 from rest_framework import serializers
 from django.contrib.auth.hashers import check_password
+from django.db.models import Count, DecimalField, OuterRef, Prefetch, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from .conflicts import slot_conflicts
+from .images import ImageSrcsetField, derivatives_ready, thumbnail_name
+from .fastpath import (
+    Column,
+    CompiledSerializer,
+    Computed,
+    Constant,
+    Display,
+    FirstOf,
+    MediaURL,
+    Nested,
+    Spec,
+)
 from .models import (
+    BackgroundJob,
     Employee,
     Student,
     Class,
@@ -9,6 +25,7 @@ from .models import (
     EnterancePayment,
     University,
     Enterance,
+    EnteranceStudentRegistration,
     AttachedDocument,
     EmployeeDocument,
     StudentRegistration,
@@ -266,10 +283,28 @@ class EmployeeSerializer(serializers.ModelSerializer):
         if obj.picture:
             request = self.context.get("request")
             if request:
-                return request.build_absolute_uri(obj.picture.url)
+                name = thumbnail_name(obj.picture.name, derivatives_ready(obj, "picture"))
+                return request.build_absolute_uri(obj.picture.storage.url(name))
         return "/placeholder.svg?height=40&width=40"
 
 
+AVATAR_PLACEHOLDER = "/placeholder.svg?height=40&width=40"
+
+# values()-based counterpart of EmployeeSerializer for employees_list
+EmployeeListSerializer = CompiledSerializer(
+    EmployeeSerializer,
+    name=FirstOf("name_ko", "name_uz"),
+    role=Constant("upsight_staff"),
+    avatar=MediaURL(
+        "picture",
+        storage=Employee._meta.get_field("picture").storage,
+        default=AVATAR_PLACEHOLDER,
+        absolute_only=True,
+        thumbnail=True,
+    ),
+)
+
+
 class StudentSerializer(serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     guardian_name = serializers.SerializerMethodField()
@@ -318,7 +353,8 @@ class StudentSerializer(serializers.ModelSerializer):
         if obj.picture:
             request = self.context.get("request")
             if request:
-                return request.build_absolute_uri(obj.picture.url)
+                name = thumbnail_name(obj.picture.name, derivatives_ready(obj, "picture"))
+                return request.build_absolute_uri(obj.picture.storage.url(name))
         return "/placeholder.svg?height=40&width=40"
 
     def get_enterance_payment_amount(self, obj):
@@ -346,6 +382,28 @@ class StudentSerializer(serializers.ModelSerializer):
         return None
 
 
+# values()-based counterpart of StudentSerializer for students_list. The
+# enterance_* / bonus / recommend fields are only set on entrance rosters, so a
+# plain list always gets their defaults.
+StudentListSerializer = CompiledSerializer(
+    StudentSerializer,
+    name=FirstOf("name_ko", "name_uz"),
+    guardian_name=FirstOf("guardian_name_ko", "guardian_name_uz"),
+    avatar=MediaURL(
+        "picture",
+        storage=Student._meta.get_field("picture").storage,
+        default=AVATAR_PLACEHOLDER,
+        absolute_only=True,
+        thumbnail=True,
+    ),
+    enterance_payment_amount=Constant(0),
+    enterance_status=Constant(None),
+    enterance_date=Constant(None),
+    bonus=Constant(None),
+    recommend=Constant(None),
+)
+
+
 class ClassTimeTableSerializer(serializers.ModelSerializer):
     days_display = serializers.SerializerMethodField()
     days_display_ko = serializers.SerializerMethodField()
@@ -426,12 +484,164 @@ class ClassSerializer(serializers.ModelSerializer):
         ]
 
 
+
+def _days_display(mapping):
+    # Mirrors ClassTimeTable.get_days_display*, which iterate over ``days``
+    return lambda days: [mapping.get(day, day) for day in days]
+
+
+def _duration(start, end):
+    if start and end:
+        duration = (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+        return f"{duration // 60}h {duration % 60}m"
+    return "0h 0m"
+
+
+_DAYS_KO = {
+    "monday": "월요일",
+    "tuesday": "화요일",
+    "wednesday": "수요일",
+    "thursday": "목요일",
+    "friday": "금요일",
+    "saturday": "토요일",
+    "sunday": "일요일",
+}
+_DAYS_UZ = {
+    "monday": "Душанба",
+    "tuesday": "Сешанба",
+    "wednesday": "Чоршанба",
+    "thursday": "Пайшанба",
+    "friday": "Жума",
+    "saturday": "Шанба",
+    "sunday": "Якшанба",
+}
+
+ClassTimeTableListSerializer = CompiledSerializer(
+    ClassTimeTableSerializer,
+    days_display=Computed(_days_display(dict(ClassTimeTable.WEEKDAY_CHOICES)), "days"),
+    days_display_ko=Computed(_days_display(_DAYS_KO), "days"),
+    days_display_uz=Computed(_days_display(_DAYS_UZ), "days"),
+    duration=Computed(_duration, "start_time", "end_time"),
+)
+
+# values()-based counterpart of ClassSerializer for classes_list. Teacher names
+# follow Employee.get_name(), which defaults to Korean.
+ClassListSerializer = CompiledSerializer(
+    ClassSerializer,
+    teacher_first_name=Column("teacher_first__name_ko"),
+    teacher_second_name=Column("teacher_second__name_ko"),
+    level_display=Display("level", Class.LEVEL_OPTIONS),
+    lecture_display=Display("lecture", Class.LECTURE_OPTIONS),
+    timetables=Nested(
+        ClassTimeTableListSerializer, ClassTimeTable.objects.all(), "class_model"
+    ),
+)
+
+CLASS_TOTAL_FIELDS = ("total_students", "active_students", "total_payments")
+
+
+def _per_class(queryset, **aggregate):
+    """Correlated subquery computing one aggregate over a class's child rows"""
+    (name, _), = aggregate.items()
+    return Subquery(
+        queryset.filter(class_model=OuterRef("pk"))
+        .order_by()
+        .values("class_model")
+        .annotate(**aggregate)
+        .values(name)
+    )
+
+
+def with_class_totals(classes, month=None):
+    """
+    Annotate classes with ``total_students``, ``active_students`` (state 1)
+    and ``total_payments`` (of ``month`` only, if given), computed in the same
+    query instead of one count/sum query per class.
+    """
+    registrations = ClassStudentRegistration.objects.all()
+    payments = ClassPayment.objects.all()
+    return classes.annotate(
+        total_students=Coalesce(_per_class(registrations, count=Count("id")), 0),
+        active_students=Coalesce(
+            _per_class(registrations, count=Count("id", filter=Q(state=1))), 0
+        ),
+        total_payments=Coalesce(
+            _per_class(
+                payments,
+                total=Sum("amount", filter=Q(payment_month=month) if month else None),
+            ),
+            Value(0),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+
+
+def class_payments_by_month(class_ids):
+    """Per-month payment totals of each class, from one grouped query"""
+    rows = (
+        ClassPayment.objects.filter(class_model_id__in=class_ids)
+        .order_by("class_model", "payment_month")
+        .values("class_model", "payment_month")
+        .annotate(total_amount=Sum("amount"), payment_count=Count("id"))
+    )
+    months = {class_id: [] for class_id in class_ids}
+    for row in rows:
+        months[row["class_model"]].append(
+            {
+                "payment_month": row["payment_month"],
+                "payment_month_display": f"Month {row['payment_month']}",
+                "total_amount": row["total_amount"],
+                "payment_count": row["payment_count"],
+            }
+        )
+    return months
+
+
+class MonthlyPayments(Spec):
+    """class_payments_by_month() of every row, loaded for all rows at once"""
+
+    columns = ("id",)
+
+    def prepare(self, rows, context):
+        context["_payments_by_month"] = class_payments_by_month([row["id"] for row in rows])
+
+    def bind(self, context):
+        months = context["_payments_by_month"]
+        return lambda row: months[row["id"]]
+
+
+class ClassSummarySerializer(ClassSerializer):
+    """ClassSerializer plus the with_class_totals() annotations"""
+
+    total_students = serializers.IntegerField(read_only=True)
+    active_students = serializers.IntegerField(read_only=True)
+    total_payments = serializers.DecimalField(
+        max_digits=14, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    payments_by_month = serializers.ListField(read_only=True)
+
+    class Meta(ClassSerializer.Meta):
+        fields = ClassSerializer.Meta.fields + [*CLASS_TOTAL_FIELDS, "payments_by_month"]
+
+
+# classes_list?summary=true, over with_class_totals() rows
+ClassSummaryListSerializer = CompiledSerializer(
+    ClassSummarySerializer,
+    **ClassListSerializer.overrides,
+    total_students=Column("total_students"),
+    active_students=Column("active_students"),
+    total_payments=Column("total_payments"),
+    payments_by_month=MonthlyPayments(),
+)
+
+
 class ClassDetailSerializer(ClassSerializer):
     payments = serializers.SerializerMethodField()
     student_registrations = serializers.SerializerMethodField()
     total_students = serializers.SerializerMethodField()
     active_students = serializers.SerializerMethodField()
     total_payments = serializers.SerializerMethodField()
+    payments_by_month = serializers.SerializerMethodField()
 
     class Meta(ClassSerializer.Meta):
         fields = ClassSerializer.Meta.fields + [
@@ -440,45 +650,62 @@ class ClassDetailSerializer(ClassSerializer):
             "total_students",
             "active_students",
             "total_payments",
+            "payments_by_month",
             "current_month",
         ]
 
     def get_payments(self, obj):
         """Get class payments with optional month filtering"""
-        payments = obj.payments.select_related("student").all()
+        if "payments" in getattr(obj, "_prefetched_objects_cache", {}):
+            # class_detail prefetches them already filtered by month
+            payments = obj.payments.all()
+        else:
+            payments = obj.payments.select_related("student").all()
 
-        # Get month filter from context (passed from view)
-        month_filter = self.context.get("month_filter")
-        if month_filter:
-            payments = payments.filter(payment_month=month_filter)
+            # Get month filter from context (passed from view)
+            month_filter = self.context.get("month_filter")
+            if month_filter:
+                payments = payments.filter(payment_month=month_filter)
 
         return ClassPaymentSerializer(payments, many=True, context=self.context).data
 
     def get_student_registrations(self, obj):
         """Get students registered for this class"""
-        registrations = obj.student_registrations.select_related("student").all()
+        if "student_registrations" in getattr(obj, "_prefetched_objects_cache", {}):
+            registrations = obj.student_registrations.all()
+        else:
+            registrations = obj.student_registrations.select_related("student").all()
         return ClassStudentRegistrationSerializer(
             registrations, many=True, context=self.context
         ).data
 
+    def _totals(self, obj):
+        """Annotations of with_class_totals(), queried here if the view did not add them"""
+        if not hasattr(obj, "total_payments"):
+            totals = (
+                with_class_totals(Class.objects.filter(pk=obj.pk), self.context.get("month_filter"))
+                .values(*CLASS_TOTAL_FIELDS)
+                .get()
+            )
+            for name, value in totals.items():
+                setattr(obj, name, value)
+        return obj
+
     def get_total_students(self, obj):
         """Get total number of registered students"""
-        return obj.student_registrations.count()
+        return self._totals(obj).total_students
 
     def get_active_students(self, obj):
         """Get number of active students (state = 1)"""
-        return obj.student_registrations.filter(state=1).count()
+        return self._totals(obj).active_students
 
     def get_total_payments(self, obj):
         """Get total payment amount with optional month filtering"""
-        payments = obj.payments.all()
+        return self._totals(obj).total_payments
 
-        # Apply month filter if provided
-        month_filter = self.context.get("month_filter")
-        if month_filter:
-            payments = payments.filter(payment_month=month_filter)
-
-        return sum(payment.amount for payment in payments)
+    def get_payments_by_month(self, obj):
+        """Payment total and count of every month, regardless of the month filter"""
+        return class_payments_by_month([obj.pk])[obj.pk]
 
 
 class ClassTimeTableCreateUpdateSerializer(serializers.ModelSerializer):
@@ -495,6 +722,9 @@ class ClassTimeTableCreateUpdateSerializer(serializers.ModelSerializer):
         # Validate days
         valid_days = [choice[0] for choice in ClassTimeTable.WEEKDAY_CHOICES]
         days = data.get("days", [])
+        # ClassTimeTable.days stores a single weekday
+        if isinstance(days, str):
+            days = [days]
 
         if not isinstance(days, list):
             raise serializers.ValidationError("Days must be a list of day values.")
@@ -505,6 +735,22 @@ class ClassTimeTableCreateUpdateSerializer(serializers.ModelSerializer):
                     f"Invalid day: {day}. Valid options are: {valid_days}"
                 )
 
+        # Fall back to the stored values for partial updates
+        instance = self.instance
+        class_model = data.get("class_model", getattr(instance, "class_model", None))
+        start_time = data.get("start_time", getattr(instance, "start_time", None))
+        end_time = data.get("end_time", getattr(instance, "end_time", None))
+        if start_time and end_time:
+            conflicts = slot_conflicts(
+                class_model,
+                days or getattr(instance, "days", None),
+                start_time,
+                end_time,
+                exclude_id=getattr(instance, "pk", None),
+            )
+            if conflicts:
+                raise serializers.ValidationError(conflicts)
+
         return data
 
 
@@ -515,6 +761,7 @@ class UniversitySerializer(serializers.ModelSerializer):
     )
     grade_display = serializers.CharField(source="get_grade_display", read_only=True)
     years_display = serializers.CharField(source="get_years_display", read_only=True)
+    logo_srcset = ImageSrcsetField(source="logo")
 
     class Meta:
         model = University
@@ -539,6 +786,7 @@ class UniversitySerializer(serializers.ModelSerializer):
             "contract_display",
             "agreement_date",
             "logo",
+            "logo_srcset",
         ]
 
     def get_representative_name(self, obj):
@@ -560,6 +808,39 @@ class UniversityDetailSerializer(UniversitySerializer):
         ).data
 
 
+def with_enterance_payment_amount(registrations):
+    """
+    Annotate entrance registrations with the student's payment total for that
+    entrance, computed by a correlated subquery instead of per-student queries.
+    """
+    payment_totals = (
+        EnterancePayment.objects.filter(
+            student=OuterRef("student"), enterance=OuterRef("enterance")
+        )
+        .order_by()
+        .values("student")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    return registrations.select_related("student").annotate(
+        enterance_payment_amount=Coalesce(
+            Subquery(payment_totals),
+            Value(0),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+    )
+
+
+def enterance_students_prefetch():
+    """Prefetch plan that serves EnteranceSerializer.get_students in one query"""
+    return Prefetch(
+        "student_registrations",
+        queryset=with_enterance_payment_amount(
+            EnteranceStudentRegistration.objects.all()
+        ),
+    )
+
+
 class EnteranceSerializer(serializers.ModelSerializer):
     university_name = serializers.CharField(source="university.__str__", read_only=True)
     kind_display = serializers.CharField(source="get_kind_display", read_only=True)
@@ -587,16 +868,16 @@ class EnteranceSerializer(serializers.ModelSerializer):
         ]
 
     def get_students(self, obj):
-        registrations = obj.student_registrations.select_related("student")
+        if "student_registrations" in getattr(obj, "_prefetched_objects_cache", {}):
+            registrations = obj.student_registrations.all()
+        else:
+            registrations = with_enterance_payment_amount(
+                obj.student_registrations.all()
+            )
         students = []
         for reg in registrations:
             student = reg.student
-            payment_amounts = student.payments.all()
-            payment_amount = 0
-            for payment in payment_amounts:
-                if payment.enterance == obj:
-                    payment_amount += payment.amount
-            student.enterance_payment_amount = payment_amount
+            student.enterance_payment_amount = reg.enterance_payment_amount or 0
             student.enterance_status = reg.get_state_display()
             student.enterance_date = reg.date
             student.bonus = reg.bonus
@@ -812,3 +1093,35 @@ class FinancePaymentSerializer(serializers.Serializer):
 
     def get_student_name(self, obj):
         return obj.get("student_name_ko", "") or obj.get("student_name_uz", "")
+
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+
+    class Meta:
+        model = BackgroundJob
+        fields = [
+            "id",
+            "task",
+            "payload",
+            "object_type",
+            "object_id",
+            "status",
+            "status_display",
+            "result",
+            "error",
+            "attempts",
+            "max_attempts",
+            "run_after",
+            "created_at",
+            "finished_at",
+        ]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Tracebacks may reveal paths and data of other universities. Read the
+        # role, not request.user: JWT users carry no is_superuser flag
+        role = getattr(self.context.get("request"), "upsight_role", None)
+        if role is None or not role.is_upsight_staff:
+            data.pop("error", None)
+        return data
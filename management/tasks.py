@@ -0,0 +1,150 @@
+"""
+Upload post-processing that runs in the job queue instead of the request.
+
+Handlers look the object up again when they run, so a job for an object that
+was deleted or whose file was replaced in the meantime is skipped.
+"""
+
+import hashlib
+import os
+import re
+
+from django.apps import apps
+from django.db.models import Q
+from django.db.models.signals import post_save
+
+from .images import (
+    DERIVATIVE_WIDTHS,
+    derivatives_ready,
+    generate_derivatives,
+    has_derivatives,
+    mark_derivatives,
+)
+from .jobs import enqueue, task
+from .models import BackgroundJob
+
+PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+PDF_COUNT_RE = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)", re.S)
+
+
+def _load_file(model, pk, field, name):
+    instance = apps.get_model(model).objects.filter(pk=pk).first()
+    if instance is None:
+        return None, "deleted"
+    fieldfile = getattr(instance, field)
+    if not fieldfile or fieldfile.name != name:
+        return None, "replaced"
+    return fieldfile, None
+
+
+def count_pdf_pages(content):
+    """
+    Page count of a PDF without a PDF library: count page objects, falling
+    back to the page tree's ``/Count`` when they sit in compressed streams.
+    """
+    pages = len(PDF_PAGE_RE.findall(content))
+    if pages:
+        return pages
+    counts = [int(count) for count in PDF_COUNT_RE.findall(content)]
+    return max(counts) if counts else None
+
+
+@task("images.generate_derivatives")
+def generate_image_derivatives(model, pk, field, name):
+    fieldfile, skipped = _load_file(model, pk, field, name)
+    if skipped:
+        return {"skipped": skipped}
+    if has_derivatives(fieldfile.storage, name):
+        mark_derivatives(apps.get_model(model), pk, field, name)
+        return {"created": False}
+    generate_derivatives(fieldfile.storage, name)
+    mark_derivatives(apps.get_model(model), pk, field, name)
+    return {"created": True, "widths": list(DERIVATIVE_WIDTHS)}
+
+
+@task("files.inspect")
+def inspect_file(model, pk, field, name):
+    """Size, SHA-256 checksum and (for PDFs) page count of an uploaded file"""
+    fieldfile, skipped = _load_file(model, pk, field, name)
+    if skipped:
+        return {"skipped": skipped}
+
+    checksum = hashlib.sha256()
+    is_pdf = os.path.splitext(name)[1].lower() == ".pdf"
+    chunks = []
+    size = 0
+    with fieldfile.storage.open(name, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            checksum.update(chunk)
+            size += len(chunk)
+            if is_pdf:
+                chunks.append(chunk)
+
+    result = {"size": size, "sha256": checksum.hexdigest()}
+    if is_pdf:
+        result["page_count"] = count_pdf_pages(b"".join(chunks))
+    return result
+
+
+def _already_queued(task_name, instance, name):
+    """
+    Whether a job for this file version is waiting, running or has processed
+    it; failed jobs and jobs that skipped the file do not count.
+    """
+    return (
+        BackgroundJob.objects.filter(
+            task=task_name,
+            object_type=instance._meta.label_lower,
+            object_id=str(instance.pk),
+            payload__name=name,
+        )
+        .filter(
+            Q(status__in=("pending", "running"))
+            | (Q(status="done") & ~Q(result__has_key="skipped"))
+        )
+        .exists()
+    )
+
+
+def _enqueue_for_fields(task_name, instance, field_names, skip=None):
+    for field in field_names:
+        fieldfile = getattr(instance, field)
+        if not fieldfile:
+            continue
+        if skip is not None and skip(fieldfile):
+            continue
+        if _already_queued(task_name, instance, fieldfile.name):
+            continue
+        enqueue(
+            task_name,
+            {
+                "model": instance._meta.label_lower,
+                "pk": instance.pk,
+                "field": field,
+                "name": fieldfile.name,
+            },
+            instance=instance,
+        )
+
+
+def enqueue_image_derivatives(instance, field_names):
+    _enqueue_for_fields(
+        "images.generate_derivatives",
+        instance,
+        field_names,
+        skip=lambda fieldfile: derivatives_ready(instance, fieldfile.field.name),
+    )
+
+
+def register_file_inspection(model, *field_names):
+    """Queue an ``files.inspect`` job whenever a new file is saved on ``model``"""
+
+    def inspect_saved_files(sender, instance, **kwargs):
+        _enqueue_for_fields("files.inspect", instance, field_names)
+
+    post_save.connect(
+        inspect_saved_files,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"file-inspection:{model._meta.label_lower}",
+    )
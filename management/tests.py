@@ -1,3 +1,122 @@
+from django.contrib.auth.models import Group, User
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from board.models import Information, News, Notice
+from .models import ClassPayment, Employee, EnterancePayment, Student, StudentBalance
+
+
+class HotQueryIndexTests(TestCase):
+    """The list queries that run on every page view must be served by indexes"""
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # The test tables are nearly empty, where a sequential scan is
+                # always cheapest; forbid it to see whether an index fits at all
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("EXPLAIN " + sql, params)
+            else:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+
+    def index_name(self, model, fields):
+        return next(index.name for index in model._meta.indexes if index.fields == fields)
+
+    def assertUsesIndex(self, queryset, index, ordered=True):
+        """``index`` is used, nothing is fully scanned and, if ``ordered``, nothing sorted"""
+        plan = self.explain(queryset)
+        self.assertTrue([line for line in plan if index in line], plan)
+        if connection.vendor == "postgresql":
+            self.assertFalse([line for line in plan if "Seq Scan" in line], plan)
+            if ordered:
+                self.assertFalse([line for line in plan if "Sort" in line], plan)
+        else:
+            self.assertFalse(
+                [line for line in plan if line.startswith("SCAN ") and " USING " not in line],
+                plan,
+            )
+            if ordered:
+                self.assertFalse([line for line in plan if "TEMP B-TREE" in line], plan)
+
+    def test_board_lists(self):
+        for model in (News, Notice, Information):
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.order_by("-date")[:20],
+                    self.index_name(model, ["-date"]),
+                )
+                self.assertUsesIndex(
+                    model.objects.filter(university_id=1).order_by("-date"),
+                    self.index_name(model, ["university", "-date"]),
+                )
+
+    def test_payment_lists(self):
+        for model in (ClassPayment, EnterancePayment):
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.order_by("-date", "-id")[:100],
+                    self.index_name(model, ["-date", "-id"]),
+                )
+        self.assertUsesIndex(
+            ClassPayment.objects.filter(class_model_id=1, payment_month=3),
+            self.index_name(ClassPayment, ["class_model", "payment_month"]),
+            ordered=False,
+        )
+
+    def test_arrears_list(self):
+        arrears = StudentBalance.objects.filter(outstanding_amount__gt=0)
+        self.assertUsesIndex(
+            arrears.order_by("-outstanding_amount", "-id")[:100],
+            "student_balance_arrears_idx",
+        )
+        self.assertUsesIndex(
+            arrears.filter(class_model_id=1).order_by("-outstanding_amount", "-id")[:100],
+            "student_balance_class_idx",
+        )
+
+    def test_people_lists(self):
+        for model in (Student, Employee):
+            with self.subTest(model=model.__name__):
+                self.assertUsesIndex(
+                    model.objects.order_by("-created_at", "-id")[:100],
+                    self.index_name(model, ["-created_at", "-id"]),
+                )
+        self.assertUsesIndex(
+            Student.objects.filter(gender="F").order_by("-created_at", "-id")[:100],
+            self.index_name(Student, ["gender", "-created_at", "-id"]),
+        )
+        self.assertUsesIndex(
+            Student.objects.filter(master__gt="").order_by("-created_at", "-id")[:100],
+            "student_master_idx",
+        )
+        for field in ("name_ko", "name_uz", "student_id", "telephone"):
+            with self.subTest(field=field):
+                self.assertUsesIndex(
+                    Student.objects.filter(**{f"{field}__istartswith": "Ali"}).order_by(
+                        "-created_at", "-id"
+                    ),
+                    f"student_{field}_prefix_idx",
+                    ordered=False,
+                )
+
+
+class FinanceArrearsTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="staff")
+        user.groups.add(Group.objects.create(name="upsight_staff"))
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_min_amount_must_be_a_finite_number(self):
+        for value in ("abc", "NaN", "sNaN", "Infinity", "-inf"):
+            with self.subTest(value=value):
+                response = self.client.get(reverse("finance_arrears"), {"min_amount": value})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"error": "min_amount must be a number"})
+
+        response = self.client.get(reverse("finance_arrears"), {"min_amount": "10.5"})
+        self.assertEqual(response.status_code, 200)
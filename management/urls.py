@@ -1,15 +1,25 @@
 from django.urls import path
+from .metrics import metrics_view
 from .views import (
     unified_login,
     employee_logout,
     employee_profile,
     students_list,
+    students_export,
+    students_import,
+    accounts_import,
     student_detail,
     employees_list,
+    employees_export,
     employee_detail,
     classes_list,
     class_detail,
     class_timetables,
+    class_payment_matrix,
+    class_payment_matrices,
+    timetable_conflicts,
+    schedule_list,
+    teacher_calendar,
     universities_list,
     university_detail,
     enterances_list,
@@ -19,10 +29,16 @@ from .views import (
     careers_list,
     career_detail,
     finance_payments_list,
+    finance_payments_export,
+    finance_summary,
     entrance_payments_list,
     class_payments_list,
     entrance_payment_detail,
     class_payment_detail,
+    finance_arrears,
+    student_balance,
+    jobs_list,
+    job_detail,
 )
 
 urlpatterns = [
@@ -33,16 +49,47 @@ urlpatterns = [
     path("auth/profile", employee_profile, name="employee_profile"),
     # Student endpoints
     path("students", students_list, name="students_list"),
+    path("students/export.csv", students_export, name="students_export"),
+    path("students/import", students_import, name="students_import"),
     path("students/<int:student_id>", student_detail, name="student_detail"),
     # Employee endpoints
     path("employees", employees_list, name="employees_list"),
+    path("employees/export.csv", employees_export, name="employees_export"),
     path("employees/<int:employee_id>", employee_detail, name="employee_detail"),
+    # Bulk account provisioning
+    path("employees/import", accounts_import, {"kind": "employees"}, name="employees_import"),
+    path(
+        "university-managers/import",
+        accounts_import,
+        {"kind": "university-managers"},
+        name="university_managers_import",
+    ),
+    path(
+        "organ-managers/import",
+        accounts_import,
+        {"kind": "organ-managers"},
+        name="organ_managers_import",
+    ),
     # Class endpoints
     path("classes", classes_list, name="classes_list"),
     path("classes/<int:class_id>", class_detail, name="class_detail"),
     path(
         "classes/<int:class_id>/timetables", class_timetables, name="class_timetables"
     ),
+    path(
+        "classes/<int:class_id>/payment-matrix",
+        class_payment_matrix,
+        name="class_payment_matrix",
+    ),
+    path("classes/payment-matrix", class_payment_matrices, name="class_payment_matrices"),
+    path("timetable/conflicts", timetable_conflicts, name="timetable_conflicts"),
+    # Schedule endpoints
+    path("schedule", schedule_list, name="schedule_list"),
+    path(
+        "schedule/teachers/<int:employee_id>.ics",
+        teacher_calendar,
+        name="teacher_calendar",
+    ),
     # University endpoints
     path("universities", universities_list, name="universities_list"),
     path(
@@ -59,8 +106,17 @@ urlpatterns = [
     path("careers/<int:career_id>", career_detail, name="career_detail"),
     # Finance endpoints
     path("finance/payments", finance_payments_list, name="finance_payments_list"),
+    path("finance/payments/export.csv", finance_payments_export, name="finance_payments_export"),
+    path("finance/summary", finance_summary, name="finance_summary"),
     path("finance/entrance-payments", entrance_payments_list, name="entrance_payments_list"),
     path("finance/class-payments", class_payments_list, name="class_payments_list"),
     path("finance/entrance-payments/<int:payment_id>", entrance_payment_detail, name="entrance_payment_detail"),
     path("finance/class-payments/<int:payment_id>", class_payment_detail, name="class_payment_detail"),
+    path("finance/arrears", finance_arrears, name="finance_arrears"),
+    path("finance/balances/<int:student_id>", student_balance, name="student_balance"),
+    # Background job endpoints
+    path("jobs", jobs_list, name="jobs_list"),
+    path("jobs/<int:job_id>", job_detail, name="job_detail"),
+    # Prometheus metrics
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -1,3 +1,13 @@
+import datetime
+from decimal import Decimal
+
+from django.db.models import CharField, Count, F, IntegerField, Prefetch, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -7,12 +17,14 @@ from .serializers import (
     EmployeeLoginSerializer,
     UnifiedLoginSerializer,
     EmployeeSerializer,
+    EmployeeListSerializer,
     UniversityManagerSerializer,
-    StudentSerializer,
+    StudentListSerializer,
     StudentDetailSerializer,
     EmployeeDetailSerializer,
-    ClassSerializer,
+    ClassListSerializer,
     ClassDetailSerializer,
+    ClassSummaryListSerializer,
     ClassTimeTableSerializer,
     UniversitySerializer,
     UniversityDetailSerializer,
@@ -22,10 +34,15 @@ from .serializers import (
     EnterancePaymentSerializer,
     ClassPaymentSerializer,
     FinancePaymentSerializer,
+    BackgroundJobSerializer,
+    enterance_students_prefetch,
+    with_class_totals,
 )
 from .models import (
     Student,
     Class,
+    ClassStudentRegistration,
+    EnteranceStudentRegistration,
     ClassTimeTable,
     ClassPayment,
     EnterancePayment,
@@ -35,8 +52,40 @@ from .models import (
     Career,
     Employee,
     UniversityManager,
+    BackgroundJob,
+    PaymentRollup,
+    StudentBalance,
+)
+from .conflicts import WEEKDAYS, TimetableIndex
+from .exports import CHUNK_SIZE as EXPORT_CHUNK_SIZE, export_queryset, stream_csv
+from .imports import (
+    WEB_MAX_PASSWORDS as IMPORT_MAX_PASSWORDS,
+    WEB_MAX_ROWS as IMPORT_MAX_ROWS,
+    ImportFileError,
+    StudentImporter,
+    read_rows,
+)
+from .pagination import KeysetPaginator, PaginationError
+from .payment_matrix import CLASS_COLUMNS, active_classes, build_payment_matrices, build_payment_matrix
+from .provisioning import ACCOUNT_IMPORTERS
+from .schedule import (
+    FEED_FUTURE_DAYS,
+    FEED_PAST_DAYS,
+    MAX_DAYS as SCHEDULE_MAX_DAYS,
+    check_feed_token,
+    feed_token,
+    get_sessions,
+    schedule_etag,
+    schedule_generation,
+    sessions_to_ics,
+    week_start,
 )
 
+ENTERANCE_KIND_DISPLAY = dict(Enterance.KIND_OPTIONS)
+ENTERANCE_ORDER_DISPLAY = dict(Enterance.ORDER_OPTIONS)
+CLASS_LEVEL_DISPLAY = dict(Class.LEVEL_OPTIONS)
+CLASS_LECTURE_DISPLAY = dict(Class.LECTURE_OPTIONS)
+
 
 def get_tokens_for_user(user_obj):
     """Generate JWT tokens for employee or university manager"""
@@ -50,9 +99,13 @@ def get_tokens_for_user(user_obj):
         refresh["user_type"] = "manager"
         refresh["university_id"] = user_obj.university.id if user_obj.university else None
     
-    refresh["role"] = (
-        user_obj.user.groups.first().name if user_obj.user.groups.first() else "user"
+    # Role claims are copied into the access token and trusted by
+    # ClaimsJWTAuthentication, so requests need no group lookups
+    group_names = list(
+        user_obj.user.groups.order_by("id").values_list("name", flat=True)
     )
+    refresh["groups"] = group_names
+    refresh["role"] = group_names[0] if group_names else "user"
 
     return {
         "refresh": str(refresh),
@@ -146,16 +199,127 @@ def employee_profile(request):
     Get current employee profile
     """
     try:
-        # Get employee from user relationship
-        employee = request.user.employee_profile
+        # Look the employee up by id; token users carry no ORM relations
+        employee = Employee.objects.get(user_id=request.user.id)
         serializer = EmployeeSerializer(employee, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
-    except AttributeError:
+    except Employee.DoesNotExist:
         return Response(
             {"error": "Employee profile not found"}, status=status.HTTP_404_NOT_FOUND
         )
 
 
+# ?education= value -> Student field that must be filled in
+STUDENT_EDUCATION_FIELDS = {
+    "high_school": "high_school",
+    "college": "college",
+    "university": "university",
+    "master": "master",
+    "other": "other_education",
+}
+# Fields matched by ?search= as prefixes
+STUDENT_SEARCH_FIELDS = ("name_ko", "name_uz", "student_id", "telephone")
+
+
+def _parse_choice(name, value, choices):
+    """Map a choice value or its label (case-insensitive) to the value"""
+    for choice, label in choices:
+        if value.lower() in (str(choice).lower(), str(label).lower()):
+            return choice
+    allowed = ", ".join(str(label) for _, label in choices)
+    raise ValueError(f"Invalid {name}: {value}. Allowed: {allowed}")
+
+
+def _parse_day(name, value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
+
+def _parse_id(name, value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer id")
+
+
+def filter_students(students, params):
+    """
+    Apply the students_list filters in ``params``; raises ValueError for
+    invalid values. Every filter has an index (see migration 0012).
+    """
+    if params.get("gender"):
+        students = students.filter(
+            gender=_parse_choice("gender", params["gender"], Student.GENDER_CHOICES)
+        )
+
+    if params.get("education"):
+        levels = params["education"].split(",")
+        unknown = [level for level in levels if level not in STUDENT_EDUCATION_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Invalid education: {', '.join(unknown)}. "
+                f"Allowed: {', '.join(STUDENT_EDUCATION_FIELDS)}"
+            )
+        # Matches the conditions of the partial indexes; excludes NULL and ""
+        education = Q()
+        for level in levels:
+            education |= Q(**{f"{STUDENT_EDUCATION_FIELDS[level]}__gt": ""})
+        students = students.filter(education)
+
+    if params.get("class") or params.get("class_state"):
+        registrations = ClassStudentRegistration.objects.all()
+        if params.get("class"):
+            registrations = registrations.filter(
+                class_model_id=_parse_id("class", params["class"])
+            )
+        if params.get("class_state"):
+            registrations = registrations.filter(
+                state=_parse_choice(
+                    "class_state", params["class_state"], ClassStudentRegistration.STATE_OPTIONS
+                )
+            )
+        students = students.filter(pk__in=registrations.values("student_id"))
+
+    if params.get("entrance") or params.get("entrance_state"):
+        registrations = EnteranceStudentRegistration.objects.all()
+        if params.get("entrance"):
+            registrations = registrations.filter(
+                enterance_id=_parse_id("entrance", params["entrance"])
+            )
+        if params.get("entrance_state"):
+            registrations = registrations.filter(
+                state=_parse_choice(
+                    "entrance_state",
+                    params["entrance_state"],
+                    EnteranceStudentRegistration.STATE_OPTIONS,
+                )
+            )
+        students = students.filter(pk__in=registrations.values("student_id"))
+
+    # Compare created_at with datetimes; __date would hide the column from the index
+    if params.get("created_from"):
+        day = _parse_day("created_from", params["created_from"])
+        students = students.filter(
+            created_at__gte=timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        )
+    if params.get("created_to"):
+        day = _parse_day("created_to", params["created_to"]) + datetime.timedelta(days=1)
+        students = students.filter(
+            created_at__lt=timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        )
+
+    search = params.get("search", "").strip()
+    if search:
+        prefix = Q()
+        for field in STUDENT_SEARCH_FIELDS:
+            prefix |= Q(**{f"{field}__istartswith": search})
+        students = students.filter(prefix)
+
+    return students
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def students_list(request):
@@ -163,31 +327,44 @@ def students_list(request):
     Get list of students based on user role.
     - upsight_staff: Can see all students
     - Others: Can see only the first student
+
+    Filters: ?gender=, ?education= (comma-separated levels), ?class=,
+    ?class_state=, ?entrance=, ?entrance_state=, ?created_from=,
+    ?created_to= (YYYY-MM-DD) and ?search= (prefix of name_ko, name_uz,
+    student_id or telephone)
     """
     try:
         # Check if user is in upsight_staff group
-        is_upsight_staff = request.user.groups.filter(name="upsight_staff").exists()
+        is_upsight_staff = request.upsight_role.is_upsight_staff
+
+        paginator = KeysetPaginator(request, ("-created_at", "-id"))
+        try:
+            queryset = filter_students(Student.objects.all(), request.GET)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         if is_upsight_staff:
-            # Return all students for upsight staff
-            students = Student.objects.all()
+            # Return all students for upsight staff, one page at a time
+            students = paginator.paginate_queryset(
+                StudentListSerializer.values(queryset)
+            )
         else:
             # Return only first student for others
-            students = Student.objects.all()[:1]
-
-        serializer = StudentSerializer(
-            students, many=True, context={"request": request}
-        )
+            students = StudentListSerializer.values(queryset[:1])
 
         return Response(
             {
-                "students": serializer.data,
-                "total_count": len(serializer.data),
+                "students": StudentListSerializer.serialize(
+                    students, context={"request": request}
+                ),
+                **paginator.get_page_info(),
                 "access_level": "full" if is_upsight_staff else "limited",
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch students", "details": str(e)},
@@ -195,24 +372,175 @@ def students_list(request):
         )
 
 
+STUDENT_EXPORT_COLUMNS = {
+    "id": "id",
+    "student_id": "student_id",
+    "name_ko": "name_ko",
+    "name_uz": "name_uz",
+    "birth_date": "birth_date",
+    "gender": "gender",
+    "telephone": "telephone",
+    "email": "email",
+    "address": "address",
+    "high_school": "high_school",
+    "college": "college",
+    "university": "university",
+    "master": "master",
+    "guardian_name_ko": "guardian_name_ko",
+    "guardian_name_uz": "guardian_name_uz",
+    "guardian_telephone": "guardian_telephone",
+    "guardian_relationship": "guardian_relationship",
+    "created_at": "created_at",
+}
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def students_export(request):
+    """Stream all students as CSV for upsight_staff"""
+    if not request.upsight_role.is_upsight_staff:
+        return Response(
+            {"error": "Permission denied. Only staff can export students."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    students = Student.objects.order_by("-created_at", "-id")
+    return export_queryset("students.csv", students, STUDENT_EXPORT_COLUMNS)
+
+
+def _flag(request, name):
+    return str(request.data.get(name, "")).lower() in ("1", "true", "yes")
+
+
+def _run_import(request, importer_class):
+    """Run an uploaded CSV/XLSX file through ``importer_class`` and report per row"""
+    uploaded = request.FILES.get("file")
+    if uploaded is None:
+        return Response(
+            {"error": "Upload a CSV or XLSX file in the 'file' field."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Single process and bounded; larger files go through import_students
+    # and provision_accounts, which hash in a process pool
+    importer = importer_class(
+        default_password=request.data.get("default_password"),
+        max_rows=IMPORT_MAX_ROWS,
+        max_passwords=IMPORT_MAX_PASSWORDS,
+    )
+    result = importer.run(
+        read_rows(uploaded.file, uploaded.name),
+        dry_run=_flag(request, "dry_run"),
+        partial=_flag(request, "partial"),
+    )
+
+    if result["created"]:
+        response_status = status.HTTP_201_CREATED
+    elif result["errors"]:
+        response_status = status.HTTP_400_BAD_REQUEST
+    else:
+        response_status = status.HTTP_200_OK
+    return Response(result, status=response_status)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def students_import(request):
+    """
+    Bulk-create students from an uploaded CSV/XLSX file for upsight_staff.
+    Form fields: file, default_password (for rows without one), dry_run, partial
+    (import the valid rows even if others have errors).
+    """
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can import students."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        return _run_import(request, StudentImporter)
+
+    except ImportFileError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to import students", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def accounts_import(request, kind):
+    """
+    Bulk-create employees, university managers or organ managers together
+    with their login users, for upsight_staff. Same form fields as students_import.
+    """
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can provision accounts."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        return _run_import(request, ACCOUNT_IMPORTERS[kind])
+
+    except ImportFileError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            {"error": f"Failed to import {kind}", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+def _parse_month(request):
+    """The optional ?month= payment month filter as a positive integer"""
+    month = request.GET.get("month")
+    if not month:
+        return None
+    try:
+        month = int(month)
+    except ValueError:
+        raise ValueError("Month must be a valid integer")
+    if month < 1:
+        raise ValueError("Month must be a positive integer")
+    return month
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def classes_list(request):
     """
-    Get list of classes with their timetables
+    Get list of classes with their timetables.
+    With ?summary=true each class also gets its student counts, payment total
+    (of ?month=X only, if given) and per-month payment breakdown.
     """
     try:
-        classes = Class.objects.all().prefetch_related("timetables")
-        serializer = ClassSerializer(classes, many=True, context={"request": request})
+        try:
+            month_filter = _parse_month(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = KeysetPaginator(request, ("id",))
+        if str(request.GET.get("summary", "")).lower() in ("1", "true", "yes"):
+            serializer = ClassSummaryListSerializer
+            queryset = with_class_totals(Class.objects.all(), month_filter)
+        else:
+            serializer = ClassListSerializer
+            queryset = Class.objects.all()
+        classes = paginator.paginate_queryset(serializer.values(queryset))
 
         return Response(
             {
-                "classes": serializer.data,
-                "total_count": len(serializer.data),
+                "classes": serializer.serialize(classes, context={"request": request}),
+                **paginator.get_page_info(),
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch classes", "details": str(e)},
@@ -229,24 +557,25 @@ def class_detail(request, class_id):
     """
     try:
         # Get month filter from query parameters
-        month_filter = request.GET.get("month")
-        if month_filter:
-            try:
-                month_filter = int(month_filter)
-                if month_filter < 1:
-                    return Response(
-                        {"error": "Month must be a positive integer"},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-            except ValueError:
-                return Response(
-                    {"error": "Month must be a valid integer"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        try:
+            month_filter = _parse_month(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Fetch class with related data
-        class_obj = Class.objects.prefetch_related(
-            "timetables", "payments__student", "student_registrations__student"
+        # Fetch class with related data; counts and totals are annotated
+        payments = ClassPayment.objects.select_related("student")
+        if month_filter:
+            payments = payments.filter(payment_month=month_filter)
+        class_obj = with_class_totals(
+            Class.objects.select_related("teacher_first", "teacher_second").prefetch_related(
+                "timetables",
+                Prefetch("payments", queryset=payments),
+                Prefetch(
+                    "student_registrations",
+                    queryset=ClassStudentRegistration.objects.select_related("student"),
+                ),
+            ),
+            month_filter,
         ).get(id=class_id)
         # Create serializer context with month filter
         context = {"request": request}
@@ -303,19 +632,269 @@ def class_timetables(request, class_id):
         )
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def class_payment_matrix(request, class_id):
+    """
+    Students x payment months grid of a class: the amount each student paid
+    for months 1..period and which due months are still outstanding.
+    """
+    try:
+        class_row = Class.objects.values(*CLASS_COLUMNS).get(id=class_id)
+        return Response(build_payment_matrix(class_row), status=status.HTTP_200_OK)
+
+    except Class.DoesNotExist:
+        return Response({"error": "Class not found"}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch payment matrix", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def class_payment_matrices(request):
+    """
+    Payment grids of all active classes for upsight_staff, a page of classes
+    at a time. ?all=true includes classes that have not opened or have ended.
+    """
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can view payment data."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        if str(request.GET.get("all", "")).lower() in ("1", "true", "yes"):
+            classes = Class.objects.all()
+        else:
+            classes = active_classes()
+        paginator = KeysetPaginator(request, ("id",))
+        page = paginator.paginate_queryset(classes.values(*CLASS_COLUMNS))
+        matrices = build_payment_matrices(page)
+
+        return Response(
+            {
+                "matrices": [matrices[row["id"]] for row in page],
+                **paginator.get_page_info(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch payment matrices", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def timetable_conflicts(request):
+    """
+    Every pair of timetable slots of different classes that overlap on the
+    same day in the same classroom or with the same teacher.
+    Filters: ?day=monday, ?kind=room|teacher
+    """
+    try:
+        day = request.GET.get("day") or None
+        if day is not None and day not in WEEKDAYS:
+            return Response(
+                {"error": f"Invalid day: {day}. Allowed: {', '.join(WEEKDAYS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        kind = request.GET.get("kind") or None
+        if kind not in (None, "room", "teacher"):
+            return Response(
+                {"error": "kind must be room or teacher"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        timetables = ClassTimeTable.objects.all()
+        if day is not None:
+            timetables = timetables.filter(days=day)
+        conflicts = TimetableIndex.build(timetables).report(kind=kind)
+
+        return Response(
+            {"conflicts": conflicts, "total_count": len(conflicts)},
+            status=status.HTTP_200_OK,
+        )
+
+    except Exception as e:
+        return Response(
+            {"error": "Failed to check timetable conflicts", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+def _schedule_validators(request, version, last_modified, *parts):
+    """
+    Response carrying the ETag (and Last-Modified, when known) of a schedule
+    response, and the 304 response when the client's copy is current (None
+    otherwise)
+    """
+    etag = schedule_etag(version, *parts)
+    validators = HttpResponse()
+    validators["ETag"] = etag
+    if last_modified is not None:
+        validators["Last-Modified"] = http_date(last_modified)
+    # Returns ``validators`` itself when the request is not conditional or not satisfied
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=validators
+    )
+    return validators, None if not_modified is validators else not_modified
+
+
+def _schedule_sessions(request, date_from, date_to, teacher, room, variant):
+    """
+    (sessions, validators, not_modified) of a schedule request. With a shared
+    cache a 304 is answered from the generations before expanding anything;
+    otherwise the validators are computed from the expanded sessions.
+    """
+    parts = (date_from, date_to, teacher, room, variant)
+    generations = schedule_generation()
+    if generations is not None:
+        validators, not_modified = _schedule_validators(
+            request, generations, max(generations) // 10**9, *parts
+        )
+        if not_modified is not None:
+            return None, validators, not_modified
+    sessions = get_sessions(date_from, date_to, teacher, room, generations)
+    if generations is None:
+        validators, not_modified = _schedule_validators(request, sessions, None, *parts)
+    return sessions, validators, not_modified
+
+
+def _copy_validators(response, validators):
+    for header in ("ETag", "Last-Modified"):
+        if validators.has_header(header):
+            response[header] = validators[header]
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def schedule_list(request):
+    """
+    Class sessions expanded from the timetables, in time order.
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD (default: the current week), ?teacher=<employee id>, ?room=
+    Answers conditional requests (If-None-Match / If-Modified-Since) with 304.
+    """
+    try:
+        try:
+            today = timezone.localdate()
+            date_from = (
+                _parse_day("from", request.GET["from"])
+                if request.GET.get("from")
+                else week_start(today)
+            )
+            date_to = (
+                _parse_day("to", request.GET["to"])
+                if request.GET.get("to")
+                else date_from + datetime.timedelta(days=6)
+            )
+            teacher = (
+                _parse_id("teacher", request.GET["teacher"]) if request.GET.get("teacher") else None
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if date_to < date_from:
+            return Response(
+                {"error": "to must not be before from"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if (date_to - date_from).days >= SCHEDULE_MAX_DAYS:
+            return Response(
+                {"error": f"The range can span at most {SCHEDULE_MAX_DAYS} days"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        room = request.GET.get("room") or None
+
+        sessions, validators, not_modified = _schedule_sessions(
+            request, date_from, date_to, teacher, room, request.accepted_renderer.format
+        )
+        if not_modified is not None:
+            return not_modified
+
+        data = {
+            "sessions": sessions,
+            "from": date_from,
+            "to": date_to,
+            "total_count": len(sessions),
+        }
+        if teacher is not None:
+            data["feed_url"] = request.build_absolute_uri(
+                reverse("teacher_calendar", kwargs={"employee_id": teacher})
+                + f"?token={feed_token(teacher)}"
+            )
+        return _copy_validators(Response(data, status=status.HTTP_200_OK), validators)
+
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch schedule", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def teacher_calendar(request, employee_id):
+    """
+    iCalendar feed of a teacher's sessions for calendar apps, which cannot
+    send a JWT: access needs the ?token= of the feed_url given by
+    /api/schedule?teacher=<id>.
+    """
+    try:
+        if not check_feed_token(employee_id, request.GET.get("token")):
+            return Response({"error": "Invalid feed token"}, status=status.HTTP_403_FORBIDDEN)
+        employee = Employee.objects.filter(id=employee_id).values("name_ko", "name_uz").first()
+        if employee is None:
+            return Response({"error": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        today = timezone.localdate()
+        date_from = today - datetime.timedelta(days=FEED_PAST_DAYS)
+        date_to = today + datetime.timedelta(days=FEED_FUTURE_DAYS)
+        sessions, validators, not_modified = _schedule_sessions(
+            request, date_from, date_to, employee_id, None, "ics"
+        )
+        if not_modified is not None:
+            return not_modified
+
+        if validators.has_header("Last-Modified"):
+            stamp = datetime.datetime.fromtimestamp(
+                parse_http_date(validators["Last-Modified"]), tz=datetime.timezone.utc
+            )
+        else:
+            stamp = timezone.now().replace(microsecond=0)
+        response = HttpResponse(
+            sessions_to_ics(sessions, f"{employee['name_ko']} / {employee['name_uz']}", stamp),
+            content_type="text/calendar; charset=utf-8",
+        )
+        return _copy_validators(response, validators)
+
+    except Exception as e:
+        return Response(
+            {"error": "Failed to build calendar", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 # University Views
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def universities_list(request):
     """Get list of universities for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view universities."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        universities = University.objects.all()
+        paginator = KeysetPaginator(request, ("id",))
+        universities = paginator.paginate_queryset(University.objects.all())
         serializer = UniversitySerializer(
             universities, many=True, context={"request": request}
         )
@@ -323,11 +902,13 @@ def universities_list(request):
         return Response(
             {
                 "universities": serializer.data,
-                "total_count": len(serializer.data),
+                **paginator.get_page_info(),
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch universities", "details": str(e)},
@@ -340,7 +921,7 @@ def universities_list(request):
 def university_detail(request, university_id):
     """Get university details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view university details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -370,25 +951,29 @@ def university_detail(request, university_id):
 def employees_list(request):
     """Get list of employees for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view employees."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        employees = Employee.objects.all()
-        serializer = EmployeeSerializer(
-            employees, many=True, context={"request": request}
+        paginator = KeysetPaginator(request, ("-created_at", "-id"))
+        employees = paginator.paginate_queryset(
+            EmployeeListSerializer.values(Employee.objects.all(), "created_at")
         )
 
         return Response(
             {
-                "employees": serializer.data,
-                "total_count": len(serializer.data),
+                "employees": EmployeeListSerializer.serialize(
+                    employees, context={"request": request}
+                ),
+                **paginator.get_page_info(),
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch employees", "details": str(e)},
@@ -396,12 +981,48 @@ def employees_list(request):
         )
 
 
+EMPLOYEE_EXPORT_COLUMNS = {
+    "id": "id",
+    "employee_id": "employee_id",
+    "name_ko": "name_ko",
+    "name_uz": "name_uz",
+    "position": "position",
+    "status": "status",
+    "gender": "gender",
+    "birth_date": "birth_date",
+    "start_date": "start_date",
+    "telephone": "telephone",
+    "email": "email",
+    "address": "address",
+    "college": "college",
+    "university": "university",
+    "graduate": "graduate",
+    "salary": "salary",
+    "bonus": "bonus",
+    "created_at": "created_at",
+}
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def employees_export(request):
+    """Stream all employees as CSV for upsight_staff"""
+    if not request.upsight_role.is_upsight_staff:
+        return Response(
+            {"error": "Permission denied. Only staff can export employees."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    employees = Employee.objects.order_by("-created_at", "-id")
+    return export_queryset("employees.csv", employees, EMPLOYEE_EXPORT_COLUMNS)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def employee_detail(request, employee_id):
     """Get employee details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view employee details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -431,7 +1052,7 @@ def employee_detail(request, employee_id):
 def student_detail(request, student_id):
     """Get student details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view student details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -461,13 +1082,18 @@ def student_detail(request, student_id):
 def enterances_list(request):
     """Get list of enterances for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view enterances."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        enterances = Enterance.objects.select_related("university").all()
+        paginator = KeysetPaginator(request, ("id",))
+        enterances = paginator.paginate_queryset(
+            Enterance.objects.select_related("university").prefetch_related(
+                enterance_students_prefetch()
+            )
+        )
         serializer = EnteranceSerializer(
             enterances, many=True, context={"request": request}
         )
@@ -475,11 +1101,13 @@ def enterances_list(request):
         return Response(
             {
                 "enterances": serializer.data,
-                "total_count": len(serializer.data),
+                **paginator.get_page_info(),
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch enterances", "details": str(e)},
@@ -492,13 +1120,17 @@ def enterances_list(request):
 def enterance_detail(request, enterance_id):
     """Get enterance details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view enterance details."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        enterance = Enterance.objects.select_related("university").get(id=enterance_id)
+        enterance = (
+            Enterance.objects.select_related("university")
+            .prefetch_related(enterance_students_prefetch())
+            .get(id=enterance_id)
+        )
         serializer = EnteranceSerializer(enterance, context={"request": request})
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -520,23 +1152,26 @@ def enterance_detail(request, enterance_id):
 def organs_list(request):
     """Get list of organs for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view organs."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        organs = Organ.objects.all()
+        paginator = KeysetPaginator(request, ("id",))
+        organs = paginator.paginate_queryset(Organ.objects.all())
         serializer = OrganSerializer(organs, many=True, context={"request": request})
 
         return Response(
             {
                 "organs": serializer.data,
-                "total_count": len(serializer.data),
+                **paginator.get_page_info(),
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch organs", "details": str(e)},
@@ -549,7 +1184,7 @@ def organs_list(request):
 def organ_detail(request, organ_id):
     """Get organ details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view organ details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -575,23 +1210,28 @@ def organ_detail(request, organ_id):
 def careers_list(request):
     """Get list of careers for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view careers."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        careers = Career.objects.prefetch_related("history", "counsels").all()
+        paginator = KeysetPaginator(request, ("id",))
+        careers = paginator.paginate_queryset(
+            Career.objects.prefetch_related("history", "counsels").all()
+        )
         serializer = CareerSerializer(careers, many=True, context={"request": request})
 
         return Response(
             {
                 "careers": serializer.data,
-                "total_count": len(serializer.data),
+                **paginator.get_page_info(),
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch careers", "details": str(e)},
@@ -600,6 +1240,102 @@ def careers_list(request):
 
 
 # Finance Views
+FINANCE_PAYMENTS_ORDERING = ("-payment_date", "-payment_type", "-payment_id")
+
+
+def _finance_payments_queryset(paginator=None):
+    """
+    Build a single UNION ALL queryset over entrance and class payments.
+
+    Both halves project the same annotated columns in the same order so the
+    database can merge, sort and aggregate them; display strings are formatted
+    per row afterwards. When a paginator is given its cursor condition is
+    applied to each half, since a combined query cannot be filtered.
+    """
+    char, integer = CharField(), IntegerField()
+    entrance_payments = EnterancePayment.objects.annotate(
+        payment_id=F("id"),
+        payment_date=F("date"),
+        payment_amount=F("amount"),
+        payment_type=Value("entrance", output_field=char),
+        student_code=F("student__student_id"),
+        student_name_ko=F("student__name_ko"),
+        student_name_uz=F("student__name_uz"),
+        university_name_ko=F("enterance__university__name_ko"),
+        university_name_uz=F("enterance__university__name_uz"),
+        enterance_years=F("enterance__years"),
+        enterance_kind=F("enterance__kind"),
+        enterance_order=F("enterance__order"),
+        month=Value(None, output_field=integer),
+        class_group=Value(None, output_field=integer),
+        class_level=Value(None, output_field=char),
+        class_lecture=Value(None, output_field=char),
+    )
+    class_payments = ClassPayment.objects.annotate(
+        payment_id=F("id"),
+        payment_date=F("date"),
+        payment_amount=F("amount"),
+        payment_type=Value("class", output_field=char),
+        student_code=F("student__student_id"),
+        student_name_ko=F("student__name_ko"),
+        student_name_uz=F("student__name_uz"),
+        university_name_ko=Value(None, output_field=char),
+        university_name_uz=Value(None, output_field=char),
+        enterance_years=Value(None, output_field=integer),
+        enterance_kind=Value(None, output_field=char),
+        enterance_order=Value(None, output_field=char),
+        month=F("payment_month"),
+        class_group=F("class_model__group"),
+        class_level=F("class_model__level"),
+        class_lecture=F("class_model__lecture"),
+    )
+    fields = list(entrance_payments.query.annotations)
+    entrance_payments = entrance_payments.values(*fields)
+    class_payments = class_payments.values(*fields)
+    if paginator is not None:
+        entrance_payments = paginator.filter_queryset(entrance_payments)
+        class_payments = paginator.filter_queryset(class_payments)
+    return entrance_payments.union(class_payments, all=True)
+
+
+def _finance_payment_row(row):
+    """Convert a row of the finance UNION ALL queryset to the API format"""
+    is_entrance = row["payment_type"] == "entrance"
+    return {
+        "id": f"{row['payment_type']}_{row['payment_id']}",
+        "original_id": row["payment_id"],
+        "date": row["payment_date"],
+        "amount": row["payment_amount"],
+        "payment_type": row["payment_type"],
+        "student_id": row["student_code"],
+        "student_name_ko": row["student_name_ko"],
+        "student_name_uz": row["student_name_uz"],
+        "university_name": (
+            f"{row['university_name_ko']} / {row['university_name_uz']}"
+            if is_entrance
+            else None
+        ),
+        "enterance_info": (
+            f"{row['enterance_years']} - "
+            f"{ENTERANCE_KIND_DISPLAY.get(row['enterance_kind'], row['enterance_kind'])} "
+            f"({ENTERANCE_ORDER_DISPLAY.get(row['enterance_order'], row['enterance_order'])})"
+            if is_entrance
+            else None
+        ),
+        "payment_month": row["month"],
+        "payment_month_display": None if is_entrance else f"Month {row['month']}",
+        "class_info": (
+            None
+            if is_entrance
+            else (
+                f"Group {row['class_group']} - "
+                f"{CLASS_LEVEL_DISPLAY.get(row['class_level'], row['class_level'])} "
+                f"{CLASS_LECTURE_DISPLAY.get(row['class_lecture'], row['class_lecture'])}"
+            )
+        ),
+    }
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def finance_payments_list(request):
@@ -607,102 +1343,221 @@ def finance_payments_list(request):
     Get combined list of all payments (entrance and class payments) for upsight_staff
     """
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view payment data."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Get all entrance payments
-        entrance_payments = EnterancePayment.objects.select_related(
-            "student", "enterance__university"
-        ).all()
-        
-        # Get all class payments
-        class_payments = ClassPayment.objects.select_related(
-            "student", "class_model"
-        ).all()
+        paginator = KeysetPaginator(request, FINANCE_PAYMENTS_ORDERING)
+        page = paginator.paginate_queryset(
+            _finance_payments_queryset(paginator), filtered=True
+        )
+        payments_data = [_finance_payment_row(row) for row in page]
 
-        # Convert to unified format
-        payments_data = []
-        
-        # Add entrance payments
-        for payment in entrance_payments:
-            payments_data.append({
-                'id': f"entrance_{payment.id}",
-                'original_id': payment.id,
-                'date': payment.date,
-                'amount': payment.amount,
-                'payment_type': 'entrance',
-                'student_id': payment.student.student_id,
-                'student_name_ko': payment.student.name_ko,
-                'student_name_uz': payment.student.name_uz,
-                'university_name': str(payment.enterance.university),
-                'enterance_info': (
-                    f"{payment.enterance.years} - {payment.enterance.get_kind_display()} "
-                    f"({payment.enterance.get_order_display()})"
-                ),
-                'payment_month': None,
-                'payment_month_display': None,
-                'class_info': None,
-            })
-        
-        # Add class payments
-        for payment in class_payments:
-            payments_data.append({
-                'id': f"class_{payment.id}",
-                'original_id': payment.id,
-                'date': payment.date,
-                'amount': payment.amount,
-                'payment_type': 'class',
-                'student_id': payment.student.student_id,
-                'student_name_ko': payment.student.name_ko,
-                'student_name_uz': payment.student.name_uz,
-                'university_name': None,
-                'enterance_info': None,
-                'payment_month': payment.payment_month,
-                'payment_month_display': f"Month {payment.payment_month}",
-                'class_info': (
-                    f"Group {payment.class_model.group} - {payment.class_model.get_level_display()} "
-                    f"{payment.class_model.get_lecture_display()}"
+        serializer = FinancePaymentSerializer(payments_data, many=True)
+
+        # Totals and counts are computed by the database in a single query
+        is_entrance = Q(payment_type="entrance")
+        is_class = Q(payment_type="class")
+        totals = _finance_payments_queryset().aggregate(
+            total_amount=Coalesce(Sum("payment_amount"), Decimal("0")),
+            entrance_payments_total=Coalesce(
+                Sum("payment_amount", filter=is_entrance), Decimal("0")
+            ),
+            class_payments_total=Coalesce(
+                Sum("payment_amount", filter=is_class), Decimal("0")
+            ),
+            entrance_payments_count=Count("payment_id", filter=is_entrance),
+            class_payments_count=Count("payment_id", filter=is_class),
+        )
+
+        return Response(
+            {
+                "payments": serializer.data,
+                **paginator.get_page_info(),
+                "total_count": (
+                    totals["entrance_payments_count"] + totals["class_payments_count"]
                 ),
-            })
+                "totals": totals,
+            },
+            status=status.HTTP_200_OK,
+        )
 
-        # Sort by date (most recent first)
-        payments_data.sort(key=lambda x: x['date'], reverse=True)
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch payments", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+FINANCE_EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "amount",
+    "payment_type",
+    "student_id",
+    "student_name_ko",
+    "student_name_uz",
+    "university_name",
+    "enterance_info",
+    "payment_month",
+    "class_info",
+)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def finance_payments_export(request):
+    """Stream all entrance and class payments as CSV for upsight_staff"""
+    if not request.upsight_role.is_upsight_staff:
+        return Response(
+            {"error": "Permission denied. Only staff can export payment data."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    payments = (
+        _finance_payments_queryset()
+        .order_by(*FINANCE_PAYMENTS_ORDERING)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    rows = (
+        [payment[column] for column in FINANCE_EXPORT_COLUMNS]
+        for payment in map(_finance_payment_row, payments)
+    )
+    return stream_csv("payments.csv", FINANCE_EXPORT_COLUMNS, rows)
 
-        # Serialize the data
-        serializer = FinancePaymentSerializer(payments_data, many=True)
 
-        # Calculate totals
-        total_amount = sum(float(payment['amount']) for payment in payments_data)
-        entrance_total = sum(
-            float(payment['amount']) for payment in payments_data
-            if payment['payment_type'] == 'entrance'
+# Rollup columns selected for each ?group_by= dimension
+FINANCE_SUMMARY_DIMENSIONS = {
+    "period": ("period",),
+    "payment_type": ("payment_type",),
+    "university": ("university_id", "university__name_ko", "university__name_uz"),
+    "class": (
+        "class_model_id",
+        "class_model__group",
+        "class_model__level",
+        "class_model__lecture",
+    ),
+}
+
+
+def _parse_period(value):
+    """Parse a ``YYYY-MM`` query parameter into the first day of that month"""
+    return datetime.datetime.strptime(value, "%Y-%m").date()
+
+
+def _finance_summary_row(row):
+    """Convert a grouped PaymentRollup row to the API format"""
+    data = {
+        "total_amount": row["total_amount"],
+        "payment_count": row["payment_count"],
+    }
+    if "period" in row:
+        data["period"] = row["period"].strftime("%Y-%m")
+    if "payment_type" in row:
+        data["payment_type"] = row["payment_type"]
+    if "university_id" in row:
+        data["university_id"] = row["university_id"]
+        data["university_name"] = (
+            f"{row['university__name_ko']} / {row['university__name_uz']}"
+            if row["university_id"]
+            else None
         )
-        class_total = sum(
-            float(payment['amount']) for payment in payments_data
-            if payment['payment_type'] == 'class'
+    if "class_model_id" in row:
+        data["class_id"] = row["class_model_id"]
+        data["class_info"] = (
+            f"Group {row['class_model__group']} - "
+            f"{CLASS_LEVEL_DISPLAY.get(row['class_model__level'], row['class_model__level'])} "
+            f"{CLASS_LECTURE_DISPLAY.get(row['class_model__lecture'], row['class_model__lecture'])}"
+            if row["class_model_id"]
+            else None
+        )
+    return data
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def finance_summary(request):
+    """
+    Payment totals from the monthly PaymentRollup table for upsight_staff.
+    ?group_by= any of period, payment_type, university, class (default: period,payment_type)
+    Filters: ?from=YYYY-MM, ?to=YYYY-MM, ?payment_type=, ?university=, ?class=
+    """
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can view payment data."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        group_by = [
+            name.strip()
+            for name in request.GET.get("group_by", "period,payment_type").split(",")
+            if name.strip()
+        ]
+        unknown = [name for name in group_by if name not in FINANCE_SUMMARY_DIMENSIONS]
+        if unknown:
+            return Response(
+                {
+                    "error": f"Invalid group_by: {', '.join(unknown)}. "
+                    f"Choose from {', '.join(FINANCE_SUMMARY_DIMENSIONS)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rollups = PaymentRollup.objects.all()
+        try:
+            if request.GET.get("from"):
+                rollups = rollups.filter(period__gte=_parse_period(request.GET["from"]))
+            if request.GET.get("to"):
+                rollups = rollups.filter(period__lte=_parse_period(request.GET["to"]))
+        except ValueError:
+            return Response(
+                {"error": "from and to must be months in YYYY-MM format"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.GET.get("payment_type"):
+            rollups = rollups.filter(payment_type=request.GET["payment_type"])
+        try:
+            if request.GET.get("university"):
+                rollups = rollups.filter(
+                    university_id=_parse_id("university", request.GET["university"])
+                )
+            if request.GET.get("class"):
+                rollups = rollups.filter(
+                    class_model_id=_parse_id("class", request.GET["class"])
+                )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = [
+            column for name in group_by for column in FINANCE_SUMMARY_DIMENSIONS[name]
+        ]
+        sums = {
+            "total_amount": Coalesce(Sum("total_amount"), Decimal("0")),
+            "payment_count": Coalesce(Sum("payment_count"), 0),
+        }
+        groups = (
+            rollups.values(*columns).annotate(**sums).order_by(*columns)
+            if columns
+            else []
         )
 
         return Response(
             {
-                "payments": serializer.data,
-                "total_count": len(payments_data),
-                "totals": {
-                    "total_amount": total_amount,
-                    "entrance_payments_total": entrance_total,
-                    "class_payments_total": class_total,
-                    "entrance_payments_count": len([p for p in payments_data if p['payment_type'] == 'entrance']),
-                    "class_payments_count": len([p for p in payments_data if p['payment_type'] == 'class']),
-                }
+                "summary": [_finance_summary_row(row) for row in groups],
+                "group_by": group_by,
+                "totals": rollups.aggregate(**sums),
             },
             status=status.HTTP_200_OK,
         )
 
     except Exception as e:
         return Response(
-            {"error": "Failed to fetch payments", "details": str(e)},
+            {"error": "Failed to fetch payment summary", "details": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
@@ -712,7 +1567,7 @@ def finance_payments_list(request):
 def entrance_payments_list(request):
     """Get list of entrance payments for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view entrance payments."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -720,19 +1575,25 @@ def entrance_payments_list(request):
 
         payments = EnterancePayment.objects.select_related(
             "student", "enterance__university"
-        ).all().order_by('-date')
-        
-        serializer = EnterancePaymentSerializer(payments, many=True, context={"request": request})
+        ).all()
+        paginator = KeysetPaginator(request, ("-date", "-id"))
+        page = paginator.paginate_queryset(payments)
+
+        serializer = EnterancePaymentSerializer(page, many=True, context={"request": request})
 
         return Response(
             {
                 "entrance_payments": serializer.data,
-                "total_count": len(serializer.data),
-                "total_amount": sum(payment.amount for payment in payments),
+                **paginator.get_page_info(),
+                "total_amount": payments.aggregate(
+                    total=Coalesce(Sum("amount"), Decimal("0"))
+                )["total"],
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch entrance payments", "details": str(e)},
@@ -745,25 +1606,31 @@ def entrance_payments_list(request):
 def class_payments_list(request):
     """Get list of class payments for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view class payments."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        payments = ClassPayment.objects.select_related("student", "class_model").all().order_by('-date')
-        
-        serializer = ClassPaymentSerializer(payments, many=True, context={"request": request})
+        payments = ClassPayment.objects.select_related("student", "class_model").all()
+        paginator = KeysetPaginator(request, ("-date", "-id"))
+        page = paginator.paginate_queryset(payments)
+
+        serializer = ClassPaymentSerializer(page, many=True, context={"request": request})
 
         return Response(
             {
                 "class_payments": serializer.data,
-                "total_count": len(serializer.data),
-                "total_amount": sum(payment.amount for payment in payments),
+                **paginator.get_page_info(),
+                "total_amount": payments.aggregate(
+                    total=Coalesce(Sum("amount"), Decimal("0"))
+                )["total"],
             },
             status=status.HTTP_200_OK,
         )
 
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": "Failed to fetch class payments", "details": str(e)},
@@ -776,7 +1643,7 @@ def class_payments_list(request):
 def entrance_payment_detail(request, payment_id):
     """Get entrance payment details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view entrance payment details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -806,7 +1673,7 @@ def entrance_payment_detail(request, payment_id):
 def class_payment_detail(request, payment_id):
     """Get class payment details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view class payment details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -829,12 +1696,168 @@ def class_payment_detail(request, payment_id):
         )
 
 
+BALANCE_COLUMNS = (
+    "id",
+    "student_id",
+    "student__student_id",
+    "student__name_ko",
+    "student__name_uz",
+    "class_model_id",
+    "class_model__group",
+    "class_model__level",
+    "class_model__lecture",
+    "registration_state",
+    "due_months",
+    "expected_amount",
+    "paid_amount",
+    "outstanding_amount",
+    "unpaid_months",
+    "first_unpaid_month",
+    "updated_at",
+)
+
+
+def _balance_row(row):
+    """Convert a StudentBalance values() row to the API format"""
+    return {
+        "student_id": row["student_id"],
+        "student_number": row["student__student_id"],
+        "student_name": f"{row['student__name_ko']} / {row['student__name_uz']}",
+        "class_id": row["class_model_id"],
+        "class_info": (
+            f"Group {row['class_model__group']} - "
+            f"{CLASS_LEVEL_DISPLAY.get(row['class_model__level'], row['class_model__level'])} "
+            f"{CLASS_LECTURE_DISPLAY.get(row['class_model__lecture'], row['class_model__lecture'])}"
+        ),
+        **{
+            name: row[name]
+            for name in (
+                "registration_state",
+                "due_months",
+                "expected_amount",
+                "paid_amount",
+                "outstanding_amount",
+                "unpaid_months",
+                "first_unpaid_month",
+                "updated_at",
+            )
+        },
+    }
+
+
+def _parse_amount(name, value):
+    try:
+        amount = Decimal(value)
+    except ArithmeticError:
+        raise ValueError(f"{name} must be a number")
+    # NaN and Infinity parse, but cannot be compared with a DecimalField
+    if not amount.is_finite():
+        raise ValueError(f"{name} must be a number")
+    return amount
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def finance_arrears(request):
+    """
+    Students owing tuition for due months, largest debts first, from the
+    StudentBalance table for upsight_staff.
+    Filters: ?class=, ?student=, ?min_amount=, ?min_months=
+    """
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can view payment data."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        arrears = StudentBalance.objects.filter(outstanding_amount__gt=0)
+        try:
+            if request.GET.get("class"):
+                arrears = arrears.filter(class_model_id=_parse_id("class", request.GET["class"]))
+            if request.GET.get("student"):
+                arrears = arrears.filter(student_id=_parse_id("student", request.GET["student"]))
+            if request.GET.get("min_amount"):
+                arrears = arrears.filter(
+                    outstanding_amount__gte=_parse_amount("min_amount", request.GET["min_amount"])
+                )
+            if request.GET.get("min_months"):
+                arrears = arrears.filter(
+                    unpaid_months__gte=_parse_id("min_months", request.GET["min_months"])
+                )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = KeysetPaginator(request, ("-outstanding_amount", "-id"))
+        page = paginator.paginate_queryset(arrears.values(*BALANCE_COLUMNS))
+
+        return Response(
+            {
+                "arrears": [_balance_row(row) for row in page],
+                **paginator.get_page_info(),
+                "totals": arrears.aggregate(
+                    outstanding_amount=Coalesce(Sum("outstanding_amount"), Decimal("0")),
+                    balance_count=Count("id"),
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch arrears", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def student_balance(request, student_id):
+    """Expected, paid and outstanding tuition of a student in each class, for upsight_staff"""
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only staff can view payment data."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        balances = [
+            _balance_row(row)
+            for row in StudentBalance.objects.filter(student_id=student_id)
+            .order_by("class_model_id")
+            .values(*BALANCE_COLUMNS)
+        ]
+        if not balances and not Student.objects.filter(id=student_id).exists():
+            return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(
+            {
+                "student_id": student_id,
+                "balances": balances,
+                "expected_amount": sum((row["expected_amount"] for row in balances), Decimal("0")),
+                "paid_amount": sum((row["paid_amount"] for row in balances), Decimal("0")),
+                "outstanding_amount": sum(
+                    (row["outstanding_amount"] for row in balances), Decimal("0")
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch student balance", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def career_detail(request, career_id):
     """Get career details for upsight_staff"""
     try:
-        if not request.user.groups.filter(name="upsight_staff").exists():
+        if not request.upsight_role.is_upsight_staff:
             return Response(
                 {"error": "Permission denied. Only staff can view career details."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -854,3 +1877,70 @@ def career_detail(request, career_id):
             {"error": "Failed to fetch career", "details": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+# Background job views
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def jobs_list(request):
+    """
+    Get background jobs for staff.
+    Filters: ?status=, ?task=, ?object_type= (e.g. board.informationdocuments), ?object_id=
+    """
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only Upsight staff can view jobs."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        jobs = BackgroundJob.objects.all()
+        for param in ("status", "task", "object_type", "object_id"):
+            value = request.GET.get(param)
+            if value:
+                jobs = jobs.filter(**{param: value})
+
+        paginator = KeysetPaginator(request, ("-id",))
+        jobs = paginator.paginate_queryset(jobs)
+        serializer = BackgroundJobSerializer(jobs, many=True, context={"request": request})
+
+        return Response(
+            {
+                "jobs": serializer.data,
+                **paginator.get_page_info(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except PaginationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch jobs", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def job_detail(request, job_id):
+    """Get status and result of a background job"""
+    try:
+        if not request.upsight_role.is_upsight_staff:
+            return Response(
+                {"error": "Permission denied. Only Upsight staff can view jobs."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        job = BackgroundJob.objects.get(id=job_id)
+        serializer = BackgroundJobSerializer(job, context={"request": request})
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    except BackgroundJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return Response(
+            {"error": "Failed to fetch job", "details": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
@@ -86,21 +86,120 @@ SIMPLE_JWT = {
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'management.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': (
+        'management.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+}
+
+# How long ClaimsJWTAuthentication trusts a cached "user is active" answer
+JWT_REVOCATION_CACHE = {
+    'MAX_SIZE': 4096,
+    'TTL': 60,  # seconds
+}
+
+# Set CACHE_REDIS_URL (e.g. redis://localhost:6379/1, needs the redis package)
+# when running more than one worker process: the main API response cache and
+# the class schedule rely on every worker seeing the same cache. The default
+# in-process cache is only shared by the threads of one process.
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Response cache for the public main API (see main/caching.py); disabled
+# unless the alias is a shared backend
+MAIN_API_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,  # seconds
+}
+
+# Resized/WebP variants of uploaded images (see management/images.py)
+IMAGE_DERIVATIVES = {
+    'WIDTHS': (64, 320, 640, 1280),
+    'THUMBNAIL_WIDTH': 64,  # used for avatars
+    'QUALITY': 85,
+    'WEBP_QUALITY': 80,
+}
+
+# Database-backed job queue (see management/jobs.py), run with
+# `python manage.py run_jobs`. EAGER runs jobs in-process after commit.
+JOB_QUEUE = {
+    'EAGER': False,
+    'CONCURRENCY': 4,
+    'POLL_INTERVAL': 1.0,  # seconds between polls of an empty queue
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 30,  # seconds, doubled on every retry
+    'STALE_AFTER': 600,  # seconds before a running job is reclaimed
+}
+
+# Per-endpoint request metrics served at /api/metrics (see management/metrics.py)
+REQUEST_METRICS = {
+    'ENABLED': True,
+    'SLOW_REQUEST_MS': 1000,  # log requests slower than this...
+    'MAX_QUERIES': 50,  # ...or issuing more SQL queries than this
+    'SLOWEST_QUERIES': 5,  # number of queries included in the log line
+    'TOKEN': os.environ.get('METRICS_TOKEN'),  # scrapers send "Authorization: Bearer <token>"
+    'ALLOWED_IPS': (),  # optional, also restrict scrapers to these addresses
+}
+
+# Spreadsheet imports (see management/imports.py)
+BULK_IMPORT = {
+    'BATCH_SIZE': 1000,  # rows per INSERT
+    'HASH_WORKERS': None,  # import_students/provision_accounts hashing processes, defaults to the CPU count
+    'WEB_MAX_ROWS': 5000,  # uploads hash in the request's process, so they are bounded
+    'WEB_MAX_PASSWORDS': 20,  # distinct passwords per upload (about half a second each)
+}
+
+# Full-text search at /api/board/search (see board/search.py)
+BOARD_SEARCH = {
+    'DEFAULT_LIMIT': 20,
+    'MAX_LIMIT': 100,
+    'SNIPPET_LENGTH': 160,  # characters of content returned around the first match
+}
+
+# Class sessions at /api/schedule and teacher calendar feeds (see management/schedule.py)
+# Expanded weeks are only cached, and 304s only answered before expanding,
+# with a shared cache (CACHE_REDIS_URL above). With the in-process default
+# every request expands its weeks in one query and the ETag is computed from
+# the sessions, since another worker's edits would not reach this process.
+SCHEDULE = {
+    'MAX_DAYS': 92,  # longest ?from=..&to= range
+    'CACHE_TIMEOUT': 3600,  # seconds an expanded week is kept
+    'FEED_PAST_DAYS': 28,
+    'FEED_FUTURE_DAYS': 182,
+}
+
+# Keyset pagination for list endpoints (see management/pagination.py)
+KEYSET_PAGINATION = {
+    'PAGE_SIZE': 100,
+    'MAX_PAGE_SIZE': 1000,
 }
 
 MIDDLEWARE = [
+    'management.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'management.middleware.UpsightRoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -139,23 +238,39 @@ CSRF_COOKIE_SAME_SITE = 'None'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.postgresql_psycopg2',
-#         'NAME': 'upsight',
-#         'USER': 'upsightuser',
-#         'PASSWORD': 'upsight2024',
-#         'HOST': 'localhost',
-#         'PORT': '5432',
-#     }
-# }
-
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# SQLite by default. Set DATABASE_ENGINE=postgresql and the POSTGRES_* variables
+# for production; copy an existing SQLite database over with
+# `python manage.py copy_from_sqlite db.sqlite3`.
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite')
+
+if DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'upsight'),
+            'USER': os.environ.get('POSTGRES_USER', 'upsight'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Keep each worker's connection open between requests...
+            'CONN_MAX_AGE': int(os.environ.get('POSTGRES_CONN_MAX_AGE', 600)),
+            # ...and check it is still alive before reusing it
+            'CONN_HEALTH_CHECKS': True,
+            # Required behind PgBouncer in transaction pooling mode
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('POSTGRES_PGBOUNCER', '') == '1',
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('POSTGRES_CONNECT_TIMEOUT', 5)),
+                'application_name': 'upsight',
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
     }
-}
 
 
 # Password validation